@@ -1,22 +1,31 @@
 from ADA.utils.preprocess import preprocess
+from ADA.utils.ingest import read_dataset, remember_categories
+from ADA.utils.backend import get_backend
+from contextlib import nullcontext
 
 
 import pandas as pd
 
 class ADA:
-    def __init__(self, data_path, target, k_features=1000, problem_type='classification'):
+    def __init__(self, data_path, target, k_features=1000, problem_type='classification', data=None, backend=None):
         """
         Initializes the ADA class with the provided data and target column.
-        :param data: pd.DataFrame - The input data to be analyzed.
+        :param data_path: str - CSV file to analyze, optionally gzip or zstd compressed (.csv.gz, .csv.zst).
+        :param data: pd.DataFrame - The input data to be analyzed; read from data_path when omitted.
         :param target: str - The name of the target column for analysis.
         :param k_features: int - The number of features to select for modeling.
         :param problem_type: str - The type of problem ('classification' or 'regression').
+        :param backend: str | backend - Where the map/combine steps run: 'inprocess' (default), 'partitioned'
+            (worker processes over row partitions), 'cluster' (local multi-node stand-in) or a backend instance.
+            Worker pools of a backend given by name are shut down by close() (or when a `with ADA(...)` block exits);
+            a backend instance stays open for its owner to close.
         :raises ValueError: If the target column is not found in the data.
         :raises FileNotFoundError: If the data file does not exist at the specified path.
         :raises Exception: If the data cannot be read or processed.
         :return: None
         :description: This class is designed to handle data preprocessing, modeling, and visualization for a given dataset.
         :example: ada = ADA(data_path="path/to/data.csv", target="target_column", k_features=1000, problem_type='classification')
+        :example: with ADA("path/to/data.csv", "target_column", backend='partitioned') as ada: ada.preprocess()
         :note: Ensure that the data file exists at the specified path and that the target column is present in the data.
         :note: The class uses utility functions from the 'utils' package for preprocessing and modeling.
         :note: The preprocess method handles data cleaning and transformation, while the visualize method generates visualizations.
@@ -30,22 +39,89 @@ class ADA:
         """
 
         self.data_path = data_path
-        self.data = pd.read_csv(data_path)
+        self.data = data if data is not None else read_dataset(data_path)
         self.target_column =target
         self.problem_type = problem_type
         self.k_features = k_features
+        self.backend = get_backend(backend)
+        self._owns_backend = backend is None or isinstance(backend, str)
 
-    def preprocess(self, **kwargs):
-        # Implement preprocessing logic here
-        preprocess.preprocess_data(self.data, self.target_column)
+    def close(self):
+        """
+        Shuts down the worker processes of a backend this instance created from a name.
+        """
+        if self._owns_backend:
+            self.backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def preprocess(self, string_strategy='hash', hash_bits=10, nominal_strategy='label', outlier_method='iqr',
+                   outlier_action=None, deduplicate=True, dedup_subset=None, **kwargs):
+        """
+        Runs preprocessing and modeling.
+        :param string_strategy: str - 'hash' encodes free-text and ID columns as hashed character n-grams, 'drop' discards them.
+        :param hash_bits: int - Each string column is hashed into 2 ** hash_bits sparse features.
+        :param nominal_strategy: str - 'label' encodes nominal columns as integer codes, 'onehot' as sparse indicator columns.
+        :param outlier_method: str - 'iqr', 'robust_z' or 'isolation_forest' bounds for the continuous and discrete columns.
+        :param outlier_action: str - 'clip' clips values to the bounds, 'flag' adds an 'is_outlier' column, None only reports them.
+        :param deduplicate: bool - Remove duplicate rows (matched on 64-bit row hashes) before preprocessing.
+        :param dedup_subset: list - Key columns that identify a row for deduplication; all columns by default.
+        :param kwargs: Options forwarded to model selection, e.g. search=True, time_budget=120, n_jobs=-1.
+        """
+        preprocess.preprocess_data(self.data, self.target_column, string_strategy=string_strategy, hash_bits=hash_bits,
+                                   nominal_strategy=nominal_strategy, outlier_method=outlier_method,
+                                   outlier_action=outlier_action, deduplicate=deduplicate,
+                                   dedup_subset=dedup_subset, backend=self.backend, source=self.data_path)
+        if self.data_path is not None:
+            remember_categories(self.data_path)
 
         from ADA.utils.modeling import modeling
-        modeling.model_data(self.target_column, self.k_features,self.problem_type)
+        modeling.model_data(self.target_column, self.k_features,self.problem_type, **kwargs)
 
-    def visualize(self):
-        # Implement visualization logic here
+    def refresh(self, new_data_path):
+        """
+        Incrementally updates the saved transforms and model with rows appended to the dataset.
+        Running scaler statistics and label vocabularies are updated with the new rows only, the transformed
+        rows are appended to 'transformed_data.csv' and the model is updated where it supports it.
+        When a feature's statistics drift, its stored rows are rescaled and the model is refit on all rows;
+        the target's scaler stays as the model was fitted, so predictions decode in the original units.
+        :param new_data_path: str - Path to a CSV file holding only the new rows.
+        """
+        new_rows = preprocess.preprocess_data(read_dataset(new_data_path), self.target_column, incremental=True,
+                                               backend=self.backend)
+        if new_rows.empty:
+            return
+
+        from ADA.utils.modeling import modeling
+        modeling.refresh_model(new_rows)
+
+    def predict(self, data, output_path=None, chunk_size=100_000, backend=None):
+        """
+        Scores new rows with the model and transforms saved by the last preprocess() or refresh().
+        The rows are streamed in chunks through the saved transforms; nothing is refitted.
+        :param data: str | pd.DataFrame - A CSV (optionally compressed) or Parquet file, or a DataFrame, with the training columns.
+        :param output_path: str - Write the predictions to this CSV file instead of returning them.
+        :param chunk_size: int - Rows per chunk.
+        :param backend: Backend the chunks are scored on, e.g. 'partitioned' for one worker per core; defaults to self.backend.
+        :return: The predictions as an array, or the output path.
+        """
+        from ADA.utils.modeling import scoring
+        # A backend named here is only used for this call, so its workers are shut down afterwards
+        with get_backend(backend) if isinstance(backend, str) else nullcontext(backend or self.backend) as scoring_backend:
+            return scoring.predict(data, output_path=output_path, chunk_size=chunk_size, backend=scoring_backend)
+
+    def visualize(self, output='png', **kwargs):
+        """
+        Generates the visualizations.
+        :param output: str - 'png', 'jpg' or 'webp' for one image per chart, 'html' for a single interactive report.
+        :param kwargs: Options forwarded to master.visualize_data (compress_level, writer_threads, max_pairs, use_cache).
+        """
         from ADA.utils.visualize import master
-        master.visualize_data(self.data_path, target_col=self.target_column)
+        master.visualize_data(self.data_path, target_col=self.target_column, output=output, backend=self.backend, **kwargs)
 
 
     
@@ -0,0 +1,332 @@
+# server.py
+import argparse
+import json
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+"""
+Long-running local analysis service.
+
+Workers are started once and import pandas, scikit-learn, matplotlib and plotly up front, and each
+worker keeps the most recently used datasets in memory, so repeated analyses skip both the import
+and the CSV parsing cost.
+
+    python -m ADA.server --port 8765
+
+    POST /jobs          {"data_path": ..., "target": ..., "problem_type": "classification",
+                         "k_features": 1000, "steps": ["preprocess", "visualize"],
+                         "preprocess": {...}, "visualize": {...}}     -> 202 {"job_id": ...}
+    GET  /jobs          all jobs
+    GET  /jobs/<job_id> one job (status: queued, running, done or failed)
+    GET  /health        worker, queue and concurrency state
+
+    python -m ADA.server --smoke-test ADA/datasets/titanic.csv Survived
+
+runs the service on an ephemeral localhost port, submits one job and polls it until it finishes.
+
+Jobs write to the shared 'saved_data' folder, so by default only one job runs at a time.
+"""
+
+STEPS = ('preprocess', 'visualize')
+
+# Per worker process: resolved data path -> (mtime, size, DataFrame)
+_dataset_cache = OrderedDict()
+_DATASET_CACHE_SIZE = 4
+
+
+def _warm_worker() -> None:
+    """Import the heavy dependencies once when a worker process starts."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import pandas  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.feature_selection  # noqa: F401
+    from ADA.utils.modeling import modeling  # noqa: F401
+    from ADA.utils.preprocess import preprocess  # noqa: F401
+    from ADA.utils.visualize import master  # noqa: F401
+
+def _ping(_=None) -> int:
+    """Report the worker process id; used to start every worker before the first job."""
+    return multiprocessing.current_process().pid
+
+def _load_dataset(data_path: str):
+    """
+    Read a CSV through the worker's dataset cache, re-reading it when the file changed.
+
+    :return: tuple[pd.DataFrame, bool] - A private copy of the data and whether it came from the cache.
+    """
+    from ADA.utils.ingest import read_dataset
+    path = Path(data_path).resolve()
+    stat = path.stat()
+    cached = _dataset_cache.get(str(path))
+    hit = cached is not None and cached[:2] == (stat.st_mtime, stat.st_size)
+    if hit:
+        _dataset_cache.move_to_end(str(path))
+    else:
+        _dataset_cache[str(path)] = (stat.st_mtime, stat.st_size, read_dataset(path))
+        while len(_dataset_cache) > _DATASET_CACHE_SIZE:
+            _dataset_cache.popitem(last=False)
+    # Preprocessing modifies its input, so every job gets its own copy
+    return _dataset_cache[str(path)][2].copy(), hit
+
+def _run_job(spec: dict) -> dict:
+    """Run one analysis in a worker process and return its timings and selected features."""
+    from ADA import ADA
+    timings = {}
+    start = time.perf_counter()
+    data, cache_hit = _load_dataset(spec['data_path'])
+    timings['load'] = time.perf_counter() - start
+    try:
+        with ADA(spec['data_path'], spec['target'], k_features=spec.get('k_features', 1000),
+                 problem_type=spec.get('problem_type', 'classification'), data=data) as ada:
+            for step in spec.get('steps', list(STEPS)):
+                start = time.perf_counter()
+                getattr(ada, step)(**spec.get(step, {}))
+                timings[step] = time.perf_counter() - start
+    except SystemExit as e:
+        # The pipeline exits on unrecoverable errors; report it as a failed job instead
+        raise RuntimeError(f"Analysis exited with status {e.code}") from None
+
+    selected_features_file = Path(__file__).parent / "saved_data" / "selected_features.json"
+    selected_features = json.loads(selected_features_file.read_text()) if selected_features_file.exists() else None
+    return {'timings': timings, 'dataset_cache_hit': cache_hit, 'selected_features': selected_features}
+
+
+class AnalysisService:
+    """
+    Job queue in front of a pool of warm worker processes.
+
+    :param workers: int - Number of worker processes.
+    :param max_concurrent: int - Number of jobs running at the same time.
+    :param queue_size: int - Number of jobs that may wait; further submissions are rejected.
+    """
+
+    def __init__(self, workers: int = 1, max_concurrent: int = 1, queue_size: int = 16):
+        self.workers = workers
+        self.max_concurrent = max_concurrent
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+        self._dispatcher = threading.Thread(target=self._dispatch, name="ada-dispatcher", daemon=True)
+
+    def start(self) -> None:
+        """Start the worker processes, wait until they are warm and begin dispatching jobs."""
+        start = time.perf_counter()
+        pids = set(self._pool.map(_ping, range(self.workers)))
+        print(f"{len(pids)} worker(s) ready in {time.perf_counter() - start:.1f}s")
+        self._dispatcher.start()
+
+    def submit(self, spec: dict) -> dict:
+        """
+        Validate and queue an analysis.
+
+        :raises ValueError: If the request is not a JSON object, is missing fields or names an unknown step.
+        :raises queue.Full: If the job queue is full.
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("The request body must be a JSON object.")
+        for field in ('data_path', 'target'):
+            if not spec.get(field):
+                raise ValueError(f"Missing required field '{field}'.")
+        if not Path(spec['data_path']).exists():
+            raise ValueError(f"Data file not found: {spec['data_path']}")
+        unknown = [step for step in spec.get('steps', STEPS) if step not in STEPS]
+        if unknown:
+            raise ValueError(f"Unknown steps {unknown}. Choose from {list(STEPS)}.")
+
+        job = {'job_id': uuid.uuid4().hex, 'status': 'queued', 'spec': spec, 'submitted': time.time(),
+               'started': None, 'finished': None, 'result': None, 'error': None}
+        with self._lock:
+            self._queue.put_nowait(job['job_id'])
+            self.jobs[job['job_id']] = job
+        return job
+
+    def _dispatch(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._slots.acquire()
+            with self._lock:
+                job = self.jobs[job_id]
+                job['status'], job['started'] = 'running', time.time()
+            future = self._pool.submit(_run_job, job['spec'])
+            future.add_done_callback(lambda done, job=job: self._finish(job, done))
+
+    def _finish(self, job: dict, future) -> None:
+        with self._lock:
+            job['finished'] = time.time()
+            if future.exception() is None:
+                job['status'], job['result'] = 'done', future.result()
+            else:
+                job['status'], job['error'] = 'failed', str(future.exception())
+        self._slots.release()
+        print(f"Job {job['job_id']} {job['status']} in {job['finished'] - job['started']:.1f}s")
+
+    def status(self) -> dict:
+        with self._lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'workers': self.workers, 'max_concurrent': self.max_concurrent,
+                'queued': self._queue.qsize(), 'jobs': counts}
+
+    def shutdown(self) -> None:
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def make_handler(service: AnalysisService):
+    """Build the HTTP request handler bound to `service`."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body) -> None:
+            payload = json.dumps(body, default=str).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            parts = [part for part in self.path.split("?")[0].split("/") if part]
+            if parts == ['health']:
+                self._send(200, service.status())
+            elif parts == ['jobs']:
+                with service._lock:
+                    self._send(200, list(service.jobs.values()))
+            elif len(parts) == 2 and parts[0] == 'jobs':
+                with service._lock:
+                    job = service.jobs.get(parts[1])
+                if job:
+                    self._send(200, job)
+                else:
+                    self._send(404, {'error': f"Unknown job '{parts[1]}'"})
+            else:
+                self._send(404, {'error': f"Unknown path '{self.path}'"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                self._send(404, {'error': f"Unknown path '{self.path}'"})
+                return
+            try:
+                spec = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                job = service.submit(spec)
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send(400, {'error': str(e)})
+            except queue.Full:
+                self._send(503, {'error': "Job queue is full, try again later."})
+            else:
+                self._send(202, {'job_id': job['job_id'], 'status': job['status']})
+
+    return Handler
+
+def start_server(service: AnalysisService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Serve `service` from a background thread; port 0 picks a free port (see `server.server_address`)."""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    threading.Thread(target=server.serve_forever, name="ada-http", daemon=True).start()
+    return server
+
+def _request(url: str, method: str = "GET", body: bytes = None) -> tuple:
+    """Send one HTTP request and return (status code, decoded JSON body)."""
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+    request = Request(url, data=body, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def smoke_test(data_path: str, target: str, problem_type: str = 'classification', steps: list = None,
+               timeout: float = 600.0) -> dict:
+    """
+    Exercise the service end to end on localhost: start it on an ephemeral port, check the health and
+    bad-request responses, submit one job and poll its status until it finishes.
+
+    :param data_path: str - CSV file to analyse.
+    :param target: str - Target column.
+    :param problem_type: str - 'classification' or 'regression'.
+    :param steps: list - Steps to run (defaults to 'preprocess' only, which keeps the test short).
+    :param timeout: float - Seconds to wait for the job.
+    :return: dict - The finished job.
+    :raises AssertionError: If a response is not the expected one or the job does not finish.
+    """
+    service = AnalysisService()
+    service.start()
+    server = start_server(service, port=0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        code, health = _request(f"{base}/health")
+        assert code == 200 and health['workers'] == 1, (code, health)
+        for body in (b"[]", b'"x"', b"{not json", b'{"target": "y"}'):
+            code, reply = _request(f"{base}/jobs", "POST", body)
+            assert code == 400, (body, code, reply)
+
+        spec = {'data_path': str(data_path), 'target': target, 'problem_type': problem_type,
+                'steps': steps or ['preprocess']}
+        code, reply = _request(f"{base}/jobs", "POST", json.dumps(spec).encode("utf-8"))
+        assert code == 202, (code, reply)
+        deadline = time.time() + timeout
+        while True:
+            code, job = _request(f"{base}/jobs/{reply['job_id']}")
+            assert code == 200, (code, job)
+            if job['status'] in ('done', 'failed') or time.time() > deadline:
+                break
+            time.sleep(0.5)
+        assert job['status'] == 'done', f"Job ended as '{job['status']}': {job['error']}"
+        assert _request(f"{base}/jobs/unknown")[0] == 404
+        print(f"Smoke test passed on {base}: job {job['job_id']} finished with timings {job['result']['timings']}")
+        return job
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = 1, max_concurrent: int = 1, queue_size: int = 16) -> None:
+    """Start the analysis service and block until interrupted."""
+    service = AnalysisService(workers=workers, max_concurrent=max_concurrent, queue_size=queue_size)
+    service.start()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"ADA server listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down...")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run ADA as a local analysis service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Number of warm worker processes.")
+    parser.add_argument("--max-concurrent", type=int, default=1,
+                        help="Jobs running at once; keep 1 unless jobs write to separate output folders.")
+    parser.add_argument("--queue-size", type=int, default=16, help="Maximum number of waiting jobs.")
+    parser.add_argument("--smoke-test", nargs=2, metavar=("DATA_PATH", "TARGET"),
+                        help="Run the service on an ephemeral localhost port, submit one job, poll it and exit.")
+    args = parser.parse_args()
+    if args.smoke_test:
+        smoke_test(*args.smoke_test)
+    else:
+        serve(args.host, args.port, args.workers, args.max_concurrent, args.queue_size)
@@ -0,0 +1,149 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+import numpy as np
+import pandas as pd
+
+"""
+Execution backends for the map/combine steps of the pipeline.
+
+A step is a module-level `map_fn(partition, **kwargs)` that returns a small partial result (counts,
+sums, fitted statistics) and a `combine_fn(results)` that merges those partial results. The backend
+decides where the partitions live and where `map_fn` runs:
+
+    InProcessBackend        one partition, run in the calling process (the default)
+    PartitionedBackend      row partitions processed by a pool of worker processes
+    LocalClusterBackend     several independent worker pools standing in for the nodes of a cluster
+
+Steps are written only against `split`, `map` and `map_combine`, so a backend for a real cluster
+only has to ship partitions to its workers and return the map results in partition order.
+"""
+
+
+class InProcessBackend:
+    """Run every step on the whole frame in the calling process."""
+
+    n_partitions = 1
+
+    def split(self, df: pd.DataFrame) -> list:
+        """Cut `df` into contiguous row partitions."""
+        if self.n_partitions <= 1 or len(df) < 2 * self.n_partitions:
+            return [df]
+        bounds = np.linspace(0, len(df), self.n_partitions + 1).astype(int)
+        return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def map(self, map_fn, partitions: list, **kwargs) -> list:
+        """Apply `map_fn(partition, **kwargs)` to every partition and return the results in partition order."""
+        return [map_fn(part, **kwargs) for part in partitions]
+
+    def map_combine(self, map_fn, combine_fn, df: pd.DataFrame, **kwargs):
+        """Split `df`, map every partition and merge the partial results."""
+        return combine_fn(self.map(map_fn, self.split(df), **kwargs))
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PartitionedBackend(InProcessBackend):
+    """
+    Split rows into partitions processed by worker processes.
+
+    :param n_partitions: int - Number of row partitions (defaults to the number of workers).
+    :param max_workers: int - Number of worker processes (defaults to the number of cores).
+    """
+
+    def __init__(self, n_partitions: int = None, max_workers: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.n_partitions = n_partitions or self.max_workers
+        self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Started on first use; spawned workers do not inherit the parent's large frames
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def map(self, map_fn, partitions: list, **kwargs) -> list:
+        if len(partitions) == 1:
+            return super().map(map_fn, partitions, **kwargs)
+        return list(self._executor().map(partial(map_fn, **kwargs), partitions))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+class LocalClusterBackend(PartitionedBackend):
+    """
+    Stand-in for a multi-node cluster: `n_nodes` separate worker pools, with partitions dealt to the nodes round-robin.
+
+    :param n_nodes: int - Number of simulated nodes.
+    :param workers_per_node: int - Worker processes per node.
+    :param n_partitions: int - Number of row partitions (defaults to one per worker).
+    """
+
+    def __init__(self, n_nodes: int = 2, workers_per_node: int = 1, n_partitions: int = None):
+        super().__init__(n_partitions=n_partitions or n_nodes * workers_per_node, max_workers=workers_per_node)
+        self.n_nodes = n_nodes
+        self._nodes = []
+
+    def map(self, map_fn, partitions: list, **kwargs) -> list:
+        if not self._nodes:
+            context = multiprocessing.get_context("spawn")
+            self._nodes = [ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) for _ in range(self.n_nodes)]
+        task = partial(map_fn, **kwargs)
+        futures = [self._nodes[i % self.n_nodes].submit(task, part) for i, part in enumerate(partitions)]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        for node in self._nodes:
+            node.shutdown(wait=True)
+        self._nodes = []
+
+
+BACKENDS = {
+    'inprocess': InProcessBackend,
+    'partitioned': PartitionedBackend,
+    'cluster': LocalClusterBackend
+}
+
+def get_backend(backend=None) -> InProcessBackend:
+    """
+    Resolve a backend instance from None (in-process), a name in `BACKENDS` or an existing instance.
+
+    :raises ValueError: If the name is unknown.
+    """
+    if backend is None:
+        return InProcessBackend()
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from {list(BACKENDS)}.")
+        return BACKENDS[backend]()
+    return backend
+
+
+# Combine steps shared by several stages
+
+def sum_series(results: list) -> pd.Series:
+    """Add up partial count/sum Series, aligning on their index."""
+    return reduce(lambda left, right: left.add(right, fill_value=0), results)
+
+def sum_counts(results: list) -> dict:
+    """Add up partial value counts per column: [{column: counts}, ...] -> {column: counts sorted descending}."""
+    columns = results[0].keys()
+    return {
+        col: sum_series([result[col] for result in results]).astype(np.int64).sort_values(ascending=False, kind='stable')
+        for col in columns
+    }
+
+def value_counts(part: pd.DataFrame, columns: list) -> dict:
+    """Map step: value counts of `columns` in one partition."""
+    return {col: part[col].value_counts() for col in columns}
@@ -0,0 +1,188 @@
+import json
+import pandas as pd
+from pathlib import Path
+
+"""
+Shared CSV ingestion.
+
+Files are parsed with the multithreaded pyarrow engine when pyarrow is installed (pip install pyarrow)
+and with pandas' C parser otherwise. Compression is inferred from the extension ('.gz', '.zst', ...).
+`iter_chunks` streams large CSV or Parquet files for scoring without loading them whole.
+
+The dtypes pandas inferred for a dataset are cached in 'saved_data/schema_cache.json'. On the next read
+of the same file they are passed as dtype hints, and text columns that the last preprocessing of that
+file categorized as nominal or ordinal (stored with its entry by `remember_categories`) are read straight
+into the 'category' dtype instead of one Python string per cell.
+"""
+
+SCHEMA_FILE = Path(__file__).parent.parent / "saved_data" / "schema_cache.json"
+CATEGORIES_FILE = Path(__file__).parent.parent / "saved_data" / "columns_categories.json"
+
+
+def csv_engine() -> str:
+    """The fastest available parser: 'pyarrow' (multithreaded) when installed, else 'c'."""
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        return 'c'
+
+def open_source(file_path) -> tuple:
+    """
+    Source and compression to hand to pandas; zstd files fall back to pyarrow's decoder when 'zstandard' is missing.
+
+    :return: tuple - (path or stream, compression).
+    :raises ImportError: If a zstd file cannot be decoded with the installed packages.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix not in ('.zst', '.zstd'):
+        return file_path, 'infer'
+    try:
+        import zstandard  # noqa: F401
+        return file_path, 'zstd'
+    except ImportError:
+        pass
+    try:
+        import pyarrow
+        return pyarrow.input_stream(str(file_path), compression='zstd'), None
+    except ImportError:
+        raise ImportError(f"Reading '{file_path.name}' needs zstandard or pyarrow (pip install zstandard).") from None
+
+def _read(file_path, **kwargs) -> pd.DataFrame:
+    source, compression = open_source(file_path)
+    try:
+        return pd.read_csv(source, compression=compression, **kwargs)
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+def read_header(file_path) -> list:
+    """Column names of a (possibly compressed) CSV file."""
+    return _read(file_path, nrows=0).columns.tolist()
+
+def read_csv(file_path, usecols=None, dtype=None) -> pd.DataFrame:
+    """
+    Read a CSV file with the fastest available engine.
+
+    :param file_path: str | Path - The (optionally gzip/zstd compressed) CSV file.
+    :param usecols: list - Optional subset of columns to read.
+    :param dtype: dict - Optional dtype per column.
+    :return: pd.DataFrame - The loaded data.
+    """
+    engine = csv_engine()
+    try:
+        return _read(file_path, usecols=usecols, dtype=dtype, engine=engine)
+    except (ValueError, pd.errors.ParserError) as e:
+        if engine == 'c':
+            raise
+        # pyarrow is stricter about malformed rows than the C parser
+        print(f"pyarrow could not parse '{Path(file_path).name}' ({e}), retrying with the C parser")
+        return _read(file_path, usecols=usecols, dtype=dtype)
+
+def iter_chunks(file_path, chunk_size: int = 100_000, usecols: list = None):
+    """
+    Stream a CSV (optionally compressed) or Parquet file as DataFrames of at most `chunk_size` rows.
+
+    :param file_path: str | Path - The file to stream; '.parquet' files are read with pyarrow.
+    :param chunk_size: int - Rows per chunk.
+    :param usecols: list - Optional columns to read; columns missing from the file are skipped.
+    :return: Iterator of pd.DataFrame chunks.
+    :raises ImportError: If a Parquet file is given and pyarrow is not installed.
+    """
+    wanted = set(usecols) if usecols is not None else None
+    if Path(file_path).suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(f"Reading '{Path(file_path).name}' needs pyarrow (pip install pyarrow).") from None
+        parquet = pq.ParquetFile(file_path)
+        columns = [col for col in parquet.schema_arrow.names if col in wanted] if wanted is not None else None
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+    source, compression = open_source(file_path)
+    try:
+        # The pyarrow engine cannot read in chunks, so streaming always uses the C parser
+        with pd.read_csv(source, compression=compression, chunksize=chunk_size,
+                         usecols=(lambda col: col in wanted) if wanted is not None else None) as reader:
+            yield from reader
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+def file_fingerprint(file_path) -> dict:
+    """Identity of a file's current contents: resolved path, size and modification time, or None if it does not exist."""
+    path = Path(file_path).resolve()
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return {'path': str(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def read_dataset(file_path, use_schema: bool = True) -> pd.DataFrame:
+    """
+    Read a raw dataset, using the cached schema of the previous run when its columns still match.
+
+    :param file_path: str | Path - The dataset to load.
+    :param use_schema: bool - Pass the cached dtypes as hints; False always infers them.
+    :return: pd.DataFrame - The loaded data.
+    """
+    key = str(Path(file_path).resolve())
+    cache = _load_json(SCHEMA_FILE)
+    schema = cache.get(key) if use_schema else None
+    if schema is not None and schema['columns'] == read_header(file_path):
+        dtypes = schema_dtypes(schema['dtypes'], schema.get('categorical', []))
+        try:
+            df = read_csv(file_path, dtype=dtypes)
+            print(f"Loaded '{Path(file_path).name}' with the cached schema ({len(dtypes)} columns)")
+            return df
+        except (ValueError, TypeError) as e:
+            # The file changed in a way the cached dtypes cannot represent (e.g. new missing values)
+            print(f"Cached schema no longer fits '{Path(file_path).name}' ({e}), inferring dtypes")
+
+    df = read_csv(file_path)
+    cache[key] = {'columns': df.columns.tolist(), 'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()}}
+    _save_schema_cache(cache)
+    return df
+
+def remember_categories(file_path, categories_file: Path = CATEGORIES_FILE) -> None:
+    """
+    Store the nominal and ordinal columns of a dataset's last preprocessing with its cached schema.
+
+    :param file_path: str | Path - The dataset that was just preprocessed.
+    :param categories_file: Path - The 'columns_categories.json' that run wrote.
+    """
+    key = str(Path(file_path).resolve())
+    cache = _load_json(SCHEMA_FILE)
+    if key not in cache:
+        return
+    columns_categories = _load_json(categories_file)
+    cache[key]['categorical'] = columns_categories.get('nominal', []) + columns_categories.get('ordinal', [])
+    _save_schema_cache(cache)
+
+def schema_dtypes(inferred: dict, categorical: list) -> dict:
+    """
+    Dtype hints from the dtypes inferred on the last read and the dataset's categorical columns.
+
+    Numeric and boolean columns keep their inferred dtype; text columns categorized as nominal or
+    ordinal become 'category'. Other text columns (strings, datetimes) are left to the parser.
+    """
+    categorical = set(categorical)
+    dtypes = {}
+    for col, dtype in inferred.items():
+        if dtype == 'object':
+            if col in categorical:
+                dtypes[col] = 'category'
+        elif dtype.startswith(('int', 'float', 'bool')):
+            dtypes[col] = dtype
+    return dtypes
+
+def _save_schema_cache(cache: dict) -> None:
+    SCHEMA_FILE.parent.mkdir(exist_ok=True)
+    with open(SCHEMA_FILE, 'w') as f:
+        json.dump(cache, f, indent=4)
+
+def _load_json(file_path: Path) -> dict:
+    if not Path(file_path).exists():
+        return {}
+    with open(file_path, 'r') as f:
+        return json.load(f)
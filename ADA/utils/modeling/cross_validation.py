@@ -0,0 +1,87 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy.stats import t as student_t
+from sklearn.base import clone
+from .model_search import selection_score
+
+
+def _fit_fold(estimator, X, y, folds, fold, model_type):
+ """Fit one candidate on every fold but `fold` and score it on `fold`."""
+ train = np.flatnonzero(folds != fold)
+ test = np.flatnonzero(folds == fold)
+ start = time.time()
+ estimator.fit(X[train], y[train])
+ fit_time = time.time() - start
+ return selection_score(y[test], estimator.predict(X[test]), model_type), fit_time
+
+
+def _bounds(scores: list, confidence: float) -> tuple:
+ """Student-t lower and upper confidence bounds of the mean fold score."""
+ mean = float(np.mean(scores))
+ if len(scores) < 2:
+  return -math.inf, math.inf
+ half_width = student_t.ppf(0.5 + confidence / 2, len(scores) - 1) * np.std(scores, ddof=1) / math.sqrt(len(scores))
+ return mean - half_width, mean + half_width
+
+
+def cross_validated_selection(models: dict, X, y, folds: np.ndarray, model_type: str = 'classification',
+                              n_jobs: int = -1, confidence: float = 0.95, min_folds: int = 2) -> dict:
+ """<b>Pick the best model by k-fold cross-validation with parallel folds and early elimination.</b>
+
+ Folds are evaluated in rounds, with the folds of all remaining candidates running in parallel.
+ After each round a candidate is dropped once the upper confidence bound of its mean fold score
+ falls below the best lower bound among the others, so clear losers stop costing fits early.
+
+ :param models: dict - Candidate models keyed by name.
+ :param X: array-like - Feature matrix.
+ :param y: array-like - Target values.
+ :param folds: np.ndarray - Fold id for every row (see `data_split.split_indices`).
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :param n_jobs: int - Number of parallel jobs (-1 uses all cores).
+ :param confidence: float - Confidence level of the elimination bounds.
+ :param min_folds: int - Number of folds every candidate is evaluated on before it can be eliminated.
+ :returns dict: 'best_model' (refit on all rows), 'best_name' and 'cv_results' (pd.DataFrame).
+ """
+ n_splits = int(folds.max()) + 1
+ scores = {name: [] for name in models}
+ fit_times = {name: 0.0 for name in models}
+ status = {name: 'completed' for name in models}
+ alive = list(models)
+ next_fold = 0
+ n_workers = effective_n_jobs(n_jobs)
+
+ while next_fold < n_splits and len(alive) > 1:
+  batch = max(min_folds if next_fold == 0 else 1, n_workers // len(alive))
+  batch_folds = range(next_fold, min(n_splits, next_fold + batch))
+  tasks = [(name, fold) for name in alive for fold in batch_folds]
+  outputs = Parallel(n_jobs=n_jobs)(
+   delayed(_fit_fold)(clone(models[name]), X, y, folds, fold, model_type) for name, fold in tasks
+  )
+  for (name, _), (score, fit_time) in zip(tasks, outputs):
+   scores[name].append(score)
+   fit_times[name] += fit_time
+  next_fold = batch_folds[-1] + 1
+  print(f"Cross-validation: {next_fold}/{n_splits} folds evaluated for {len(alive)} candidates")
+
+  bounds = {name: _bounds(scores[name], confidence) for name in alive}
+  for name in list(alive):
+   best_other = max(bounds[other][0] for other in alive if other != name)
+   if bounds[name][1] < best_other:
+    alive.remove(name)
+    status[name] = 'eliminated'
+    print(f"{name} eliminated after {len(scores[name])} folds")
+
+ best_name = max(alive, key=lambda name: np.mean(scores[name]) if scores[name] else -math.inf)
+ best_model = clone(models[best_name]).fit(X, y)
+ cv_results = pd.DataFrame([{
+  'model': name,
+  'mean_score': np.mean(scores[name]) if scores[name] else np.nan,
+  'std_score': np.std(scores[name], ddof=1) if len(scores[name]) > 1 else np.nan,
+  'n_folds': len(scores[name]),
+  'fit_time': fit_times[name],
+  'status': 'best' if name == best_name else status[name]
+ } for name in models]).sort_values('mean_score', ascending=False).reset_index(drop=True)
+ return {'best_model': best_model, 'best_name': best_name, 'cv_results': cv_results}
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from sklearn.model_selection import train_test_split, KFold, StratifiedKFold
+
+SPLIT_FILE = Path(__file__).parent.parent.parent / "saved_data" / "split_indices.npz"
+
+
+def feature_matrix(df: pd.DataFrame, target_col: str) -> tuple:
+ """<b>Build one contiguous float32 feature matrix and the target array from the DataFrame.</b>
+
+ Columns are copied one at a time into a preallocated C-ordered array, so no intermediate
+ `df.drop(columns=[target_col])` frame is created.
+
+ :param df: pd.DataFrame - The transformed DataFrame.
+ :param target_col: str - The name of the target column.
+ :returns tuple: (X, y, feature_names) where X is a C-contiguous float32 array.
+ """
+ feature_names = [col for col in df.columns if col != target_col]
+ X = np.empty((len(df), len(feature_names)), dtype=np.float32, order='C')
+ for i, col in enumerate(feature_names):
+  X[:, i] = df[col].to_numpy()
+ y = df[target_col].to_numpy()
+ return X, y, feature_names
+
+
+def _fingerprint(y: np.ndarray) -> np.uint64:
+ """Order-sensitive fingerprint of the target, used to detect a different dataset."""
+ hashes = pd.util.hash_array(np.asarray(y))
+ return np.uint64(np.bitwise_xor.reduce(hashes * np.arange(1, len(hashes) + 1, dtype=np.uint64))) if len(hashes) else np.uint64(0)
+
+
+def split_indices(y: np.ndarray, model_type: str = 'classification', test_size: float = 0.3,
+                  n_splits: int = 5, random_state: int = 42, path: Path = SPLIT_FILE) -> dict:
+ """<b>Load or compute the train/test split and cross-validation fold ids.</b>
+
+ The indices are stored as compact integer arrays in 'saved_data/split_indices.npz' and reused
+ as long as the number of rows, the split settings and the target fingerprint are unchanged.
+
+ :param y: np.ndarray - The target values.
+ :param model_type: str - Type of model ('classification' or 'regression'); classification folds are stratified.
+ :param test_size: float - Fraction of rows held out for testing.
+ :param n_splits: int - Number of cross-validation folds.
+ :param random_state: int - Seed for the split and the folds.
+ :param path: Path - Location of the cache file.
+ :returns dict: 'train_idx' and 'test_idx' (int32 row indices) and 'folds' (int8 fold id per row).
+ """
+ n_rows = len(y)
+ settings = np.array([n_rows, n_splits, random_state, int(test_size * 1e6)], dtype=np.int64)
+ fingerprint = _fingerprint(y)
+ path = Path(path)
+ if path.exists():
+  with np.load(path) as cached:
+   if np.array_equal(cached['settings'], settings) and cached['fingerprint'] == fingerprint:
+    return {'train_idx': cached['train_idx'], 'test_idx': cached['test_idx'], 'folds': cached['folds']}
+
+ index_dtype = np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+ train_idx, test_idx = train_test_split(np.arange(n_rows, dtype=index_dtype), test_size=test_size, random_state=random_state)
+
+ folds = np.empty(n_rows, dtype=np.int8)
+ splitter = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+ if model_type == 'classification' and pd.Series(y).value_counts().min() >= n_splits:
+  splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+ for fold, (_, fold_idx) in enumerate(splitter.split(np.zeros((n_rows, 1)), y)):
+  folds[fold_idx] = fold
+
+ path.parent.mkdir(exist_ok=True)
+ np.savez(path, settings=settings, fingerprint=fingerprint, train_idx=train_idx, test_idx=test_idx, folds=folds)
+ print(f"Split indices saved to '{path.name}'")
+ return {'train_idx': train_idx, 'test_idx': test_idx, 'folds': folds}
+
+
+def prepare_modeling_data(df: pd.DataFrame, target_col: str, model_type: str = 'classification', **split_kwargs) -> dict:
+ """<b>Build the shared feature matrix and the cached split for one modeling run.</b>
+
+ :param df: pd.DataFrame - The transformed DataFrame.
+ :param target_col: str - The name of the target column.
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :param split_kwargs: Extra options forwarded to `split_indices`.
+ :returns dict: 'X', 'y', 'feature_names', 'train_idx', 'test_idx' and 'folds'.
+ """
+ X, y, feature_names = feature_matrix(df, target_col)
+ data = {'X': X, 'y': y, 'feature_names': feature_names}
+ data.update(split_indices(y, model_type, **split_kwargs))
+ return data
@@ -0,0 +1,123 @@
+import sys
+import tracemalloc
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from pathlib import Path
+from .data_split import split_indices
+from ADA.utils.ingest import read_csv, read_header
+
+MATRIX_FILE = Path(__file__).parent.parent.parent / "saved_data" / "feature_matrix.npy"
+
+
+def peak_memory_mb() -> float:
+ """<b>Peak resident memory of the current process in MB, or None when it cannot be measured.</b>"""
+ try:
+  import resource
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KB on Linux
+ except ImportError:
+  pass
+ try:
+  import psutil
+  return psutil.Process().memory_info().peak_wset / 1024 ** 2  # Windows
+ except (ImportError, AttributeError):
+  return None
+
+
+def take_rows(X: np.ndarray, idx: np.ndarray) -> np.ndarray:
+ """<b>Select rows, returning a view instead of a copy when `idx` is a contiguous ascending range.</b>"""
+ if len(idx) and idx[-1] - idx[0] == len(idx) - 1 and np.all(np.diff(idx) == 1):
+  return X[int(idx[0]):int(idx[-1]) + 1]
+ return X[idx]
+
+
+def build_feature_matrix(csv_path: Path, target_col: str, model_type: str = 'classification', path: Path = MATRIX_FILE,
+                         chunksize: int = 50_000, sparse_features: tuple = None, **split_kwargs) -> dict:
+ """<b>Stream the transformed CSV into a memory-mapped float32 feature matrix ordered train rows first.</b>
+
+ The target column is read first and used to compute (or load) the cached split. The feature columns
+ are then read in chunks of `chunksize` rows and written straight into a C-contiguous float32 `.npy`
+ memmap, with the training rows placed before the test rows. The training and test matrices are
+ therefore plain slices of the memmap, so `model_selection` and RFE use them without copying the data.
+
+ :param csv_path: Path - The transformed data CSV.
+ :param target_col: str - The name of the target column.
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :param path: Path - Location of the memmap file.
+ :param chunksize: int - Number of rows read per chunk.
+ :param sparse_features: tuple - Optional (CSR matrix, names) row-aligned with the CSV, e.g. hashed string
+  columns. They are appended after the dense features and 'X' becomes a CSR matrix.
+ :param split_kwargs: Extra options forwarded to `split_indices`.
+ :returns dict: 'X' (read-only memmap, or CSR with `sparse_features`), 'y', 'feature_names', 'train_idx', 'test_idx' and 'folds' in the memmap's row order.
+ """
+ tracemalloc.start()
+ feature_names = [col for col in read_header(csv_path) if col != target_col]
+ y = read_csv(csv_path, usecols=[target_col])[target_col].to_numpy()
+ split = split_indices(y, model_type, **split_kwargs)
+
+ # Row r of the file goes to position[r] of the matrix: training rows first, then test rows
+ order = np.concatenate([split['train_idx'], split['test_idx']])
+ position = np.empty(len(y), dtype=np.int64)
+ position[order] = np.arange(len(y))
+
+ path = Path(path)
+ path.parent.mkdir(exist_ok=True)
+ X = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(len(y), len(feature_names)))
+ start = 0
+ for chunk in pd.read_csv(csv_path, usecols=feature_names, chunksize=chunksize):
+  stop = start + len(chunk)
+  X[position[start:stop]] = chunk[feature_names].to_numpy(dtype=np.float32)
+  start = stop
+ X.flush()
+ del X
+ _, builder_peak = tracemalloc.get_traced_memory()
+ tracemalloc.stop()
+
+ n_train = len(split['train_idx'])
+ index_dtype = split['train_idx'].dtype
+ print(f"Feature matrix {len(y)} x {len(feature_names)} written to '{path.name}' "
+       f"({path.stat().st_size / 1024 ** 2:.1f} MB on disk, {builder_peak / 1024 ** 2:.1f} MB peak while building)")
+ X = np.load(path, mmap_mode='r')
+ if sparse_features is not None and sparse_features[0].shape[0] != len(y):
+  print(f"Ignoring {len(sparse_features[1])} sparse features with {sparse_features[0].shape[0]} rows instead of {len(y)}")
+ elif sparse_features is not None:
+  # Convert the dense block chunk by chunk and stack the sparse columns after it, in the same row order
+  matrix, sparse_names = sparse_features
+  X = sparse.hstack([
+   sparse.vstack([sparse.csr_matrix(X[start:start + chunksize]) for start in range(0, max(len(X), 1), chunksize)]),
+   matrix[order]
+  ], format='csr', dtype=np.float32)
+  feature_names = feature_names + list(sparse_names)
+  print(f"Added {len(sparse_names)} sparse features ({X.nnz / max(X.shape[0] * X.shape[1], 1):.2%} non-zero)")
+ return {
+  'X': X,
+  'y': y[order],
+  'feature_names': feature_names,
+  'train_idx': np.arange(n_train, dtype=index_dtype),
+  'test_idx': np.arange(n_train, len(y), dtype=index_dtype),
+  'folds': split['folds'][order]
+ }
+
+
+def select_columns(X: np.ndarray, columns: np.ndarray, chunksize: int = 50_000) -> np.ndarray:
+ """<b>Keep only `columns` of the feature matrix, row chunk by row chunk.</b>
+
+ A memmapped matrix is reduced into a new memmap next to it, so the full-width data never has to fit in RAM.
+
+ :param X: np.ndarray - Feature matrix, optionally a `.npy` memmap or a sparse matrix.
+ :param columns: np.ndarray - Indices of the columns to keep.
+ :param chunksize: int - Number of rows copied at a time.
+ :returns np.ndarray: The reduced C-contiguous float32 matrix (CSR for sparse input).
+ """
+ if sparse.issparse(X):
+  return X[:, columns].tocsr()
+ if not isinstance(X, np.memmap):
+  return np.ascontiguousarray(X[:, columns])
+ path = Path(X.filename).with_name(Path(X.filename).stem + "_selected.npy")
+ reduced = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(len(X), len(columns)))
+ for start in range(0, len(X), chunksize):
+  reduced[start:start + chunksize] = X[start:start + chunksize, columns]
+ reduced.flush()
+ del reduced
+ return np.load(path, mmap_mode='r')
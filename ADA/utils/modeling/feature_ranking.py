@@ -0,0 +1,87 @@
+import json
+import numpy as np
+from pathlib import Path
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.feature_selection import RFE
+
+
+def _rank_subsample(estimator, X, y, rows: np.ndarray, n_features_to_select: int, step) -> tuple:
+ """Run RFE on one subsample and return its ranking and support."""
+ rfe = RFE(estimator=clone(estimator), n_features_to_select=n_features_to_select, step=step)
+ rfe.fit(X[rows], y[rows])
+ return rfe.ranking_, rfe.support_
+
+
+class SubsampleRFE:
+ """<b>Two-phase recursive feature elimination: rank on bootstrap subsamples, confirm once on all rows.</b>
+
+ RFE runs in parallel on `n_subsamples` small bootstrap samples and the features are ordered by
+ their mean rank. The estimator is then fitted a single time on all rows of the chosen features.
+ Exposes the same `support_`, `ranking_` and `estimator_` attributes as `sklearn.feature_selection.RFE`,
+ plus `stability_`: the fraction of subsamples in which each feature was selected.
+
+ :param estimator: The model used to rank and confirm the features.
+ :param n_features_to_select: int - Number of features to keep.
+ :param n_subsamples: int - Number of bootstrap subsamples.
+ :param subsample_size: float - Fraction of rows (or number of rows when > 1) drawn per subsample.
+ :param min_rows: int - Smallest subsample size.
+ :param step: int - Features removed per RFE iteration.
+ :param n_jobs: int - Number of parallel jobs (-1 uses all cores).
+ :param random_state: int - Seed of the subsamples.
+ """
+
+ def __init__(self, estimator, n_features_to_select: int = None, n_subsamples: int = 8, subsample_size: float = 0.1,
+              min_rows: int = 200, step=1, n_jobs: int = -1, random_state: int = 42):
+  self.estimator = estimator
+  self.n_features_to_select = n_features_to_select
+  self.n_subsamples = n_subsamples
+  self.subsample_size = subsample_size
+  self.min_rows = min_rows
+  self.step = step
+  self.n_jobs = n_jobs
+  self.random_state = random_state
+
+ def fit(self, X, y):
+  n_rows, n_features = X.shape
+  y = np.asarray(y)
+  n_select = n_features // 2 if self.n_features_to_select is None else min(self.n_features_to_select, n_features)
+
+  if n_select < n_features:
+   size = int(self.subsample_size * n_rows) if self.subsample_size <= 1 else int(self.subsample_size)
+   size = min(n_rows, max(size, self.min_rows))
+   rng = np.random.default_rng(self.random_state)
+   samples = [rng.choice(n_rows, size=size, replace=True) for _ in range(self.n_subsamples)]
+   results = Parallel(n_jobs=self.n_jobs)(
+    delayed(_rank_subsample)(self.estimator, X, y, rows, n_select, self.step) for rows in samples
+   )
+   rankings = np.array([ranking for ranking, _ in results], dtype=np.float64)
+   self.ranking_ = rankings.mean(axis=0)
+   self.stability_ = np.array([support for _, support in results], dtype=np.float64).mean(axis=0)
+   print(f"Ranked {n_features} features on {self.n_subsamples} subsamples of {size} rows")
+  else:
+   # Nothing to eliminate: every feature is kept
+   self.ranking_ = np.ones(n_features)
+   self.stability_ = np.ones(n_features)
+
+  self.support_ = np.zeros(n_features, dtype=bool)
+  # Lowest mean rank first, ties broken by the higher stability
+  self.support_[np.lexsort((-self.stability_, self.ranking_))[:n_select]] = True
+  self.n_features_ = int(self.support_.sum())
+
+  # Confirmation fit on all rows of the chosen features
+  self.estimator_ = clone(self.estimator).fit(X[:, self.support_], y)
+  return self
+
+
+def export_feature_stability(feature_names: list, ranking: np.ndarray, stability: np.ndarray, support: np.ndarray,
+                             file_path: Path) -> None:
+ """<b>Write the mean rank, stability and selection of every feature, most stable first.</b>"""
+ records = [
+  {'feature': name, 'stability': float(stable), 'mean_rank': float(rank), 'selected': bool(keep)}
+  for name, rank, stable, keep in zip(feature_names, ranking, stability, support)
+ ]
+ records.sort(key=lambda record: (-record['stability'], record['mean_rank']))
+ with open(file_path, 'w') as f:
+  json.dump(records, f, indent=4)
+ print(f"Feature stability saved to '{Path(file_path).name}'")
@@ -0,0 +1,197 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression, LogisticRegression, Ridge
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+from sklearn.metrics import accuracy_score, f1_score, mean_squared_error, r2_score
+
+# Candidate models and the hyperparameters sampled for each of them.
+SEARCH_SPACES = {
+ 'classification': {
+  'Random Forest': (RandomForestClassifier(n_jobs=1), {
+   'n_estimators': [50, 100, 200],
+   'max_depth': [None, 10, 20],
+   'min_samples_leaf': [1, 2, 5],
+   'max_features': ['sqrt', 0.5],
+  }),
+  'Decision Tree': (DecisionTreeClassifier(), {
+   'max_depth': [None, 5, 10, 20],
+   'min_samples_leaf': [1, 2, 5, 10],
+   'criterion': ['gini', 'entropy'],
+  }),
+ },
+ 'regression': {
+  'Linear Regression': (LinearRegression(), {
+   'fit_intercept': [True, False],
+  }),
+  'Random Forest': (RandomForestRegressor(n_jobs=1), {
+   'n_estimators': [50, 100, 200],
+   'max_depth': [None, 10, 20],
+   'min_samples_leaf': [1, 2, 5],
+   'max_features': [1.0, 0.5],
+  }),
+  'Decision Tree': (DecisionTreeRegressor(), {
+   'max_depth': [None, 5, 10, 20],
+   'min_samples_leaf': [1, 2, 5, 10],
+  }),
+ }
+}
+
+# Extra candidates for sparse (one-hot or hashed) feature matrices: linear models that only touch the non-zeros
+SPARSE_SEARCH_SPACES = {
+ 'classification': {
+  'Logistic Regression': (LogisticRegression(solver='liblinear', max_iter=1000), {
+   'C': [0.01, 0.1, 1.0, 10.0],
+   # l1_ratio 0.0 is the l2 penalty and 1.0 the l1 penalty; `penalty` is deprecated in scikit-learn 1.8
+   'l1_ratio': [0.0, 1.0],
+  }),
+ },
+ 'regression': {
+  'Ridge': (Ridge(solver='sparse_cg'), {
+   'alpha': [0.1, 1.0, 10.0, 100.0],
+  }),
+ }
+}
+
+
+def selection_score(y_true, y_pred, model_type: str = 'classification') -> float:
+ """<b>Score predictions with the composite metric used to rank models.</b>
+
+ :param y_true: array-like - The true target values.
+ :param y_pred: array-like - The predicted target values.
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :returns float: `5*accuracy + 10*f1` for classification, `5*r2 - mse` for regression.
+ """
+ if model_type == 'classification':
+  accuracy = accuracy_score(y_true, y_pred)
+  f1 = f1_score(y_true, y_pred, average='weighted')
+  return 5*accuracy + 10*f1
+ mse = mean_squared_error(y_true, y_pred)
+ r2 = r2_score(y_true, y_pred)
+ return 5*r2 - mse
+
+
+def build_candidates(model_type: str = 'classification', n_candidates: int = 16, random_state: int = 42,
+                     sparse_input: bool = False) -> list:
+ """<b>Sample hyperparameter candidates spread evenly over the search spaces.</b>
+
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :param n_candidates: int - Total number of candidates to sample.
+ :param random_state: int - Seed for the parameter sampler.
+ :param sparse_input: bool - Also sample the linear models of `SPARSE_SEARCH_SPACES`.
+ :returns list: A list of (name, estimator, params) tuples.
+ """
+ spaces = {**SEARCH_SPACES[model_type], **SPARSE_SEARCH_SPACES[model_type]} if sparse_input else SEARCH_SPACES[model_type]
+ per_model = max(1, n_candidates // len(spaces))
+ candidates = []
+ for name, (estimator, grid) in spaces.items():
+  n_grid = len(ParameterGrid(grid))
+  if n_grid <= per_model:
+   params_list = list(ParameterGrid(grid))
+  else:
+   params_list = list(ParameterSampler(grid, n_iter=per_model, random_state=random_state))
+  for params in params_list:
+   candidates.append((name, clone(estimator).set_params(**params), params))
+ return candidates
+
+
+def _fit_and_score(estimator, X_train, y_train, X_val, y_val, model_type, deadline):
+ """Fit one candidate on a data subset and score it, unless the deadline has passed."""
+ if time.time() > deadline:
+  return None
+ start = time.time()
+ estimator.fit(X_train, y_train)
+ fit_time = time.time() - start
+ start = time.time()
+ y_pred = estimator.predict(X_val)
+ score = selection_score(y_val, y_pred, model_type)
+ return estimator, score, fit_time, time.time() - start
+
+
+def successive_halving(X_train, y_train, X_val, y_val, model_type: str = 'classification',
+                       n_candidates: int = 16, factor: int = 3, min_resources: int = 100,
+                       time_budget: float = 60.0, n_jobs: int = -1, random_state: int = 42) -> dict:
+ """<b>Search models and hyperparameters with successive halving under a wall-clock budget.</b>
+
+ Every round fits the surviving candidates in parallel on a growing, nested subset of the
+ training rows, scores them on the validation set and keeps the best `1/factor` of them.
+ Candidates that would start after the budget runs out are skipped.
+
+ :param X_train: array-like - Training features.
+ :param y_train: array-like - Training target.
+ :param X_val: array-like - Validation features used to score candidates.
+ :param y_val: array-like - Validation target.
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :param n_candidates: int - Number of candidates in the first round.
+ :param factor: int - Fraction of candidates kept each round and growth rate of the subset size.
+ :param min_resources: int - Number of training rows used in the first round.
+ :param time_budget: float - Wall-clock budget in seconds for the whole search.
+ :param n_jobs: int - Number of parallel jobs (-1 uses all cores).
+ :param random_state: int - Seed for candidate sampling and the row permutation.
+ :returns dict: 'best_model', 'best_name', 'best_params', 'best_score', 'leaderboard' (pd.DataFrame
+  with one row per candidate and round, including fit and score timings) and 'elapsed'.
+ """
+ start = time.time()
+ deadline = start + time_budget
+ n_rows = len(y_train)
+ candidates = build_candidates(model_type, n_candidates, random_state, sparse_input=sparse.issparse(X_train))
+ n_rounds = max(1, math.ceil(math.log(len(candidates), factor)) + 1) if len(candidates) > 1 else 1
+ resources = max(min(min_resources, n_rows), n_rows // factor ** (n_rounds - 1))
+ order = np.random.RandomState(random_state).permutation(n_rows)
+
+ alive = list(range(len(candidates)))
+ fitted = {}
+ rows = []
+ for rnd in range(n_rounds):
+  n_samples = n_rows if rnd == n_rounds - 1 else min(n_rows, resources * factor ** rnd)
+  subset = np.sort(order[:n_samples])
+  X_sub = X_train.iloc[subset] if hasattr(X_train, 'iloc') else X_train[subset]
+  y_sub = y_train.iloc[subset] if hasattr(y_train, 'iloc') else y_train[subset]
+  print(f"Successive halving round {rnd + 1}/{n_rounds}: {len(alive)} candidates on {n_samples} rows")
+  outputs = Parallel(n_jobs=n_jobs)(
+   delayed(_fit_and_score)(clone(candidates[i][1]), X_sub, y_sub, X_val, y_val, model_type, deadline)
+   for i in alive
+  )
+  scores = {}
+  for i, output in zip(alive, outputs):
+   name, _, params = candidates[i]
+   if output is None:
+    rows.append({'model': name, 'params': params, 'round': rnd + 1, 'n_samples': n_samples,
+                 'score': np.nan, 'fit_time': np.nan, 'score_time': np.nan, 'status': 'skipped'})
+    continue
+   estimator, score, fit_time, score_time = output
+   fitted[i] = (estimator, n_samples)
+   scores[i] = score
+   rows.append({'model': name, 'params': params, 'round': rnd + 1, 'n_samples': n_samples,
+                'score': score, 'fit_time': fit_time, 'score_time': score_time, 'status': 'fitted'})
+  if not scores:
+   break
+  ranked = sorted(scores, key=scores.get, reverse=True)
+  alive = ranked[:max(1, math.ceil(len(ranked) / factor))]
+  if len(alive) == 1 or n_samples >= n_rows or time.time() > deadline:
+   break
+
+ if not fitted:
+  raise RuntimeError("Time budget exhausted before any candidate could be fitted.")
+ best = alive[0]
+ best_name, _, best_params = candidates[best]
+ best_model, n_samples = fitted[best]
+ if n_samples < n_rows:
+  # The search stopped before the last round, so give the winner the full training set.
+  best_model = clone(best_model).fit(X_train, y_train)
+
+ leaderboard = pd.DataFrame(rows).sort_values(['round', 'score'], ascending=[False, False]).reset_index(drop=True)
+ return {
+  'best_model': best_model,
+  'best_name': best_name,
+  'best_params': best_params,
+  'best_score': leaderboard.loc[leaderboard['status'] == 'fitted', 'score'].iloc[0],
+  'leaderboard': leaderboard,
+  'elapsed': time.time() - start
+ }
@@ -1,33 +1,60 @@
 import os
+import joblib
+import numpy as np
+from scipy import sparse
 from sklearn.feature_selection import RFE
 from sklearn.linear_model import LogisticRegression
-from sklearn.linear_model import LinearRegression
+from sklearn.linear_model import LinearRegression, Ridge
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, f1_score, mean_squared_error, r2_score
 import pandas as pd
 from pathlib import Path
 import json
+from .model_search import selection_score, successive_halving
+from .data_split import prepare_modeling_data
+from .feature_ranking import SubsampleRFE, export_feature_stability
+from .feature_matrix import build_feature_matrix, select_columns, take_rows, peak_memory_mb
+from .cross_validation import cross_validated_selection
+from ADA.utils.preprocess.associations import target_associations
+from ADA.utils.preprocess.sparse_features import load_sparse_features
+from ADA.utils.preprocess.data_transformation import load_transform_state
+from ADA.utils.ingest import read_csv
 
-def model_data(target_col: str,n: int = 1000, model_type: str = 'classification') -> None:
+def model_data(target_col: str,n: int = 1000, model_type: str = 'classification', prescreen: int = 0, rfe_subsamples: int = 0,
+               **selection_kwargs) -> None:
  """<b>Model the DataFrame using various machine learning algorithms.</b>
 
  :param target_col: str - The name of the target column.
  :param n: int - Number of features to select using RFE (Recursive Feature Elimination).
  :param model_type: str - Type of model to use ('classification' or 'regression').
+ :param prescreen: int - Keep only this many features most associated with the target before model selection (0 keeps all).
+ :param rfe_subsamples: int - Rank features with RFE on this many bootstrap subsamples and confirm them with one
+                        full-data fit (see `SubsampleRFE`); 0 runs a single RFE on all training rows.
+ :param selection_kwargs: Extra options forwarded to `model_selection` (e.g. search, cv, time_budget, n_jobs).
  :returns dict: A dictionary containing model performance metrics.
  
  """
- with open(Path(__file__).parent.parent.parent / 'saved_data/transformed_data.csv', 'r') as f:
-    print(Path(__file__).parent.parent.parent)
-    df = pd.read_csv(f)
-
- selected_model = model_selection(df, target_col, model_type)
- X = df.drop(columns=[target_col])
- y = df[target_col]
- rfe = RFE(estimator=selected_model, n_features_to_select=n)
- rfe.fit_transform(X, y)
+ _check_cv(selection_kwargs.get('cv', 0))
+ # Stream the transformed data into an on-disk float32 matrix instead of a DataFrame
+ saved_data = Path(__file__).parent.parent.parent / 'saved_data'
+ data = build_feature_matrix(saved_data / 'transformed_data.csv', target_col, model_type,
+                             sparse_features=load_sparse_features(saved_data),
+                             n_splits=selection_kwargs.get('cv') or 5)
+ if prescreen:
+  data = prescreen_features(data, model_type, prescreen)
+ selected_model = model_selection(None, target_col, model_type, data=data, **selection_kwargs)
+ train_idx = data['train_idx']
+ # One-hot and hashed features add thousands of columns; drop 10% of the remaining ones per RFE iteration instead of one
+ step = 0.1 if sparse.issparse(data['X']) else 1
+ if rfe_subsamples:
+  rfe = SubsampleRFE(estimator=selected_model, n_features_to_select=n, n_subsamples=rfe_subsamples, step=step,
+                     n_jobs=selection_kwargs.get('n_jobs', -1))
+ else:
+  rfe = RFE(estimator=selected_model, n_features_to_select=n, step=step)
+ rfe.fit(take_rows(data['X'], train_idx), data['y'][train_idx])
+ peak = peak_memory_mb()
+ if peak is not None:
+  print(f"Peak memory: {peak:.0f} MB")
  if rfe.support_.any():
   # Get the current script's directory (utils/modeling/)
   current_dir = Path(__file__).parent
@@ -40,22 +67,107 @@ def model_data(target_col: str,n: int = 1000, model_type: str = 'classification'
   json_path = target_dir / "selected_features.json"
 
   with open(json_path, 'w') as f:
-   selected_features = X.columns[rfe.support_].tolist()
+   selected_features = [name for name, keep in zip(data['feature_names'], rfe.support_) if keep]
    selected_features.append(target_col)  # Include the target column
    json.dump(selected_features, f, indent=4)
    print("Selected features saved to 'selected_features.json'")
+  if rfe_subsamples:
+   export_feature_stability(data['feature_names'], rfe.ranking_, rfe.stability_, rfe.support_,
+                            target_dir / "feature_stability.json")
+  export_model(rfe.estimator_, selected_features[:-1], target_col, model_type)
   return selected_features.append(target_col)
  return None
 
-def model_selection(df: pd.DataFrame, target_col: str, model_type: str = 'classification') -> dict:
- """<b>Select and evaluate machine learning models on the DataFrame.</b>"""
- # Split the data into features and target
- X = df.drop(columns=[target_col])
- y = df[target_col]
+def prescreen_features(data: dict, model_type: str, keep: int) -> dict:
+ """<b>Keep the `keep` features most associated with the target, measured on the training rows.</b>
+
+ Numeric features are scored by |Pearson r| or the correlation ratio and categorical features
+ (nominal and ordinal in 'columns_categories.json') by Cramér's V or the correlation ratio.
+ The scores are written to 'saved_data/feature_associations.csv'.
+
+ :param data: dict - Output of `prepare_modeling_data`.
+ :param model_type: str - Type of model ('classification' or 'regression').
+ :param keep: int - Number of features to keep.
+ :returns dict: `data` with the reduced feature matrix and feature names.
+ """
+ target_dir = Path(__file__).parent.parent.parent / "saved_data"
+ categories_file = target_dir / "columns_categories.json"
+ categories = json.loads(categories_file.read_text()) if categories_file.exists() else {}
+ categorical = set(categories.get('nominal', []) + categories.get('ordinal', []))
+
+ train_idx = data['train_idx']
+ scores = target_associations(take_rows(data['X'], train_idx), data['y'][train_idx],
+                              [name in categorical for name in data['feature_names']],
+                              target_is_categorical=model_type == 'classification')
+ associations = pd.DataFrame({'feature': data['feature_names'], 'association': scores})
+ associations.sort_values('association', ascending=False).to_csv(target_dir / "feature_associations.csv", index=False)
+
+ kept = np.sort(np.argsort(-scores, kind='stable')[:keep])
+ print(f"Prescreening kept {len(kept)} of {len(scores)} features")
+ return {**data, 'X': select_columns(data['X'], kept), 'feature_names': [data['feature_names'][i] for i in kept]}
+
+def model_selection(df: pd.DataFrame, target_col: str, model_type: str = 'classification',
+                    search: bool = False, cv: int = 0, time_budget: float = 60.0, n_jobs: int = -1,
+                    data: dict = None) -> dict:
+ """<b>Select and evaluate machine learning models on the DataFrame.</b>
 
- # Split into training and testing sets
- X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
+ :param df: pd.DataFrame - The transformed DataFrame.
+ :param target_col: str - The name of the target column.
+ :param model_type: str - Type of model to use ('classification' or 'regression').
+ :param search: bool - Run a budgeted successive-halving hyperparameter search instead of fitting default models.
+ :param cv: int - Number of cross-validation folds; 0 keeps the single 70/30 holdout. Ignored when `search` is set.
+ :param time_budget: float - Wall-clock budget in seconds for the search.
+ :param n_jobs: int - Number of parallel jobs used by the search and cross-validation (-1 uses all cores).
+ :param data: dict - Precomputed output of `prepare_modeling_data`; built from `df` when omitted.
+ :returns: The best fitted model.
+ """
+ _check_cv(cv)
+ # Split the data into features and target, reusing the cached split indices
+ if data is None:
+  data = prepare_modeling_data(df, target_col, model_type, n_splits=cv or 5)
+ X, y = data['X'], data['y']
+ X_train, X_test = take_rows(X, data['train_idx']), take_rows(X, data['test_idx'])
+ y_train, y_test = y[data['train_idx']], y[data['test_idx']]
+
+ if search:
+  search_results = successive_halving(X_train, y_train, X_test, y_test, model_type,
+                                      time_budget=time_budget, n_jobs=n_jobs)
+  export_leaderboard(search_results['leaderboard'])
+  print(f"Best model: {search_results['best_name']} {search_results['best_params']} "
+        f"(score {search_results['best_score']:.4f}, search took {search_results['elapsed']:.1f}s)")
+  return search_results['best_model']
 
+ models = default_models(model_type, sparse_input=sparse.issparse(X))
+
+ if cv:
+  cv_results = cross_validated_selection(models, X, y, data['folds'], model_type, n_jobs=n_jobs)
+  export_leaderboard(cv_results['cv_results'], "cv_results.csv")
+  print(f"Best model: {cv_results['best_name']}")
+  return cv_results['best_model']
+
+ results = [None, -999999999999]
+
+ for name, model in models.items():
+  # Fit the model
+  print(f"Training {name}...")
+  model.fit(X_train, y_train)
+  
+  # Make predictions
+  y_pred = model.predict(X_test)
+  
+  # Calculate performance metrics
+  score = selection_score(y_test, y_pred, model_type)
+  results = [model, score] if score > results[1] else results
+
+
+ return results[0]
+
+def default_models(model_type: str = 'classification', sparse_input: bool = False) -> dict:
+ """<b>Default-parameter candidate models for the given problem type.</b>
+
+ With sparse input (one-hot or hashed features) a linear model that works on the non-zeros
+ directly is added, since the trees are much slower on wide sparse matrices.
+ """
  # Initialize models based on the type
  if model_type == 'classification':
   models = {
@@ -73,29 +185,102 @@ def model_selection(df: pd.DataFrame, target_col: str, model_type: str = 'classi
    'Decision Tree': DecisionTreeRegressor(),
    #'KNN': KNeighborsRegressor()
   }
+ if sparse_input and model_type == 'classification':
+  models['Logistic Regression'] = LogisticRegression(solver='liblinear', max_iter=1000)
+ elif sparse_input:
+  models['Ridge'] = Ridge(solver='sparse_cg')
+ return models
 
- results = [None, -999999999999]
+def export_model(model, features: list, target_col: str, model_type: str) -> None:
+ """<b>Save the fitted model and the features it expects to 'saved_data/selected_model.pkl'.</b>
 
- for name, model in models.items():
-  # Fit the model
-  print(f"Training {name}...")
-  model.fit(X_train, y_train)
-  
-  # Make predictions
-  y_pred = model.predict(X_test)
-  
-  # Calculate performance metrics
-  if model_type == 'classification':
-   accuracy = accuracy_score(y_test, y_pred)
-   f1 = f1_score(y_test, y_pred, average='weighted')
-   results = [model, 5*accuracy + 10*f1] if 5*accuracy + 10*f1 > results[1] else results
-  else:
-   mse = mean_squared_error(y_test, y_pred)
-   r2 = r2_score(y_test, y_pred)
-   results = [model, 5*r2 - mse] if 5*r2 - mse > results[1] else results
+ A scoring artifact bundling the model with the saved transforms is written next to it (see `scoring.export_artifact`).
+ """
+ from .scoring import export_artifact
+ target_dir = Path(__file__).parent.parent.parent / "saved_data"
+ target_dir.mkdir(exist_ok=True)
+ bundle = {'model': model, 'features': features, 'target': target_col, 'model_type': model_type}
+ joblib.dump(bundle, target_dir / "selected_model.pkl")
+ print("Selected model saved to 'selected_model.pkl'")
+ export_artifact(bundle, target_dir)
 
+def _check_cv(cv):
+ """Reject fold counts k-fold splitting cannot use before any data is split."""
+ if cv and (isinstance(cv, bool) or not isinstance(cv, (int, np.integer)) or cv < 2):
+  raise ValueError(f"cv must be 0 (single holdout) or a number of folds >= 2, got {cv!r}.")
 
- return results[0]
+def refresh_model(new_df: pd.DataFrame, n_new_estimators: int = 10):
+ """<b>Update the saved model with newly appended, already transformed rows.</b>
+
+ Models with `partial_fit` are updated on the new rows only and forests grow `n_new_estimators`
+ warm-started trees fitted on the new rows. Other models (e.g. Decision Tree, Linear Regression)
+ have no incremental update and are refit on the full 'transformed_data.csv', as is every model
+ when the incremental transform rescaled stored feature columns (its state's 'rescaled').
+
+ :param new_df: pd.DataFrame - The new rows, as returned by an incremental `transform_data`.
+ :param n_new_estimators: int - Number of trees added to a forest per refresh.
+ :returns: The updated model.
+ """
+ target_dir = Path(__file__).parent.parent.parent / "saved_data"
+ bundle = joblib.load(target_dir / "selected_model.pkl")
+ model, features, target_col = bundle['model'], bundle['features'], bundle['target']
+ sparse_features = load_sparse_features(target_dir)
+ # The incremental transform appended the sparse rows of `new_df` to the end of the saved blocks
+ X_new = feature_rows(new_df, features, sparse_features and (sparse_features[0][-len(new_df):], sparse_features[1]))
+ y_new = new_df[target_col].to_numpy()
+
+ same_classes = bundle['model_type'] != 'classification' or set(np.unique(y_new)) == set(getattr(model, 'classes_', []))
+ rescaled = load_transform_state(target_dir).get('rescaled')
+ if rescaled:
+  print(f"Scalings of {rescaled} changed, refitting {type(model).__name__} on all rows...")
+  _refit_stored_rows(model, features, target_col, sparse_features, target_dir)
+ elif hasattr(model, 'partial_fit'):
+  print(f"Updating {type(model).__name__} with partial_fit on {len(new_df)} new rows...")
+  model.partial_fit(X_new, y_new)
+ elif 'warm_start' in model.get_params() and hasattr(model, 'estimators_') and same_classes:
+  print(f"Adding {n_new_estimators} trees to {type(model).__name__} fitted on {len(new_df)} new rows...")
+  model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_estimators)
+  model.fit(X_new, y_new)
+ else:
+  print(f"{type(model).__name__} cannot be updated incrementally, refitting on all rows...")
+  _refit_stored_rows(model, features, target_col, sparse_features, target_dir)
+
+ export_model(model, features, target_col, bundle['model_type'])
+ return model
+
+def _refit_stored_rows(model, features, target_col, sparse_features, target_dir):
+ """Refit `model` from scratch on every row of 'transformed_data.csv'."""
+ # A forest grown by earlier refreshes would otherwise keep its trees and fit nothing new
+ if 'warm_start' in model.get_params():
+  model.set_params(warm_start=False)
+ sparse_names = set(sparse_features[1]) if sparse_features else set()
+ df = read_csv(target_dir / "transformed_data.csv", usecols=[col for col in features if col not in sparse_names] + [target_col])
+ model.fit(feature_rows(df, features, sparse_features), df[target_col].to_numpy())
+
+def feature_rows(df: pd.DataFrame, features: list, sparse_features: tuple = None):
+ """<b>Feature matrix of `df` in the column order the saved model expects.</b>
+
+ :param df: pd.DataFrame - Transformed rows.
+ :param features: list - The model's features; sparse (one-hot and hashed) features come after the dense ones.
+ :param sparse_features: tuple - (CSR matrix, names) of the sparse features, row-aligned with `df`.
+ :returns: A float32 array, or a CSR matrix when the model uses sparse features.
+ """
+ dense = [col for col in features if col in df.columns]
+ if len(dense) == len(features):
+  return df[features].to_numpy(dtype=np.float32)
+ if sparse_features is None:
+  raise FileNotFoundError("The model uses sparse features but their saved blocks are missing.")
+ position = {name: i for i, name in enumerate(sparse_features[1])}
+ columns = [position[col] for col in features if col not in df.columns]
+ return sparse.hstack([sparse.csr_matrix(df[dense].to_numpy(dtype=np.float32)), sparse_features[0][:, columns]],
+                      format='csr', dtype=np.float32)
+
+def export_leaderboard(leaderboard: pd.DataFrame, file_name: str = "model_leaderboard.csv") -> None:
+ """<b>Save a model search or cross-validation leaderboard under 'saved_data'.</b>"""
+ target_dir = Path(__file__).parent.parent.parent / "saved_data"
+ target_dir.mkdir(exist_ok=True)
+ leaderboard.to_csv(target_dir / file_name, index=False)
+ print(f"Model leaderboard saved to '{file_name}'")
 
 
 if __name__ == "__main__":
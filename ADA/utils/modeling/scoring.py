@@ -0,0 +1,135 @@
+import json
+import time
+from itertools import islice
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from ADA.utils.backend import get_backend
+from ADA.utils.ingest import iter_chunks
+from ADA.utils.preprocess.data_transformation import apply_transform_state, load_transform_state
+from ADA.utils.preprocess.outliers import FLAG_COLUMN, MODEL_FILE, apply_outliers, load_outliers
+from .modeling import feature_rows
+
+ARTIFACT_FILE = "model_artifact.joblib"
+# Artifacts already loaded by this process, keyed by path and modification time
+_LOADED = {}
+
+
+def export_artifact(bundle: dict, target_dir: Path = None) -> Path:
+ """<b>Save the selected model with everything needed to score raw rows to 'model_artifact.joblib'.</b>
+
+ The artifact holds the model bundle, the transform state, the column categories and the outlier
+ stage. It is written uncompressed so its numpy arrays (coefficients, scaler statistics, encoder
+ categories) are memory-mapped on load and shared by the scoring processes through the page cache.
+ scikit-learn trees copy their node arrays when unpickled, so forests are loaded once per worker instead.
+
+ :param bundle: dict - 'model', 'features', 'target' and 'model_type', as saved by `export_model`.
+ :param target_dir: Path - The 'saved_data' folder.
+ :returns Path: The artifact file.
+ """
+ target_dir = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data")
+ with open(target_dir / "columns_categories.json", 'r') as f:
+  columns_categories = json.load(f)
+ forest_path = target_dir / MODEL_FILE
+ artifact = {
+  **bundle,
+  'transform_state': load_transform_state(target_dir),
+  'columns_categories': columns_categories,
+  'outliers': load_outliers(target_dir),
+  'outlier_forest': joblib.load(forest_path) if forest_path.exists() else None
+ }
+ joblib.dump(artifact, target_dir / ARTIFACT_FILE)
+ print(f"Model artifact saved to '{ARTIFACT_FILE}'")
+ return target_dir / ARTIFACT_FILE
+
+def load_artifact(artifact_path: Path = None, mmap_mode: str = 'r') -> dict:
+ """<b>Load a model artifact with its arrays memory-mapped, once per process and file version.</b>"""
+ artifact_path = Path(artifact_path or Path(__file__).parent.parent.parent / "saved_data" / ARTIFACT_FILE)
+ if not artifact_path.exists():
+  raise FileNotFoundError(f"No model artifact at '{artifact_path}'. Run preprocess() to fit and save a model first.")
+ key = (str(artifact_path.resolve()), artifact_path.stat().st_mtime_ns)
+ if key not in _LOADED:
+  _LOADED.clear()
+  _LOADED[key] = joblib.load(artifact_path, mmap_mode=mmap_mode)
+ return _LOADED[key]
+
+def score_chunk(chunk: pd.DataFrame, artifact_path: str = None) -> np.ndarray:
+ """<b>Map step: predict the target of a chunk of raw rows with the saved artifact.</b>
+
+ Rows go through the outlier stage and the saved transforms without refitting anything. Missing
+ values are scored as 0 after scaling, i.e. the training mean of continuous columns and the
+ training minimum of discrete ones; unseen labels keep code -1.
+
+ :param chunk: pd.DataFrame - Raw rows with the input columns of the training data (the target is not needed).
+ :param artifact_path: str - The artifact file (defaults to 'saved_data/model_artifact.joblib').
+ :returns np.ndarray: The predictions, in the target's original labels or units.
+ """
+ artifact = load_artifact(artifact_path)
+ state, target = artifact['transform_state'], artifact['target']
+ columns = input_columns(artifact)
+ missing = [col for col in columns if col not in chunk.columns]
+ if missing:
+  raise ValueError(f"Input is missing columns the model was trained on: {missing}")
+ df = chunk[columns].copy()
+ if artifact['outliers'] is not None:
+  apply_outliers(df, artifact['outliers']['bounds'], artifact['outliers']['action'], artifact['outlier_forest'])
+ df, sparse_features = apply_transform_state(df, state, artifact['columns_categories'])
+ X = feature_rows(df, artifact['features'], sparse_features)
+ if sparse.issparse(X):
+  X.data = np.nan_to_num(X.data)
+ else:
+  X = np.nan_to_num(X)
+ return decode_target(artifact['model'].predict(X), state, target)
+
+def input_columns(artifact: dict) -> list:
+ """<b>Raw columns a chunk must provide: the columns the full run kept, without the target and outlier flag.</b>"""
+ return [col for col in artifact['transform_state']['input_columns'] if col not in (artifact['target'], FLAG_COLUMN)]
+
+def decode_target(predictions: np.ndarray, state: dict, target: str) -> np.ndarray:
+ """<b>Map predictions back from the transformed target: label codes to labels, scaled values to original units.</b>"""
+ classes = state.get('encoders', {}).get(target)
+ if classes is not None:
+  return np.asarray(classes, dtype=object)[np.asarray(predictions, dtype=np.int64)]
+ scaler = state.get('scalers', {}).get(target)
+ if scaler is not None:
+  return scaler.inverse_transform(pd.DataFrame({target: predictions})).ravel()
+ return predictions
+
+def predict(data, output_path: str = None, chunk_size: int = 100_000, backend=None, artifact_path: str = None):
+ """<b>Score a CSV or Parquet file (or a DataFrame) in chunks with the saved artifact.</b>
+
+ Chunks are scored in waves of one chunk per backend partition, so at most that many chunks are in
+ memory at once. Workers load the artifact memory-mapped and keep it for the following waves.
+
+ :param data: str | Path | pd.DataFrame - Rows to score; files are streamed, never loaded whole.
+ :param output_path: str - Write the predictions to this CSV file, one 'prediction' row per input row, instead of returning them.
+ :param chunk_size: int - Rows per chunk.
+ :param backend: Execution backend (see ADA.utils.backend) the chunks are scored on.
+ :param artifact_path: str - The artifact file (defaults to 'saved_data/model_artifact.joblib').
+ :returns: np.ndarray of predictions, or the output path when `output_path` is given.
+ """
+ artifact_path = str(Path(artifact_path or Path(__file__).parent.parent.parent / "saved_data" / ARTIFACT_FILE))
+ artifact = load_artifact(artifact_path)
+ if isinstance(data, pd.DataFrame):
+  chunks = (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+ else:
+  chunks = iter_chunks(data, chunk_size, usecols=input_columns(artifact))
+ backend = get_backend(backend)
+
+ start, n_rows, results = time.time(), 0, []
+ if output_path:
+  Path(output_path).unlink(missing_ok=True)
+ while wave := list(islice(chunks, max(1, backend.n_partitions))):
+  for predictions in backend.map(score_chunk, wave, artifact_path=artifact_path):
+   n_rows += len(predictions)
+   if output_path:
+    pd.DataFrame({'prediction': predictions}).to_csv(output_path, mode='a', header=not Path(output_path).exists(), index=False)
+   else:
+    results.append(predictions)
+ elapsed = time.time() - start
+ print(f"Scored {n_rows} rows in {elapsed:.1f}s ({n_rows / max(elapsed, 1e-9):.0f} rows/s)")
+ if output_path:
+  return output_path
+ return np.concatenate(results) if results else np.empty(0)
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _standardize(block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Center and scale every column of a float block, with missing values set to zero.
+
+    :param block: np.ndarray - Float64 block that may contain NaN.
+    :return: tuple[np.ndarray, np.ndarray] - The standardized block and its validity mask as float64.
+    """
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=0)
+    mean = np.where(valid, block, 0.0).sum(axis=0) / np.maximum(count, 1)
+    centered = np.where(valid, block - mean, 0.0)
+    std = np.sqrt((centered ** 2).sum(axis=0) / np.maximum(count - 1, 1))
+    return centered / np.where(std > 0, std, 1.0), valid.astype(np.float64)
+
+def _chunks(n_columns: int, chunk_size: int) -> list[slice]:
+    return [slice(start, min(start + chunk_size, n_columns)) for start in range(0, n_columns, chunk_size)]
+
+def correlation_matrix(X: np.ndarray, method: str = 'pearson', chunk_size: int = 512) -> np.ndarray:
+    """
+    Pearson or Spearman correlation of every column pair, computed as matrix products of standardized blocks.
+
+    Columns are processed in blocks of `chunk_size`, so only two standardized blocks are multiplied at a time.
+    Missing values contribute zero and each pair is normalized by its own number of complete rows
+    (exact when nothing is missing).
+
+    :param X: np.ndarray - Numeric matrix (rows x columns), NaN for missing values.
+    :param method: str - 'pearson' or 'spearman' (Pearson on average ranks).
+    :param chunk_size: int - Number of columns per block.
+    :return: np.ndarray - Symmetric correlation matrix with ones on the diagonal.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if method == 'spearman':
+        X = pd.DataFrame(X).rank(method='average').to_numpy()
+    elif method != 'pearson':
+        raise ValueError(f"Unknown correlation method '{method}'. Choose from 'pearson', 'spearman'.")
+
+    chunks = _chunks(X.shape[1], chunk_size)
+    blocks = [_standardize(X[:, chunk]) for chunk in chunks]
+    correlation = np.empty((X.shape[1], X.shape[1]), dtype=np.float64)
+    for a, chunk_a in enumerate(chunks):
+        z_a, valid_a = blocks[a]
+        for b in range(a, len(chunks)):
+            z_b, valid_b = blocks[b]
+            pair_counts = valid_a.T @ valid_b
+            block = np.clip((z_a.T @ z_b) / np.maximum(pair_counts - 1, 1), -1.0, 1.0)
+            correlation[chunk_a, chunks[b]] = block
+            correlation[chunks[b], chunk_a] = block.T
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+def category_codes(values) -> tuple[np.ndarray, int]:
+    """
+    Integer codes of a categorical column, -1 for missing values.
+
+    :param values: array-like - The column values.
+    :return: tuple[np.ndarray, int] - The codes and the number of levels.
+    """
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(dtype=np.int64), len(values.cat.categories)
+    codes, levels = pd.factorize(np.asarray(values), use_na_sentinel=True)
+    return codes.astype(np.int64), len(levels)
+
+def contingency_table(codes_a: np.ndarray, codes_b: np.ndarray, levels_a: int, levels_b: int) -> np.ndarray:
+    """
+    Counts of every level combination of two coded columns, built with a single bincount.
+
+    :return: np.ndarray - A (levels_a x levels_b) table of counts over the rows where both are present.
+    """
+    keep = (codes_a >= 0) & (codes_b >= 0)
+    flat = codes_a[keep] * levels_b + codes_b[keep]
+    return np.bincount(flat, minlength=levels_a * levels_b).reshape(levels_a, levels_b)
+
+def cramers_v(table: np.ndarray) -> float:
+    """
+    Cramér's V of a contingency table, 0 (independent) to 1 (one column determines the other).
+    """
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    k = min(table.shape) - 1
+    if n == 0 or k < 1:
+        return 0.0
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)).astype(np.float64)
+    chi2 = n * ((table.astype(np.float64) ** 2 / expected).sum() - 1.0)
+    return float(np.sqrt(max(chi2, 0.0) / (n * k)))
+
+def cramers_v_matrix(codes: list[np.ndarray], n_levels: list[int], tables: dict = None) -> np.ndarray:
+    """
+    Cramér's V of every pair of categorical columns.
+
+    :param codes: list[np.ndarray] - Codes of each column (see `category_codes`).
+    :param n_levels: list[int] - Number of levels of each column.
+    :param tables: dict - Optional cache of contingency tables keyed by column index pairs (i, j) with i < j;
+                   missing tables are computed and stored, so callers can reuse them.
+    :return: np.ndarray - Symmetric matrix with ones on the diagonal.
+    """
+    tables = {} if tables is None else tables
+    result = np.eye(len(codes))
+    for i in range(len(codes)):
+        for j in range(i + 1, len(codes)):
+            if (i, j) not in tables:
+                tables[(i, j)] = contingency_table(codes[i], codes[j], n_levels[i], n_levels[j])
+            result[i, j] = result[j, i] = cramers_v(tables[(i, j)])
+    return result
+
+def correlation_ratio_matrix(X: np.ndarray, codes: list[np.ndarray], n_levels: list[int], chunk_size: int = 512) -> np.ndarray:
+    """
+    Correlation ratio (eta) of every numeric column with every categorical column.
+
+    Group sums of a whole block of numeric columns are obtained with one sparse product per categorical
+    column, so eta is computed without looping over numeric columns.
+
+    :param X: np.ndarray - Numeric matrix (rows x numeric columns), NaN for missing values.
+    :param codes: list[np.ndarray] - Codes of each categorical column (see `category_codes`).
+    :param n_levels: list[int] - Number of levels of each categorical column.
+    :param chunk_size: int - Number of numeric columns per block.
+    :return: np.ndarray - Matrix (numeric columns x categorical columns) of values between 0 and 1.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    result = np.zeros((X.shape[1], len(codes)))
+    for k, (column_codes, levels) in enumerate(zip(codes, n_levels)):
+        present = np.flatnonzero(column_codes >= 0)
+        if levels == 0 or len(present) == 0:
+            continue
+        groups = sparse.csr_matrix((np.ones(len(present)), (present, column_codes[present])), shape=(len(X), levels))
+        for chunk in _chunks(X.shape[1], chunk_size):
+            block = X[:, chunk]
+            valid = ~np.isnan(block) & (column_codes >= 0)[:, None]
+            count = valid.sum(axis=0)
+            # Center first so the sums of squares do not cancel out for large values
+            mean = np.where(valid, block, 0.0).sum(axis=0) / np.maximum(count, 1)
+            centered = np.where(valid, block - mean, 0.0)
+            group_counts = groups.T @ valid.astype(np.float64)
+            group_sums = groups.T @ centered
+            ss_between = (group_sums ** 2 / np.maximum(group_counts, 1)).sum(axis=0)
+            ss_total = (centered ** 2).sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                eta = np.sqrt(np.clip(ss_between / ss_total, 0.0, 1.0))
+            result[chunk, k] = np.where(ss_total > 0, eta, 0.0)
+    return result
+
+def _numeric_block(data: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    block = np.empty((len(data), len(columns)), dtype=np.float64)
+    for i, col in enumerate(columns):
+        block[:, i] = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=np.float64)
+    return block
+
+def association_matrix(
+    data: pd.DataFrame,
+    numeric_columns: list[str],
+    categorical_columns: list[str],
+    method: str = 'pearson',
+    chunk_size: int = 512
+) -> pd.DataFrame:
+    """
+    Pairwise association of all columns: correlation for numeric pairs, Cramér's V for categorical pairs
+    and the correlation ratio (eta) for numeric-categorical pairs.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param numeric_columns: list[str] - Numeric columns.
+    :param categorical_columns: list[str] - Categorical columns.
+    :param method: str - 'pearson' or 'spearman' for the numeric pairs.
+    :param chunk_size: int - Number of columns per block.
+    :return: pd.DataFrame - Symmetric matrix over numeric then categorical columns; numeric pairs are
+             signed (-1 to 1), every other pair is between 0 and 1.
+    """
+    numeric_columns = [col for col in numeric_columns if col in data.columns]
+    categorical_columns = [col for col in categorical_columns if col in data.columns]
+    X = _numeric_block(data, numeric_columns)
+    coded = [category_codes(data[col]) for col in categorical_columns]
+    codes, n_levels = [c for c, _ in coded], [levels for _, levels in coded]
+
+    p = len(numeric_columns)
+    result = np.eye(p + len(categorical_columns))
+    result[:p, :p] = correlation_matrix(X, method, chunk_size)
+    result[p:, p:] = cramers_v_matrix(codes, n_levels)
+    eta = correlation_ratio_matrix(X, codes, n_levels, chunk_size)
+    result[:p, p:] = eta
+    result[p:, :p] = eta.T
+    columns = numeric_columns + categorical_columns
+    return pd.DataFrame(result, index=columns, columns=columns)
+
+def _dense_block(X, columns) -> np.ndarray:
+    """Float64 copy of some columns of a dense or sparse matrix."""
+    block = X[:, columns]
+    return block.toarray().astype(np.float64) if sparse.issparse(block) else np.asarray(block, dtype=np.float64)
+
+def target_associations(X: np.ndarray, y: np.ndarray, categorical: list[bool], target_is_categorical: bool,
+                        chunk_size: int = 512) -> np.ndarray:
+    """
+    Strength of association (0 to 1) of every feature column with the target.
+
+    Numeric features use |Pearson r| against a numeric target and eta against a categorical one;
+    categorical features use Cramér's V against a categorical target and eta against a numeric one.
+
+    :param X: np.ndarray - Feature matrix (rows x features), dense or sparse.
+    :param y: np.ndarray - Target values.
+    :param categorical: list[bool] - Whether each feature column is categorical.
+    :param target_is_categorical: bool - Whether the target is categorical (classification).
+    :param chunk_size: int - Number of columns per block.
+    :return: np.ndarray - One score per feature column.
+    """
+    categorical = np.asarray(categorical, dtype=bool)
+    numeric_idx, categorical_idx = np.flatnonzero(~categorical), np.flatnonzero(categorical)
+    scores = np.zeros(X.shape[1])
+    y_codes, y_levels = category_codes(y)
+    feature_codes = [category_codes(_dense_block(X, [j])[:, 0]) for j in categorical_idx]
+
+    if len(numeric_idx):
+        if not target_is_categorical:
+            z_y, valid_y = _standardize(np.asarray(y, dtype=np.float64)[:, None])
+        for chunk in _chunks(len(numeric_idx), chunk_size):
+            # One block of columns at a time, so sparse (hashed) features are never densified whole
+            X_num = _dense_block(X, numeric_idx[chunk])
+            if target_is_categorical:
+                scores[numeric_idx[chunk]] = correlation_ratio_matrix(X_num, [y_codes], [y_levels], chunk_size)[:, 0]
+            else:
+                z, valid = _standardize(X_num)
+                r = (z.T @ z_y)[:, 0] / np.maximum((valid.T @ valid_y)[:, 0] - 1, 1)
+                scores[numeric_idx[chunk]] = np.abs(np.clip(r, -1.0, 1.0))
+
+    if len(categorical_idx):
+        if target_is_categorical:
+            for j, (codes, levels) in zip(categorical_idx, feature_codes):
+                scores[j] = cramers_v(contingency_table(codes, y_codes, levels, y_levels))
+        else:
+            y_numeric = np.asarray(y, dtype=np.float64)[:, None]
+            scores[categorical_idx] = correlation_ratio_matrix(
+                y_numeric, [c for c, _ in feature_codes], [levels for _, levels in feature_codes], chunk_size
+            )[0]
+    return scores
+
+def rank_pairs(matrix: pd.DataFrame, pairs: list[tuple], top_n: int = None) -> list[tuple]:
+    """
+    Order column pairs by the absolute strength of their association, strongest first.
+
+    :param matrix: pd.DataFrame - Output of `association_matrix` (or any labelled square matrix).
+    :param pairs: list[tuple] - Column pairs to rank; pairs with an unknown column rank last.
+    :param top_n: int - Optional number of pairs to keep.
+    :return: list[tuple] - The ranked pairs.
+    """
+    def strength(pair):
+        a, b = pair
+        if a not in matrix.index or b not in matrix.columns or pd.isna(matrix.at[a, b]):
+            return -1.0
+        return abs(matrix.at[a, b])
+    ranked = sorted(pairs, key=strength, reverse=True)
+    return ranked[:top_n] if top_n is not None else ranked
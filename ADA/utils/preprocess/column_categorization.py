@@ -1,15 +1,18 @@
-#import numpy as np
+import numpy as np
 import pandas as pd
 from scipy.stats import kruskal
 from pathlib import Path
 import json
+from ADA.utils.backend import get_backend
 
-def categorize_columns(df: pd.DataFrame, target: str) -> dict:
+def categorize_columns(df: pd.DataFrame, target: str, backend=None) -> dict:
  """
  <b>Categorizes columns in a DataFrame into numeric (continuos, discrete), categorical (nominal, ordinal), and object (datetime, string).</b>
 
  :param df: pd.DataFrame - The DataFrame to categorize.
  :param target: str - The name of the target column for ordinal checks.
+ :param backend: Execution backend (see ADA.utils.backend). Distinct-value counts are merged from the
+  hashed values of every partition; the Kruskal-Wallis ordinal test needs global ranks and runs in process.
  :returns dict: A dictionary with keys 'continuous', 'discrete', 'nominal', 'ordinal', 'string' and 'datetime', each containing a list of column names.
  
  """
@@ -21,6 +24,9 @@ def categorize_columns(df: pd.DataFrame, target: str) -> dict:
   'string': [],
   'datetime': []
  }
+ # Only integer and object columns are tested on their number of distinct values
+ counted = [col for col in df.columns if pd.api.types.is_integer_dtype(df[col]) or (not is_numeric(df[col]) and is_object(df[col]))]
+ n_unique = get_backend(backend).map_combine(unique_hashes, count_unique, df[counted])
 
  for col in df.columns:
   #print(f"Processing column: {col}")
@@ -28,7 +34,7 @@ def categorize_columns(df: pd.DataFrame, target: str) -> dict:
    
    if is_continuous(df[col]):
     columns_categories['continuous'].append(col)
-   elif is_discrete(df[col]):
+   elif is_discrete(df[col], n_unique.get(col)):
     # Check if the column is discrete based on a threshold (e.g., more than 5% unique values)
     columns_categories['discrete'].append(col)
    else:
@@ -39,7 +45,7 @@ def categorize_columns(df: pd.DataFrame, target: str) -> dict:
    if is_datetime(df[col]):
     columns_categories['datetime'].append(col)
   
-   elif is_categorical(df[col]):
+   elif is_categorical(df[col], n_unique.get(col)):
      if is_ordinal(df[col], df[target]):
       columns_categories['ordinal'].append(col)
      else:
@@ -73,16 +79,27 @@ def is_numeric(col):
 def is_continuous(col):
  """Check if a numeric column is continuous."""
  return pd.api.types.is_float_dtype(col)
-def is_discrete(col):
+def is_discrete(col, n_unique=None):
   """Check if a numeric column is discrete."""
-  return pd.api.types.is_integer_dtype(col) and col.nunique() > 10 # Arbitrary threshold for discrete data
+  n_unique = col.nunique() if n_unique is None else n_unique
+  return pd.api.types.is_integer_dtype(col) and n_unique > 10 # Arbitrary threshold for discrete data
 def is_object(col):
- """Check if a column is of object type."""
- return pd.api.types.is_object_dtype(col)
+ """Check if a column holds non-numeric values (object, string, category or parsed datetime dtype)."""
+ return (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)
+         or isinstance(col.dtype, pd.CategoricalDtype) or pd.api.types.is_datetime64_any_dtype(col))
 
-def is_categorical(col):
+def is_categorical(col, n_unique=None):
  """Check if a column is categorical."""
- return col.nunique()/len(col) <= 0.05  # Arbitrary threshold for categorical data
+ n_unique = col.nunique() if n_unique is None else n_unique
+ return n_unique/len(col) <= 0.05  # Arbitrary threshold for categorical data
+
+def unique_hashes(part: pd.DataFrame) -> dict:
+ """Map step: sorted 64-bit hashes of the distinct non-null values of every column in one partition."""
+ return {col: np.unique(pd.util.hash_array(part[col].dropna().to_numpy())) for col in part.columns}
+
+def count_unique(results: list) -> dict:
+ """Combine step: number of distinct values per column across partitions."""
+ return {col: len(np.unique(np.concatenate([result[col] for result in results]))) for col in results[0]}
 
 def is_ordinal(col: pd.Series, target_col: pd.Series, threshold: float = 0.05) -> bool:
  """check if a categorical column is ordinal or nominal."""
@@ -1,12 +1,38 @@
 from pathlib import Path
+import copy
 import json
+import joblib
+import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler, MinMaxScaler
+from .handle_datetime import extract_datetime_features
+from .feature_hashing import hash_columns, hashing_settings
+from .sparse_features import export_sparse_features, remove_sparse_features, sparse_feature_names
+from ADA.utils.backend import get_backend
+from ADA.utils.ingest import iter_chunks
 
-def transform_data(df: pd.DataFrame) -> pd.DataFrame:
+# A running scaler is adopted once it rescales the stored values by more than this factor or shifts them by
+# more than this many scaled units; the stored rows are then rescaled and the model is refit
+DRIFT_TOLERANCE = 0.1
+
+def transform_data(df: pd.DataFrame, incremental: bool = False, string_strategy: str = 'hash', hash_bits: int = 10,
+                   nominal_strategy: str = 'label', target: str = None, backend=None) -> pd.DataFrame:
  """<b>Transform the DataFrame based on predefined column categories.</b>
  
  :param df: Input DataFrame to be transformed.
+ :param incremental: bool - Treat `df` as rows appended to the last run: update the running scaler statistics
+  and label vocabularies with these rows only and append them to 'transformed_data.csv'. Scalers whose
+  statistics drifted past `DRIFT_TOLERANCE` are adopted and the stored rows rescaled to match (see
+  `update_running_scalers`); the target's scaler is never updated.
+ :param string_strategy: str - 'hash' encodes string columns as hashed character n-grams saved to
+  'hashed_features.npz'; 'drop' discards them. Incremental runs reuse the saved choice.
+ :param hash_bits: int - Each string column is hashed into 2 ** hash_bits sparse features.
+ :param nominal_strategy: str - 'label' encodes nominal columns as integer codes; 'onehot' encodes them as
+  sparse indicator columns saved to 'onehot_features.npz'. Incremental runs reuse the saved choice.
+ :param target: str - The target column; a nominal target is always label-encoded, never one-hot encoded.
+  Incremental runs reuse the saved target.
+ :param backend: Execution backend (see ADA.utils.backend) the scalers are fitted on, one partial fit per partition.
  :returns pd.DataFrame: Transformed DataFrame.
 
  """
@@ -26,49 +52,271 @@ def transform_data(df: pd.DataFrame) -> pd.DataFrame:
  with open(json_path, 'r') as f:
   columns_categories = json.load(f)
 
- transform_continuous_columns(df, columns_categories)
- transform_discrete_columns(df, columns_categories)
- transform_nominal_columns(df, columns_categories)
- transform_ordinal_columns(df, columns_categories)
+ # Fitted scalers and encoders are kept so appended rows can update them instead of refitting
+ state = load_transform_state(target_dir) if incremental else {'input_columns': df.columns.tolist(), 'target': target}
+ rescale = update_running_scalers(df, columns_categories, state) if incremental else {}
+ state['rescaled'] = sorted(rescale)
+
+ transform_continuous_columns(df, columns_categories, state, backend, incremental)
+ transform_discrete_columns(df, columns_categories, state, backend, incremental)
+ if not incremental:
+  state['running_scalers'] = _running_copies(state)
+ if incremental:
+  nominal_strategy = 'onehot' if state.get('onehot') is not None else 'label'
+ onehot_nominal_columns(df, columns_categories, state, target_dir, nominal_strategy, append=incremental)
+ # Label-encodes the nominal columns the one-hot step left in place (all of them with 'label', else the target)
+ transform_nominal_columns(df, columns_categories, state)
+ transform_ordinal_columns(df, columns_categories, state)
  transform_datetime_columns(df, columns_categories)
+ hash_string_columns(df, columns_categories, state, target_dir, string_strategy, hash_bits, append=incremental)
  drop_string_columns(df, columns_categories)
+ if incremental:
+  df = df[state['output_columns']]
+ state['output_columns'] = df.columns.tolist()
+ if rescale:
+  rescale_transformed_data(target_dir / "transformed_data.csv", rescale)
+ export_transform_state(state, target_dir)
  # Save the transformed DataFrame to a CSV file
- export_transformed_data(df, target_dir / "transformed_data.csv")
+ export_transformed_data(df, target_dir / "transformed_data.csv", append=incremental)
  return df
  
 
-def transform_continuous_columns(df, columns_categories):
+def apply_transform_state(df: pd.DataFrame, state: dict, columns_categories: dict) -> tuple:
+ """<b>Transform new rows with a saved state only, for scoring: nothing is refitted, updated or written.</b>
+
+ Labels the full run did not see get code -1 and unseen one-hot categories all-zero indicators.
+
+ :param df: pd.DataFrame - Raw rows holding the input columns of the full run, modified in place.
+ :param state: dict - A transform state saved by `transform_data`.
+ :param columns_categories: dict - The column categories of the full run.
+ :returns tuple: (dense pd.DataFrame, (CSR matrix, names) of the one-hot and hashed features or None).
+ """
+ scalers = state.get('scalers', {})
+ for col in columns_categories['continuous'] + columns_categories['discrete']:
+  if col in df.columns and col in scalers:
+   df[col] = scalers[col].transform(df[[col]])
+ blocks, names = [], []
+ if state.get('onehot') is not None:
+  columns = state['onehot'].feature_names_in_.tolist()
+  blocks.append(state['onehot'].transform(df[columns].astype(str)).tocsr())
+  names.extend(sparse_feature_names(state, 'onehot'))
+  df.drop(columns, axis=1, inplace=True)
+ for col, classes in state.get('encoders', {}).items():
+  if col in df.columns:
+   df[col] = pd.Categorical(df[col], categories=classes).codes
+ present = {key: [col for col in columns if col in df.columns] for key, columns in columns_categories.items()}
+ transform_datetime_columns(df, present)
+ if state.get('hashing') is not None:
+  blocks.append(hash_columns(df, state['hashing']))
+  names.extend(sparse_feature_names(state, 'hashing'))
+ drop_string_columns(df, present)
+ return df, (sparse.hstack(blocks, format='csr', dtype=np.float32), names) if blocks else None
+
+def transform_continuous_columns(df, columns_categories, state=None, backend=None, incremental=False):
  """<b>Transform continuous columns using StandardScaler.</b>"""
- for col in columns_categories['continuous']:
-  scaler = StandardScaler()
-  df[col] = scaler.fit_transform(df[[col]])
+ scalers = state.setdefault('scalers', {}) if state is not None else {}
+ _scale_columns(df, columns_categories['continuous'], scalers, StandardScaler, backend, incremental)
  return df
 
-def transform_discrete_columns(df, columns_categories):
+def transform_discrete_columns(df, columns_categories, state=None, backend=None, incremental=False):
  """<b>Transform discrete columns using MinMaxScaler.</b>"""
- for col in columns_categories['discrete']:
-  scaler = MinMaxScaler()
-  df[col] = scaler.fit_transform(df[[col]])
+ scalers = state.setdefault('scalers', {}) if state is not None else {}
+ _scale_columns(df, columns_categories['discrete'], scalers, MinMaxScaler, backend, incremental)
  return df
 
-def transform_nominal_columns(df, columns_categories):
- """<b>Transform nominal columns using OneHotEncoder.</b>"""
+def transform_nominal_columns(df, columns_categories, state=None):
+ """<b>Transform nominal columns using LabelEncoder.</b>"""
+ encoders = state.setdefault('encoders', {}) if state is not None else {}
  for col in columns_categories['nominal']:
-  encoder = LabelEncoder()
-  df[col] = encoder.fit_transform(df[col])
+  if col in df.columns:
+   _encode_column(df, col, encoders)
  return df
 
-def transform_ordinal_columns(df, columns_categories):
+def onehot_nominal_columns(df, columns_categories, state, target_dir, nominal_strategy='onehot', append=False):
+ """<b>One-hot encode nominal columns into a sparse CSR block and drop them from the DataFrame.</b>
+
+ The encoder's categories are kept in the transform state. Appended rows with a category the full run
+ did not see get all-zero indicators, so the number of features stays fixed for the saved model.
+ The target (`state['target']`) is left in place for label encoding.
+ """
+ columns = [col for col in columns_categories['nominal'] if col != state.get('target')]
+ if append:
+  encoder = state.get('onehot')
+ elif nominal_strategy == 'onehot' and columns:
+  encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=True, dtype=np.float32)
+  encoder.fit(df[columns].astype(str))
+  state['onehot'] = encoder
+ elif nominal_strategy in ('onehot', 'label'):
+  encoder = state['onehot'] = None
+ else:
+  raise ValueError(f"Unknown nominal_strategy '{nominal_strategy}'. Choose 'label' or 'onehot'.")
+
+ if encoder is None:
+  remove_sparse_features(target_dir, 'onehot')
+  return None
+ columns = encoder.feature_names_in_.tolist()
+ matrix = encoder.transform(df[columns].astype(str)).tocsr()
+ export_sparse_features(matrix, target_dir, 'onehot', append=append)
+ df.drop(columns, axis=1, inplace=True)
+ return matrix
+
+def transform_ordinal_columns(df, columns_categories, state=None):
  """<b>Transform ordinal columns using LabelEncoder.</b>"""
+ encoders = state.setdefault('encoders', {}) if state is not None else {}
  for col in columns_categories['ordinal']:
+  _encode_column(df, col, encoders)
+ return df
+
+def _scale_columns(df, columns, scalers, scaler_class, backend=None, incremental=False):
+ """Fit new scalers on the partitions of `backend`, then transform every column with its applied scaler.
+
+ Incremental runs never fit a scaler: one fitted on the appended rows alone would scale them
+ differently from the stored rows, so a column without a saved scaler is an error.
+ """
+ new = [col for col in columns if col not in scalers]
+ if new and incremental:
+  raise ValueError(f"No saved scaler for {new}: the last full run did not scale these columns. "
+                   "Run preprocess() on the full data to include them.")
+ if new:
+  scalers.update(get_backend(backend).map_combine(fit_scalers, merge_scalers, df[new], scaler_class=scaler_class))
+ for col in columns:
+  df[col] = scalers[col].transform(df[[col]])
+
+def update_running_scalers(df, columns_categories, state, tolerance=DRIFT_TOLERANCE):
+ """<b>Update the running scaler statistics with appended raw rows and adopt the scalers that drifted.</b>
+
+ Every feature column keeps a running copy of its scaler in `state['running_scalers']`, updated with
+ partial_fit (running mean/var for StandardScaler, running min/max for MinMaxScaler). The applied scalers
+ in `state['scalers']` are the ones the stored rows were scaled with; a running copy replaces its applied
+ scaler once the affine map between the two scalings moves values by more than `tolerance`. The target's
+ scaler is never updated, so predictions are decoded with the statistics the model was fitted on.
+
+ :param df: pd.DataFrame - The appended rows, before scaling.
+ :param columns_categories: dict - The saved column categories.
+ :param state: dict - The saved transform state, updated in place.
+ :param tolerance: float - Largest change of scale factor or shift (in scaled units) kept without rescaling.
+ :returns dict: {column: (factor, shift)} mapping stored scaled values of the adopted columns to their new scaling.
+ """
+ scalers = state['scalers']
+ # States saved before running statistics were kept start from the applied scalers
+ running = state.setdefault('running_scalers', _running_copies(state))
+ rescale = {}
+ for col in columns_categories['continuous'] + columns_categories['discrete']:
+  # Columns without a saved scaler are rejected by _scale_columns
+  if col == state.get('target') or col not in scalers:
+   continue
+  running[col].partial_fit(df[[col]])
+  factor, shift = _rescale_map(scalers[col], running[col], col)
+  if max(abs(factor - 1), abs(shift)) > tolerance:
+   rescale[col] = (factor, shift)
+   scalers[col] = copy.deepcopy(running[col])
+ if rescale:
+  drift = ', '.join(f"{col} (x{factor:.3f} {shift:+.3f})" for col, (factor, shift) in rescale.items())
+  print(f"Scaler statistics drifted for {drift}: rescaling the stored rows")
+ return rescale
+
+def _running_copies(state):
+ """Copies of the applied feature scalers (everything but the target's) to accumulate running statistics in."""
+ return {col: copy.deepcopy(scaler) for col, scaler in state['scalers'].items() if col != state.get('target')}
+
+def _rescale_map(old, new, col):
+ """(factor, shift) such that new.transform(x) == old.transform(x) * factor + shift; both scalers are affine."""
+ points = pd.DataFrame({col: [0.0, 1.0]})
+ (old_0, old_1), (new_0, new_1) = old.transform(points).ravel(), new.transform(points).ravel()
+ factor = (new_1 - new_0) / (old_1 - old_0)
+ return float(factor), float(new_0 - old_0 * factor)
+
+def rescale_transformed_data(file_path: Path, rescale: dict, chunk_size: int = 100_000) -> None:
+ """<b>Move the stored rows of 'transformed_data.csv' to adopted scalings, one chunk at a time.</b>
+
+ :param file_path: Path - The transformed data.
+ :param rescale: dict - {column: (factor, shift)}, as returned by `update_running_scalers`.
+ :param chunk_size: int - Rows per chunk.
+ """
+ file_path = Path(file_path)
+ rescaled = file_path.with_name(file_path.stem + ".rescaling.csv")
+ first = True
+ for chunk in iter_chunks(file_path, chunk_size):
+  for col, (factor, shift) in rescale.items():
+   chunk[col] = chunk[col] * factor + shift
+  chunk.to_csv(rescaled, mode='w' if first else 'a', header=first, index=False)
+  first = False
+ if not first:
+  rescaled.replace(file_path)
+
+def fit_scalers(part, scaler_class):
+ """<b>Map step: fit one scaler per column on a partition.</b>"""
+ return {col: scaler_class().fit(part[[col]]) for col in part.columns}
+
+def merge_scalers(results):
+ """<b>Combine step: merge the per-partition scalers of every column into one fitted on all rows.</b>
+
+ StandardScaler statistics are pooled from each partition's count, mean and variance;
+ MinMaxScaler ranges from each partition's minimum and maximum. Only full runs fit scalers this way;
+ incremental runs update the running copies with partial_fit instead (see `update_running_scalers`).
+ """
+ merged = {}
+ for col in results[0]:
+  fitted = [result[col] for result in results]
+  scaler = merged[col] = copy.deepcopy(fitted[0])
+  if len(fitted) == 1:
+   continue
+  scaler.n_samples_seen_ = sum(part.n_samples_seen_ for part in fitted)
+  if isinstance(scaler, StandardScaler):
+   scaler.mean_ = sum(part.n_samples_seen_ * part.mean_ for part in fitted) / scaler.n_samples_seen_
+   scaler.var_ = sum(part.n_samples_seen_ * (part.var_ + (part.mean_ - scaler.mean_) ** 2) for part in fitted) / scaler.n_samples_seen_
+   scaler.scale_ = _nonzero_scale(np.sqrt(scaler.var_))
+  else:
+   scaler.data_min_ = np.min([part.data_min_ for part in fitted], axis=0)
+   scaler.data_max_ = np.max([part.data_max_ for part in fitted], axis=0)
+   scaler.data_range_ = scaler.data_max_ - scaler.data_min_
+   low, high = scaler.feature_range
+   scaler.scale_ = (high - low) / _nonzero_scale(scaler.data_range_)
+   scaler.min_ = low - scaler.data_min_ * scaler.scale_
+ return merged
+
+def _nonzero_scale(scale):
+ """Replace (near) zero scales of constant columns by 1, as scikit-learn does."""
+ return np.where(scale < 10 * np.finfo(np.float64).eps, 1.0, scale)
+
+def _encode_column(df, col, encoders):
+ """Label-encode `col`; with a saved vocabulary, unseen labels are appended so existing codes stay stable."""
+ classes = encoders.get(col)
+ if classes is None:
   encoder = LabelEncoder()
   df[col] = encoder.fit_transform(df[col])
- return df
+  encoders[col] = encoder.classes_.tolist()
+ else:
+  seen = set(classes)
+  classes.extend(value for value in df[col].unique().tolist() if value not in seen)
+  df[col] = pd.Categorical(df[col], categories=classes).codes
 
 def transform_datetime_columns(df, columns_categories):
- """<b>Transform datetime columns to pandas datetime format.</b>"""
+ """<b>Replace each datetime column with compact year/month/day/hour/dayofweek/is_weekend/is_rush_hour features.</b>"""
  for col in columns_categories['datetime']:
-  df[col] = pd.to_datetime(df[col])
+  features = extract_datetime_features(df[col])
+  df.drop(col, axis=1, inplace=True)
+  for feature in features.columns:
+   df[feature] = features[feature]
+ return df
+
+def hash_string_columns(df, columns_categories, state, target_dir, string_strategy='hash', hash_bits=10, append=False):
+ """<b>Hash string columns into sparse features saved next to the transformed data.</b>"""
+ if append:
+  settings = state.get('hashing')
+ elif string_strategy == 'hash' and columns_categories['string']:
+  settings = state['hashing'] = hashing_settings(columns_categories['string'], n_bits=hash_bits)
+ elif string_strategy in ('hash', 'drop'):
+  settings = state['hashing'] = None
+ else:
+  raise ValueError(f"Unknown string_strategy '{string_strategy}'. Choose 'hash' or 'drop'.")
+
+ if settings is None:
+  remove_sparse_features(target_dir, 'hashing')
+  return None
+ matrix = hash_columns(df, settings)
+ export_sparse_features(matrix, target_dir, 'hashing', append=append)
+ return matrix
 
 def drop_string_columns(df, columns_categories):
  """<b>Drop string columns from the DataFrame.</b>"""
@@ -76,13 +324,29 @@ def drop_string_columns(df, columns_categories):
   df.drop(col, axis=1, inplace=True)
  return df
 
-def export_transformed_data(df: pd.DataFrame, file_path: str) -> None:
+def export_transformed_data(df: pd.DataFrame, file_path: str, append: bool = False) -> None:
  """<b>Export the transformed DataFrame to a CSV file.</b>
  
  :param df: pd.DataFrame - The DataFrame to export.
  :param file_path: str - The path where the CSV file will be saved.
+ :param append: bool - Append the rows to an existing file instead of overwriting it.
  """
- df.to_csv(file_path, index=False) 
+ if append:
+  df.to_csv(file_path, mode='a', header=False, index=False)
+ else:
+  df.to_csv(file_path, index=False) 
+
+def export_transform_state(state: dict, target_dir: Path) -> None:
+ """<b>Save the fitted scalers and label vocabularies to 'transform_state.pkl'.</b>"""
+ joblib.dump(state, Path(target_dir) / "transform_state.pkl")
+
+def load_transform_state(target_dir: Path = None) -> dict:
+ """<b>Load the fitted scalers and label vocabularies saved by the last full run.</b>"""
+ target_dir = target_dir or Path(__file__).parent.parent.parent / "saved_data"
+ state_path = Path(target_dir) / "transform_state.pkl"
+ if not state_path.exists():
+  raise FileNotFoundError("No saved transform state found. Run a full preprocess before an incremental refresh.")
+ return joblib.load(state_path)
  
 
 
@@ -0,0 +1,87 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from ADA.utils.backend import get_backend
+
+"""
+Duplicate-row removal on 64-bit row fingerprints.
+
+Every row is reduced to one uint64 with pandas' vectorized hash_pandas_object, so duplicates are found
+by comparing integers instead of whole rows. One sort of the hashes finds the repeats within the data
+and one binary search per row finds the rows already seen by earlier runs. The sorted unique hashes are
+saved to 'saved_data/row_hashes.npz' so appended rows that repeat earlier ones are dropped too. With 64-bit hashes, a false match is negligible below billions of rows.
+"""
+
+HASH_FILE = "row_hashes.npz"
+
+
+def row_hashes(part: pd.DataFrame, subset: list = None) -> np.ndarray:
+    """Map step: one uint64 fingerprint per row of a partition, over `subset` or every column."""
+    part = part[subset] if subset else part
+    return pd.util.hash_pandas_object(part, index=False).to_numpy(dtype=np.uint64)
+
+def duplicate_mask(hashes: np.ndarray, seen: np.ndarray = None) -> tuple:
+    """
+    Mark every row whose hash occurred before it, in this array or in `seen`.
+
+    :param hashes: np.ndarray - uint64 row hashes in row order.
+    :param seen: np.ndarray - Sorted unique hashes of earlier rows, e.g. from a previous run.
+    :return: tuple - (boolean duplicate mask, sorted unique hashes of all rows seen so far).
+    """
+    # Every row but the first occurrence of its hash is a repeat
+    unique, first = np.unique(hashes, return_index=True)
+    duplicated = np.ones(len(hashes), dtype=bool)
+    duplicated[first] = False
+    if seen is None or not len(seen):
+        return duplicated, unique
+    # First occurrences that earlier runs already saw are repeats as well
+    position = np.minimum(np.searchsorted(seen, unique), len(seen) - 1)
+    known = seen[position] == unique
+    duplicated[first[known]] = True
+    # Merge the new hashes into the sorted set once
+    return duplicated, np.union1d(seen, unique[~known])
+
+def drop_duplicates(df: pd.DataFrame, subset: list = None, incremental: bool = False, backend=None,
+                    target_dir: Path = None) -> pd.DataFrame:
+    """
+    Remove duplicate rows, keeping the first occurrence, and report how many were found.
+
+    :param df: pd.DataFrame - The data.
+    :param subset: list - Key columns that identify a row (defaults to all columns).
+    :param incremental: bool - Also drop rows that repeat rows of the previous runs, using their saved hashes.
+    :param backend: Execution backend (see ADA.utils.backend); rows are hashed per partition.
+    :param target_dir: Path - The 'saved_data' folder.
+    :return: pd.DataFrame - The data without duplicate rows.
+    """
+    target_dir = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data")
+    saved = load_row_hashes(target_dir) if incremental else None
+    if saved is not None:
+        subset = saved['subset']
+    subset = [col for col in subset if col in df.columns] if subset else None
+
+    backend = get_backend(backend)
+    hashes = np.concatenate(backend.map(row_hashes, backend.split(df), subset=subset)) if len(df) else np.empty(0, dtype=np.uint64)
+    duplicated, seen = duplicate_mask(hashes, saved['hashes'] if saved is not None else None)
+
+    n_duplicates = int(duplicated.sum())
+    keys = f" on {subset}" if subset else ""
+    print(f"Duplicate rows{keys}: {n_duplicates} of {len(df)} ({n_duplicates / max(len(df), 1):.1%}) removed")
+    export_row_hashes(seen, subset, target_dir)
+    return df[~duplicated] if n_duplicates else df
+
+def export_row_hashes(hashes: np.ndarray, subset: list, target_dir: Path) -> None:
+    """Save the sorted unique row hashes and the key columns they were computed on."""
+    Path(target_dir).mkdir(exist_ok=True)
+    np.savez(Path(target_dir) / HASH_FILE, hashes=hashes, subset=np.array(subset or [], dtype=str))
+
+def remove_row_hashes(target_dir: Path = None) -> None:
+    """Delete hashes left by an earlier run that did not deduplicate, so appended rows are not checked against them."""
+    (Path(target_dir or Path(__file__).parent.parent.parent / "saved_data") / HASH_FILE).unlink(missing_ok=True)
+
+def load_row_hashes(target_dir: Path = None) -> dict:
+    """Load the saved row hashes as {'hashes', 'subset'}, or None when no run saved them."""
+    path = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data") / HASH_FILE
+    if not path.exists():
+        return None
+    with np.load(path) as saved:
+        return {'hashes': saved['hashes'], 'subset': saved['subset'].tolist() or None}
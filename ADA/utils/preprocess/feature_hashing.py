@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+def hashing_vectorizer(settings: dict) -> HashingVectorizer:
+ """<b>Stateless vectorizer for the saved hashing settings; the same settings always give the same buckets.</b>"""
+ return HashingVectorizer(
+  analyzer=settings['analyzer'],
+  ngram_range=tuple(settings['ngram_range']),
+  n_features=2 ** settings['n_bits'],
+  alternate_sign=False,
+  lowercase=True,
+  dtype=np.float32
+ )
+
+def hash_columns(df: pd.DataFrame, settings: dict, batch_size: int = 50_000) -> sparse.csr_matrix:
+ """<b>Hash every string column in `settings` into its own block of `2 ** n_bits` sparse features.</b>
+
+ Values are split into character (or word) n-grams and each n-gram is hashed straight to a bucket,
+ so no vocabulary is built or stored and unseen values need no refit. Rows are hashed in batches
+ of `batch_size` to bound the size of the temporary n-gram lists.
+
+ :param df: pd.DataFrame - Data holding the string columns.
+ :param settings: dict - 'columns', 'n_bits', 'ngram_range' and 'analyzer' (see `hashing_settings`).
+ :param batch_size: int - Number of rows hashed at a time.
+ :returns sparse.csr_matrix: float32 matrix of shape (rows, columns * 2 ** n_bits).
+ """
+ vectorizer = hashing_vectorizer(settings)
+ blocks = []
+ for col in settings['columns']:
+  values = df[col].astype(object).fillna('').astype(str)
+  blocks.append(sparse.vstack(
+   [vectorizer.transform(values.iloc[start:start + batch_size]) for start in range(0, max(len(values), 1), batch_size)],
+   format='csr'
+  ))
+ return sparse.hstack(blocks, format='csr', dtype=np.float32)
+
+def hashing_settings(columns: list, n_bits: int = 10, ngram_range: tuple = (2, 4), analyzer: str = 'char_wb') -> dict:
+ """<b>Settings stored in the transform state so appended rows are hashed identically.</b>"""
+ return {'columns': list(columns), 'n_bits': n_bits, 'ngram_range': list(ngram_range), 'analyzer': analyzer}
+
+def hashed_feature_names(settings: dict) -> list:
+ """<b>Names of the hashed features, e.g. 'Name_hash0042'.</b>"""
+ width = len(str(2 ** settings['n_bits'] - 1))
+ return [f"{col}_hash{bucket:0{width}d}" for col in settings['columns'] for bucket in range(2 ** settings['n_bits'])]
@@ -1,10 +1,24 @@
 import datetime
 import glob
+import re
 
 import pandas as pd
 import warnings
 import numpy as np
 
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+NAT_INT64 = np.iinfo(np.int64).min
+
+# Monday=0, Tuesday=1, ..., Friday=4, Saturday=5, Sunday=6
+WEEKEND_MAP = {
+    "sat_sun": [5, 6],  # Saturday and Sunday
+    "fri_sat": [4, 5]   # Friday and Saturday
+}
+
+# Weekday [start, end) hours counted as rush hours.
+RUSH_HOURS = ((7, 10), (16, 19))
+
 def find_datetime_columns(df: pd.DataFrame) -> list[str]:
     """
     Checks all columns in the DataFrame to identify those that are either already
@@ -43,59 +57,160 @@ def find_datetime_columns(df: pd.DataFrame) -> list[str]:
 
     return datetime_columns
 
+def _date_component(series: pd.Series, component: str) -> pd.Series:
+    """
+    Returns one date component (day, month or year) of a column as numbers.
+    Numeric columns are taken as-is; anything else is parsed once and the component extracted.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        numbers = pd.to_numeric(series, errors='coerce')
+        if numbers.notna().mean() > 0.8:
+            return numbers
+        series = parse_datetime(series, dayfirst=(component == "day"))
+    return getattr(series.dt, component)
+
 def find_date_columns(df: pd.DataFrame):
     """
     Identifies day, month, and year columns in the DataFrame.
     and returns them as separate Series.
+    Column names are matched on whole words, so "birthday" or "yearly_income" are not picked up.
     Args:
         df (pd.DataFrame): The input DataFrame.
     Returns:
-        tuple: A tuple containing three Series: day, month, and year.
+        tuple: A tuple containing three numeric Series: day, month, and year.
         If a column is not found, its corresponding Series will be None.
     """
-    day = None
-    month = None
-    year = None
+    components = {"day": None, "month": None, "year": None}
     for column in df.columns:
-        if "day" in column.lower():
-            df[column] = pd.to_datetime(df[column], dayfirst=True, errors='coerce')  # Ensure day is parsed correctly
-            if pd.api.types.is_datetime64_any_dtype(df[column]):
-                day = df[column]
-        elif "month" in column.lower():
-            df[column] = pd.to_datetime(df[column], format='%m', errors='coerce')  # Ensure month is parsed correctly
-            if pd.api.types.is_datetime64_any_dtype(df[column]):
-                month = df[column]
-        elif "year" in column.lower():
-            df[column] = pd.to_datetime(df[column], format='%Y', errors='coerce')  # Ensure year is parsed correctly
-            if pd.api.types.is_datetime64_any_dtype(df[column]):
-                year = df[column]
-        else:
-            continue
-
-    return day, month, year
-       
+        tokens = re.split(r"[^a-z]+", str(column).lower())
+        for component in components:
+            if components[component] is None and component in tokens:
+                components[component] = _date_component(df[column], component)
+                break
+
+    return components["day"], components["month"], components["year"]
+
+def days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """
+    Converts proleptic Gregorian year/month/day arrays to days since 1970-01-01 (vectorized).
+    """
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    yoe = year - era * 400
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+def civil_from_days(days: np.ndarray) -> tuple:
+    """
+    Converts days since 1970-01-01 to proleptic Gregorian (year, month, day) arrays (vectorized).
+    """
+    z = days + 719468
+    era = np.floor_divide(z, 146097)
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
 def merge_date_columns(df: pd.DataFrame, day: pd.Series, month: pd.Series, year: pd.Series) -> pd.DataFrame:
     """
     Merges day, month, and year columns into a single datetime column in the DataFrame.
+    The components are combined arithmetically, without re-parsing any strings.
     Args:
         df (pd.DataFrame): The input DataFrame.
-        day (pd.Series): Series containing day values.
-        month (pd.Series): Series containing month values.
-        year (pd.Series): Series containing year values.
+        day (pd.Series): Series containing day values (numbers or datetimes).
+        month (pd.Series): Series containing month values (numbers or datetimes).
+        year (pd.Series): Series containing year values (numbers or datetimes).
     Returns:
         pd.DataFrame: The DataFrame with a new 'date' column.
     """
     if day is not None and month is not None and year is not None:
-        # Create a new datetime column by combining day, month, and year
-        df['date'] = pd.to_datetime(
-            dict(year=year.dt.year, month=month.dt.month, day=day.dt.day),
-            errors='coerce'
-        )
+        parts = []
+        for series, component in ((year, "year"), (month, "month"), (day, "day")):
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = getattr(series.dt, component)
+            parts.append(pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64))
+        y, m, d = parts
+        valid = ~(np.isnan(y) | np.isnan(m) | np.isnan(d)) & (m >= 1) & (m <= 12) & (d >= 1) & (d <= 31)
+        y, m, d = (np.where(valid, part, 1).astype(np.int64) for part in parts)
+        days = days_from_civil(y, m, d)
+        # Reject impossible dates such as 31 February, which would roll over into March
+        valid &= civil_from_days(days)[2] == d
+        df['date'] = pd.Series(np.where(valid, days * NS_PER_DAY, NAT_INT64).view('datetime64[ns]'), index=df.index)
     # else:
         # raise "Not all date components are available to merge."
     
     return df
 
+def parse_datetime(series: pd.Series, dayfirst: bool = False) -> pd.Series:
+    """
+    Parses a column to datetime64[ns] exactly once. Columns that are already datetime are returned
+    as-is, with any timezone dropped so the local wall-clock time is kept.
+    Args:
+        series (pd.Series): The column to parse.
+        dayfirst (bool): Whether ambiguous dates put the day first.
+    Returns:
+        pd.Series: A naive datetime Series, with NaT where a value could not be parsed.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            series = pd.to_datetime(series, errors='coerce', dayfirst=dayfirst)
+    if getattr(series.dt, "tz", None) is not None:
+        series = series.dt.tz_localize(None)
+    return series
+
+def extract_datetime_features(series: pd.Series, weekend_days: str = "sat_sun", rush_hours: tuple = RUSH_HOURS) -> pd.DataFrame:
+    """
+    Derives calendar features from a datetime column in one vectorized pass over its int64 epoch values.
+
+    Args:
+        series (pd.Series): The datetime column (parsed once if it still holds strings).
+        weekend_days (str): Which days are weekends, see `is_weekend`.
+        rush_hours (tuple): Weekday [start, end) hour ranges counted as rush hours.
+
+    Returns:
+        pd.DataFrame: Columns "<name>_year" (int16), "<name>_month", "<name>_day", "<name>_hour",
+                      "<name>_dayofweek" (int8, -1 where the timestamp is missing), and
+                      "<name>_is_weekend", "<name>_is_rush_hour" (bool).
+    """
+    if weekend_days not in WEEKEND_MAP:
+        raise ValueError(f"Invalid 'weekend_days' option. Choose from {list(WEEKEND_MAP.keys())}")
+
+    name = series.name
+    values = parse_datetime(series).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    missing = values == NAT_INT64
+
+    days = np.floor_divide(values, NS_PER_DAY)
+    hour = np.floor_divide(values - days * NS_PER_DAY, NS_PER_HOUR)
+    dayofweek = (days + 3) % 7  # 1970-01-01 was a Thursday
+    year, month, day = civil_from_days(days)
+
+    weekend = np.isin(dayofweek, WEEKEND_MAP[weekend_days]) & ~missing
+    rush = np.zeros(len(values), dtype=bool)
+    for start, end in rush_hours:
+        rush |= (hour >= start) & (hour < end)
+    rush &= ~weekend & ~missing
+
+    def compact(array, dtype):
+        return np.where(missing, -1, array).astype(dtype)
+
+    return pd.DataFrame({
+        f"{name}_year": compact(year, np.int16),
+        f"{name}_month": compact(month, np.int8),
+        f"{name}_day": compact(day, np.int8),
+        f"{name}_hour": compact(hour, np.int8),
+        f"{name}_dayofweek": compact(dayofweek, np.int8),
+        f"{name}_is_weekend": weekend,
+        f"{name}_is_rush_hour": rush,
+    }, index=series.index)
+
 def is_weekend(days_series: pd.Series, weekend_days: str = "sat_sun") -> pd.Series:
     """
     Checks if each day in a Pandas Series is a weekend.
@@ -116,16 +231,15 @@ def is_weekend(days_series: pd.Series, weekend_days: str = "sat_sun") -> pd.Seri
                    Returns a series of False if the input series cannot be converted to datetime.
     """
 
-    # Define the mapping for weekend days to their dayofweek integers
-    # Monday=0, Tuesday=1, ..., Friday=4, Saturday=5, Sunday=6
-    weekend_map = {
-        "sat_sun": [5, 6],  # Saturday and Sunday
-        "fri_sat": [4, 5]   # Friday and Saturday
-    }
+    weekend_map = WEEKEND_MAP
 
     if weekend_days not in weekend_map:
         raise ValueError(f"Invalid 'weekend_days' option. Choose from {list(weekend_map.keys())}")
 
+    if pd.api.types.is_datetime64_any_dtype(days_series):
+        # Already parsed, no need to convert again
+        return days_series.dt.dayofweek.isin(weekend_map[weekend_days])
+
     try:
         # Convert the input series to datetime objects.
         # errors='coerce' will turn unparseable dates into NaT (Not a Time)
@@ -1,16 +1,121 @@
+import numpy as np
 import pandas as pd
+from ADA.utils.backend import get_backend, sum_series
 
-def check_nulls(df: pd.DataFrame) -> dict:
-    nulls = df.isnull().sum()
+# Number of set bits in every byte value, for numpy versions without np.bitwise_count
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+# Packed mask bytes processed at a time (8 rows per byte)
+CHUNK_BYTES = 1 << 17
+
+def null_counts(part: pd.DataFrame) -> pd.Series:
+    """Map step: number of missing values per column in one partition, one column mask at a time."""
+    return pd.Series({col: np.count_nonzero(part[col].isna().to_numpy()) for col in part.columns}, dtype=np.int64)
+
+def check_nulls(df: pd.DataFrame, backend=None) -> dict:
+    nulls = get_backend(backend).map_combine(null_counts, sum_series, df)
     nulls = nulls[nulls > 0]
-    return nulls.to_dict()
+    return {col: int(count) for col, count in nulls.items()}
 
 """
 :param data: pd.DataFrame - The input data to be checked
+:param backend: Execution backend (see ADA.utils.backend); null counts are summed over its partitions
 Filters on columns names that contain missing values and return column name and its corresponding missing value,
 if no missing values found it returns an empty dict
 """
 
+def popcount(packed: np.ndarray) -> np.ndarray:
+    """Number of set bits along the last axis of a uint8 array."""
+    bits = np.bitwise_count(packed) if hasattr(np, "bitwise_count") else POPCOUNT[packed]
+    return bits.sum(axis=-1, dtype=np.int64)
+
+def pack_null_masks(df: pd.DataFrame) -> np.ndarray:
+    """
+    Null mask of every column packed to 1 bit per cell; only one column's byte mask exists at a time.
+
+    :param df: pd.DataFrame - The data.
+    :return: np.ndarray - uint8 array of shape (columns, ceil(rows / 8)); bit r of a row is set when row r is missing.
+    """
+    packed = np.empty((df.shape[1], (len(df) + 7) // 8), dtype=np.uint8)
+    for i, col in enumerate(df.columns):
+        packed[i] = np.packbits(df[col].isna().to_numpy())
+    return packed
+
+def null_profile(part: pd.DataFrame) -> dict:
+    """
+    Map step: null co-occurrence and null row-patterns of one partition, computed on its bit-packed masks.
+
+    :return: dict - 'co_occurrence' (columns x columns counts of rows missing both) and
+        'patterns' ({packed pattern bytes: number of rows}) for the rows with at least one missing value.
+    """
+    packed = pack_null_masks(part)
+    n_columns = packed.shape[0]
+    co_occurrence = np.zeros((n_columns, n_columns), dtype=np.int64)
+    patterns = {}
+    for start in range(0, packed.shape[1], CHUNK_BYTES):
+        block = packed[:, start:start + CHUNK_BYTES]
+        for i in range(n_columns):
+            co_occurrence[i, i:] += popcount(block[i] & block[i:])
+
+        # One packed key per row: the set of its missing columns. Padding rows are all-zero and skipped.
+        keys = np.packbits(np.unpackbits(block, axis=1).T, axis=1)
+        keys = np.ascontiguousarray(keys[keys.any(axis=1)])
+        unique, counts = np.unique(keys.view(np.dtype((np.void, keys.shape[1]))).ravel(), return_counts=True)
+        for key, count in zip(unique, counts):
+            patterns[key.tobytes()] = patterns.get(key.tobytes(), 0) + int(count)
+    co_occurrence = np.triu(co_occurrence) + np.triu(co_occurrence, 1).T
+    return {'co_occurrence': co_occurrence, 'patterns': patterns}
+
+def combine_null_profiles(results: list) -> dict:
+    """Combine step: add up the co-occurrence counts and pattern counts of every partition."""
+    patterns = {}
+    for result in results:
+        for key, count in result['patterns'].items():
+            patterns[key] = patterns.get(key, 0) + count
+    return {'co_occurrence': sum(result['co_occurrence'] for result in results), 'patterns': patterns}
+
+def profile_nulls(df: pd.DataFrame, backend=None) -> dict:
+    """
+    Missingness profile of a DataFrame built on 1-bit-per-cell null masks.
+
+    Only columns with missing values are packed. Per-column counts, pairwise co-occurrence and the
+    row-patterns are map/combine steps, so with a partitioned backend each worker packs its own rows.
+
+    :param df: pd.DataFrame - The data.
+    :param backend: Execution backend (see ADA.utils.backend).
+    :return: dict - 'n_rows', 'counts' ({column: missing rows}), 'co_occurrence' (pd.DataFrame of rows
+        missing both columns), 'patterns' ([(columns missing together, rows)], most common first) and
+        'complete_rows'.
+    """
+    backend = get_backend(backend)
+    counts = check_nulls(df, backend)
+    columns = list(counts)
+    profile = {'n_rows': len(df), 'counts': counts, 'co_occurrence': pd.DataFrame(), 'patterns': [], 'complete_rows': len(df)}
+    if not columns:
+        return profile
+
+    combined = backend.map_combine(null_profile, combine_null_profiles, df[columns])
+    profile['co_occurrence'] = pd.DataFrame(combined['co_occurrence'], index=columns, columns=columns)
+    for key, count in combined['patterns'].items():
+        bits = np.unpackbits(np.frombuffer(key, dtype=np.uint8))[:len(columns)]
+        profile['patterns'].append((tuple(col for col, bit in zip(columns, bits) if bit), count))
+    profile['patterns'].sort(key=lambda pattern: -pattern[1])
+    profile['complete_rows'] = len(df) - sum(count for _, count in profile['patterns'])
+    return profile
+
+def rows_with_nulls(profile: dict, columns) -> int:
+    """Number of rows missing a value in at least one of `columns`, from the profile's row-patterns."""
+    columns = set(columns)
+    return sum(count for pattern, count in profile['patterns'] if columns.intersection(pattern))
+
+def describe_null_profile(profile: dict, top: int = 5) -> str:
+    """One-paragraph summary of the most common null row-patterns."""
+    if not profile['patterns']:
+        return "No missing values."
+    lines = [f"{profile['n_rows'] - profile['complete_rows']} of {profile['n_rows']} rows have missing values "
+             f"in {len(profile['patterns'])} distinct patterns:"]
+    for pattern, count in profile['patterns'][:top]:
+        lines.append(f"  {count} rows missing {', '.join(map(str, pattern))}")
+    return "\n".join(lines)
 
 if __name__ == "__main__":
     df = pd.read_csv(r"C:\ADA Project\Automated-Data-Analysis\ADA\datasets\coffe.csv")
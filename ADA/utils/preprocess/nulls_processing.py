@@ -1,15 +1,25 @@
+import numpy as np
 import pandas as pd
-from .nulls_checking import check_nulls
+from .nulls_checking import check_nulls, profile_nulls, rows_with_nulls, describe_null_profile
+from ADA.utils.backend import get_backend
 
-def nulls_processing(df: pd.DataFrame, strategy: str = "drop") -> pd.DataFrame:
+def nulls_processing(df: pd.DataFrame, strategy: str = "drop", backend=None, max_row_loss: float = 0.5) -> pd.DataFrame:
         """
         Processes null values based on the selected strategy.
-        - 'drop': drop rows or columns depending on null ratio
+        - 'drop': drop rows or columns depending on null ratio; when dropping the incomplete rows would
+          lose more than `max_row_loss` of the rows, the columns that cost the most rows are dropped instead
         - 'fill_avg': fill with mean (numeric) or mode (categorical)
         - 'fill_ffill': forward fill
         - 'fill_bfill': backward fill
+
+        Null counts, the rows to drop and the fill values are computed as map/combine steps on the
+        partitions of `backend` (see ADA.utils.backend). Forward and backward fills depend on the
+        previous rows, so they always run in process. The decisions use a bit-packed missingness
+        profile (see `profile_nulls`), so the rows a drop would cost are known before dropping.
         """
-        null_info = check_nulls(df)
+        backend = get_backend(backend)
+        profile = profile_nulls(df, backend)
+        null_info = profile['counts']
         if not null_info:
             print("No missing values to process.")
             return df
@@ -17,38 +27,85 @@ def nulls_processing(df: pd.DataFrame, strategy: str = "drop") -> pd.DataFrame:
         threshold = 0.3  # Max allowed null ratio (30%)
         total_rows = len(df)
 
-        for col, null_count in null_info.items():
-            null_ratio = null_count / total_rows
-
-            if null_ratio >= threshold:
-                df = df.drop(columns=[col])
-                print(f"{col} has been droped")
-                continue  # Skip to next column
+        # Columns at or above the threshold are dropped; the others are handled by the strategy
+        dropped = [col for col, null_count in null_info.items() if null_count / total_rows >= threshold]
+        kept = [col for col in null_info if col not in dropped]
+        print(describe_null_profile(profile))
+        if strategy == "drop":
+            for col in limit_row_loss(profile, kept, max_row_loss):
+                kept.remove(col)
+                dropped.append(col)
+        df = df.drop(columns=dropped)
 
+        if kept:
             # Handle based on strategy
             if strategy == "drop":
-                df = df.dropna(subset=[col])
+                # Rows with a missing value in any kept column, as dropping them column by column would
+                df = df[np.concatenate(backend.map(complete_rows, backend.split(df[kept])))]
 
             elif strategy == "fill_avg":
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    df[col] = df[col].fillna(df[col].mean())
-                else:
-                    mode_val = df[col].mode(dropna=True)
-                    if not mode_val.empty:
-                        df[col] = df[col].fillna(mode_val[0])
+                fills = backend.map_combine(fill_stats, combine_fill_stats, df[kept])
+                for col in kept:
+                    if col in fills:
+                        df[col] = df[col].fillna(fills[col])
                     else:
                         df = df.drop(columns=[col])  # no valid mode
 
             elif strategy == "fill_ffill":
-                df[col] = df[col].fillna(method="ffill")
+                for col in kept:
+                    df[col] = df[col].fillna(method="ffill")
 
             elif strategy == "fill_bfill":
-                df[col] = df[col].fillna(method="bfill")
+                for col in kept:
+                    df[col] = df[col].fillna(method="bfill")
 
-            print(f"Dropped or filled column: {col}") # can be remoed after finishing
+        for col in null_info:
+            if col in dropped:
+                print(f"{col} has been droped")
+            else:
+                print(f"Dropped or filled column: {col}") # can be remoed after finishing
 
         return df
 
+def limit_row_loss(profile: dict, columns: list, max_row_loss: float) -> list:
+    """
+    Columns to drop so that removing the incomplete rows of the remaining `columns` keeps at least `1 - max_row_loss` of the rows.
+
+    Greedily drops the column whose removal saves the most rows, using the exact row-patterns of the profile.
+    """
+    columns, extra = list(columns), []
+    budget = max_row_loss * profile['n_rows']
+    while columns and rows_with_nulls(profile, columns) > budget:
+        col = min(columns, key=lambda candidate: rows_with_nulls(profile, [c for c in columns if c != candidate]))
+        lost = rows_with_nulls(profile, columns)
+        columns.remove(col)
+        extra.append(col)
+        print(f"Dropping rows with missing values would remove {lost / profile['n_rows']:.0%} of the rows; dropping column {col} instead")
+    return extra
+
+def complete_rows(part: pd.DataFrame) -> np.ndarray:
+    """Map step: mask of the partition's rows without missing values."""
+    return part.notna().all(axis=1).to_numpy()
+
+def fill_stats(part: pd.DataFrame) -> dict:
+    """Map step: sum and count of every numeric column and value counts of the other columns."""
+    numeric = [col for col in part.columns if pd.api.types.is_numeric_dtype(part[col])]
+    return {
+        'sum': part[numeric].sum(),
+        'count': part[numeric].count(),
+        'counts': {col: part[col].value_counts() for col in part.columns if col not in numeric}
+    }
+
+def combine_fill_stats(results: list) -> dict:
+    """Combine step: column mean for numeric columns and the most frequent value (smallest on ties) otherwise."""
+    fills = (sum(result['sum'] for result in results) / sum(result['count'] for result in results)).to_dict()
+    for col in results[0]['counts']:
+        counts = pd.concat([result['counts'][col] for result in results]).groupby(level=0, observed=True).sum()
+        counts = counts[counts > 0]
+        if not counts.empty:
+            fills[col] = counts[counts == counts.max()].index.sort_values()[0]
+    return fills
+
 
 if __name__ == "__main__":
     df = pd.read_csv(r"C:\ADA Project\Automated-Data-Analysis\ADA\datasets\coffe.csv")
@@ -0,0 +1,189 @@
+import json
+import warnings
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+from ADA.utils.ingest import file_fingerprint
+
+OUTLIER_FILE = "outlier_bounds.json"
+MODEL_FILE = "outlier_model.pkl"
+FLAG_COLUMN = "is_outlier"
+METHODS = ('iqr', 'robust_z', 'isolation_forest')
+ACTIONS = (None, 'clip', 'flag')
+# Scales the median absolute deviation to a standard deviation for normal data
+MAD_TO_STD = 1.4826
+
+
+def numeric_block(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """Copy `columns` into one float64 (rows x columns) block, with unparsable values as NaN."""
+    block = np.empty((len(df), len(columns)), dtype=np.float64)
+    for i, col in enumerate(columns):
+        block[:, i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+    return block
+
+def outlier_bounds(df: pd.DataFrame, columns: list, method: str = 'iqr', iqr_k: float = 1.5, z_threshold: float = 3.5) -> dict:
+    """
+    Lower and upper outlier bounds of every column, from one vectorized quantile pass over the numeric block.
+
+    'iqr' uses Tukey fences (q1 - k * IQR, q3 + k * IQR). 'robust_z' uses median +/- z * 1.4826 * MAD,
+    falling back to IQR / 1.349 for columns whose MAD is zero. 'isolation_forest' scores whole rows,
+    so its bounds are the Tukey fences, kept for reporting and the boxplots.
+
+    :param df: pd.DataFrame - The data.
+    :param columns: list - Numeric columns to bound.
+    :param method: str - One of `METHODS`.
+    :param iqr_k: float - Fence multiplier for 'iqr'.
+    :param z_threshold: float - Robust z-score threshold for 'robust_z'.
+    :return: dict - {column: {'q1', 'median', 'q3', 'lower', 'upper', 'outliers'}}.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown outlier method '{method}'. Choose from {list(METHODS)}.")
+    if not columns or df.empty:
+        return {}
+    block = numeric_block(df, columns)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        q1, median, q3 = np.nanquantile(block, [0.25, 0.5, 0.75], axis=0)
+        iqr = q3 - q1
+        if method == 'robust_z':
+            scale = MAD_TO_STD * np.nanmedian(np.abs(block - median), axis=0)
+            scale = np.where(scale > 0, scale, iqr / 1.349)
+            lower, upper = median - z_threshold * scale, median + z_threshold * scale
+        else:
+            lower, upper = q1 - iqr_k * iqr, q3 + iqr_k * iqr
+        # A column without spread has no outliers
+        spread = upper > lower
+        lower, upper = np.where(spread, lower, -np.inf), np.where(spread, upper, np.inf)
+    outside = ((block < lower) | (block > upper)).sum(axis=0)
+    return {
+        col: {'q1': float(q1[i]), 'median': float(median[i]), 'q3': float(q3[i]),
+              'lower': float(lower[i]), 'upper': float(upper[i]), 'outliers': int(outside[i])}
+        for i, col in enumerate(columns)
+    }
+
+def fit_isolation_forest(df: pd.DataFrame, columns: list, sample_size: int = 10_000, random_state: int = 42) -> dict:
+    """
+    Fit an IsolationForest on a row sample of the numeric block; missing values are imputed with the column medians.
+
+    :return: dict - 'model', 'columns' and 'medians', as used by `isolation_forest_flags`.
+    """
+    block = numeric_block(df, columns)
+    medians = np.nan_to_num(np.nanmedian(block, axis=0))
+    rng = np.random.default_rng(random_state)
+    sample = rng.choice(len(block), size=min(sample_size, len(block)), replace=False)
+    model = IsolationForest(random_state=random_state, n_jobs=-1).fit(_impute(block[sample], medians))
+    return {'model': model, 'columns': list(columns), 'medians': medians}
+
+def isolation_forest_flags(df: pd.DataFrame, forest: dict) -> np.ndarray:
+    """Rows the fitted IsolationForest labels as anomalies."""
+    return forest['model'].predict(_impute(numeric_block(df, forest['columns']), forest['medians'])) == -1
+
+def _impute(block: np.ndarray, medians: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(block), medians, block)
+
+def apply_outliers(df: pd.DataFrame, bounds: dict, action: str = None, forest: dict = None) -> pd.DataFrame:
+    """
+    Clip every bounded column to its bounds, or add an 'is_outlier' row flag.
+
+    :param df: pd.DataFrame - The data, modified in place.
+    :param bounds: dict - Output of `outlier_bounds`.
+    :param action: str - 'clip', 'flag' or None (report only).
+    :param forest: dict - Optional fitted IsolationForest; its anomalies are flagged instead of the bound violations.
+    :return: pd.DataFrame - The data.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown outlier action '{action}'. Choose from {list(ACTIONS)}.")
+    columns = [col for col in bounds if col in df.columns]
+    if action is None or not columns:
+        return df
+    lower = np.array([bounds[col]['lower'] for col in columns])
+    upper = np.array([bounds[col]['upper'] for col in columns])
+    if action == 'clip':
+        if forest is not None:
+            raise ValueError("IsolationForest scores whole rows and cannot clip values; use outlier_action='flag'.")
+        block = numeric_block(df, columns)
+        clipped = np.clip(block, lower, upper)
+        for i, col in enumerate(columns):
+            df[col] = clipped[:, i]
+    elif forest is not None:
+        df[FLAG_COLUMN] = isolation_forest_flags(df, forest)
+    else:
+        block = numeric_block(df, columns)
+        df[FLAG_COLUMN] = ((block < lower) | (block > upper)).any(axis=1)
+    return df
+
+def detect_outliers(df: pd.DataFrame, columns: list, method: str = 'iqr', action: str = None, target_dir: Path = None,
+                    source=None, **bound_kwargs) -> pd.DataFrame:
+    """
+    Outlier stage: bound every numeric column, report the counts, then clip or flag.
+
+    The bounds (and the IsolationForest, for that method) are saved under 'saved_data' so appended
+    rows are treated the same way and the boxplots draw the same fences.
+
+    :param df: pd.DataFrame - The data, modified in place.
+    :param columns: list - Continuous and discrete columns, without the target.
+    :param method: str - One of `METHODS`.
+    :param action: str - 'clip', 'flag' or None (report only).
+    :param target_dir: Path - The 'saved_data' folder.
+    :param source: str | Path - The dataset file `df` was read from; its fingerprint is saved with the bounds
+        so charts of other data (or of a changed file) do not use them.
+    :param bound_kwargs: Extra options forwarded to `outlier_bounds` (iqr_k, z_threshold).
+    :return: pd.DataFrame - The data.
+    """
+    target_dir = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data")
+    columns = [col for col in columns if col in df.columns]
+    bounds = outlier_bounds(df, columns, method, **bound_kwargs)
+    forest = fit_isolation_forest(df, columns) if method == 'isolation_forest' and columns and action else None
+
+    flagged = [f"{col}: {stats['outliers']}" for col, stats in bounds.items() if stats['outliers']]
+    print(f"Outliers ({method}): {', '.join(flagged) if flagged else 'none'}")
+    apply_outliers(df, bounds, action, forest)
+
+    dataset = file_fingerprint(source) if source is not None else None
+    export_outliers({'method': method, 'action': action, 'dataset': dataset, 'bounds': bounds}, target_dir)
+    if forest is not None:
+        joblib.dump(forest, target_dir / MODEL_FILE)
+    else:
+        (target_dir / MODEL_FILE).unlink(missing_ok=True)
+    return df
+
+def apply_saved_outliers(df: pd.DataFrame, target_dir: Path = None) -> pd.DataFrame:
+    """Treat appended rows like the last full run: clip to or flag against its saved bounds."""
+    target_dir = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data")
+    saved = load_outliers(target_dir)
+    if saved is None:
+        return df
+    forest = joblib.load(target_dir / MODEL_FILE) if (target_dir / MODEL_FILE).exists() else None
+    return apply_outliers(df, saved['bounds'], saved['action'], forest)
+
+def bounds_for_dataset(data_file, target_dir: Path = None) -> dict:
+    """
+    The saved bounds when they were computed on `data_file` as it is now, else None.
+
+    :param data_file: str | Path - The dataset about to be charted.
+    :param target_dir: Path - The 'saved_data' folder.
+    :return: dict - {column: bounds} (see `outlier_bounds`) or None.
+    """
+    saved = load_outliers(target_dir)
+    if saved is None:
+        return None
+    if saved.get('dataset') is None or saved['dataset'] != file_fingerprint(data_file):
+        print(f"Saved outlier bounds were computed on other data than '{Path(data_file).name}'; boxplots use their own quartiles")
+        return None
+    return saved['bounds']
+
+def export_outliers(outliers: dict, target_dir: Path) -> None:
+    """Save the outlier method, action and bounds to 'outlier_bounds.json'."""
+    Path(target_dir).mkdir(exist_ok=True)
+    with open(Path(target_dir) / OUTLIER_FILE, 'w') as f:
+        json.dump(outliers, f, indent=4)
+
+def load_outliers(target_dir: Path = None) -> dict:
+    """Load the saved outlier method, action and bounds, or None when no run saved them."""
+    path = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data") / OUTLIER_FILE
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
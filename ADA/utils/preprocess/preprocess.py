@@ -1,27 +1,67 @@
 import pandas as pd
-from . import nulls_processing, column_categorization, data_transformation
+from . import nulls_processing, column_categorization, data_transformation, outliers, deduplication
 """
 Test
 """
 # import data_transformation
 # import column_categorization
 
-def preprocess_data(df: pd.DataFrame, target: str) -> pd.DataFrame:
+def preprocess_data(df: pd.DataFrame, target: str, incremental: bool = False, string_strategy: str = 'hash',
+                    hash_bits: int = 10, nominal_strategy: str = 'label', outlier_method: str = 'iqr',
+                    outlier_action: str = None, deduplicate: bool = True, dedup_subset: list = None,
+                    backend=None, source=None) -> pd.DataFrame:
     """
-    Preprocess the DataFrame by checking for null values, categorizing columns, and transforming data.
+    Preprocess the DataFrame by removing duplicate rows, checking for null values, categorizing columns, and transforming data.
 
     :param df: pd.DataFrame - The DataFrame to preprocess.
     :param target: str - The name of the target column for ordinal checks.
+    :param incremental: bool - Treat `df` as new rows appended to the last run: keep the saved column
+        categories and update the saved transforms instead of refitting them.
+    :param string_strategy: str - 'hash' to encode free-text/ID columns as hashed n-gram features, 'drop' to discard them.
+    :param hash_bits: int - Number of hashed features per string column, as a power of two.
+    :param nominal_strategy: str - 'label' for integer codes, 'onehot' for sparse indicator columns.
+    :param outlier_method: str - 'iqr', 'robust_z' or 'isolation_forest' (see ADA.utils.preprocess.outliers).
+    :param outlier_action: str - 'clip' to clip continuous and discrete columns to the outlier bounds, 'flag' to
+        add an 'is_outlier' column, None to only report and save the bounds.
+    :param deduplicate: bool - Remove duplicate rows (first occurrence kept) before any other stage.
+    :param dedup_subset: list - Key columns that identify a row for deduplication (defaults to all columns).
+    :param backend: Execution backend (see ADA.utils.backend) for the row hashing, null handling, categorization and scaler fits.
+    :param source: str | Path - The file `df` was read from, recorded with the saved outlier bounds.
     :return: pd.DataFrame - The preprocessed DataFrame.
     """
+    if incremental:
+        # Keep the columns the full run kept and drop incomplete rows, as the 'drop' strategy does
+        state = data_transformation.load_transform_state()
+        if deduplication.load_row_hashes() is not None:
+            # Drops repeats within the new rows and rows the previous runs already saw
+            df = deduplication.drop_duplicates(df, incremental=True, backend=backend)
+        input_columns = [col for col in state['input_columns'] if col != outliers.FLAG_COLUMN]
+        df = df[input_columns].dropna()
+        if df.empty:
+            print("No complete new rows to process.")
+            return df
+        df = outliers.apply_saved_outliers(df.copy())
+        return data_transformation.transform_data(df, incremental=True, backend=backend)
+
+    # Remove duplicate rows first so no later stage spends time on them
+    if deduplicate:
+        df = deduplication.drop_duplicates(df, subset=dedup_subset, backend=backend)
+    else:
+        deduplication.remove_row_hashes()
+
     # Check for null values and handle them
-    df = nulls_processing.nulls_processing(df)
+    df = nulls_processing.nulls_processing(df, backend=backend)
 
     # Categorize columns into numeric, categorical, and object types
-    column_categorization.categorize_columns(df, target)
+    columns_categories = column_categorization.categorize_columns(df, target, backend=backend)
+
+    # Bound every continuous and discrete feature at once, then clip or flag the outliers
+    numeric_columns = [col for col in columns_categories['continuous'] + columns_categories['discrete'] if col != target]
+    df = outliers.detect_outliers(df, numeric_columns, method=outlier_method, action=outlier_action, source=source)
 
     # Transform the DataFrame based on the categorized columns
-    data_transformation.transform_data(df)
+    return data_transformation.transform_data(df, string_strategy=string_strategy, hash_bits=hash_bits,
+                                              nominal_strategy=nominal_strategy, target=target, backend=backend)
 
 
 if __name__ == "__main__":
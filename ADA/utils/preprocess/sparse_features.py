@@ -0,0 +1,55 @@
+from pathlib import Path
+import joblib
+from scipy import sparse
+from .feature_hashing import hashed_feature_names
+
+# Sparse feature blocks, keyed by the transform state entry that describes them, in the order they are stacked
+SPARSE_FILES = {
+ 'onehot': "onehot_features.npz",
+ 'hashing': "hashed_features.npz"
+}
+
+
+def sparse_feature_names(state: dict, block: str) -> list:
+ """<b>Names of the features of one sparse block, e.g. 'Embarked_S' or 'Name_hash0042'.</b>"""
+ if block == 'onehot':
+  return state['onehot'].get_feature_names_out().tolist()
+ return hashed_feature_names(state['hashing'])
+
+def export_sparse_features(matrix: sparse.csr_matrix, target_dir: Path, block: str, append: bool = False) -> None:
+ """<b>Save one sparse block next to 'transformed_data.csv', row-aligned with it.</b>
+
+ :param matrix: sparse.csr_matrix - The block's rows.
+ :param target_dir: Path - The 'saved_data' folder.
+ :param block: str - A key of `SPARSE_FILES`.
+ :param append: bool - Append the rows to the saved block instead of overwriting it.
+ """
+ path = Path(target_dir) / SPARSE_FILES[block]
+ if append and path.exists():
+  matrix = sparse.vstack([sparse.load_npz(path), matrix], format='csr')
+ sparse.save_npz(path, matrix)
+ print(f"Sparse features {matrix.shape[0]} x {matrix.shape[1]} ({matrix.nnz} non-zeros) saved to '{path.name}'")
+
+def remove_sparse_features(target_dir: Path, block: str) -> None:
+ """<b>Delete a block left by an earlier run, which would no longer line up with the transformed rows.</b>"""
+ (Path(target_dir) / SPARSE_FILES[block]).unlink(missing_ok=True)
+
+def load_sparse_features(target_dir: Path = None):
+ """<b>Load every sparse block of the last run, stacked side by side, or None when there are none.</b>
+
+ :param target_dir: Path - The 'saved_data' folder.
+ :returns tuple: (sparse.csr_matrix, list of feature names) or None.
+ """
+ target_dir = Path(target_dir or Path(__file__).parent.parent.parent / "saved_data")
+ state_path = target_dir / "transform_state.pkl"
+ if not state_path.exists():
+  return None
+ state = joblib.load(state_path)
+ blocks, names = [], []
+ for block, file_name in SPARSE_FILES.items():
+  if state.get(block) is not None and (target_dir / file_name).exists():
+   blocks.append(sparse.load_npz(target_dir / file_name))
+   names.extend(sparse_feature_names(state, block))
+ if not blocks:
+  return None
+ return sparse.hstack(blocks, format='csr'), names
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import pandas as pd
+from pathlib import Path
+
+CACHE_FILE = ".chart_cache.json"
+# Bump when a plot function changes how it draws, so every chart is redrawn once
+CACHE_VERSION = 1
+
+
+def content_key(*parts) -> str:
+    """
+    Hash the inputs of a chart: aggregates (value counts, bin counts, crosstabs) and style parameters.
+
+    pandas objects are hashed with their index and names through pandas' vectorized hash, everything
+    else through its sorted JSON form.
+
+    :param parts: The chart's aggregates and parameters, in a fixed order.
+    :return: str - Hex digest identifying the chart's content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(CACHE_VERSION).encode())
+    for part in parts:
+        if isinstance(part, (pd.Series, pd.DataFrame)):
+            names = part.columns.tolist() if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(json.dumps([str(name) for name in names]).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """
+    Index of the content key of every chart written to an output directory.
+
+    A chart is redrawn only when its key changed since the last run or its file is gone; otherwise the
+    file on disk already shows the same content and rendering it again is skipped. The index is saved
+    as '.chart_cache.json' in the output directory when the cache is closed.
+    """
+
+    def __init__(self, root: Path, enabled: bool = True):
+        """
+        :param root: Path - The output directory holding the charts and the index.
+        :param enabled: bool - False redraws every chart (the index is still rebuilt for the next run).
+        """
+        self.root = Path(root)
+        self.enabled = enabled
+        self.index_file = self.root / CACHE_FILE
+        self.index = {}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                print(f"Ignoring unreadable chart cache index {self.index_file}")
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, file_path: Path) -> str:
+        file_path = Path(file_path)
+        try:
+            return file_path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(file_path.resolve())
+
+    def fresh(self, file_path: Path, key: str) -> bool:
+        """True when `file_path` exists and was last written from content with the same `key`."""
+        if self.enabled and self.index.get(self._entry(file_path)) == key and Path(file_path).exists():
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def record(self, file_path: Path, key: str) -> None:
+        """Remember that `file_path` now holds the chart with content `key`."""
+        self.index[self._entry(file_path)] = key
+
+    def close(self) -> None:
+        """Save the index and report how many charts were skipped."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.index_file, 'w') as f:
+            json.dump(self.index, f, indent=4, sort_keys=True)
+        if self.hits:
+            print(f"Chart cache: {self.hits} unchanged charts skipped, {self.misses} redrawn")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
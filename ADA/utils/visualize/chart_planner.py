@@ -0,0 +1,173 @@
+import pandas as pd
+from ADA.utils.preprocess.associations import category_codes, contingency_table, cramers_v
+from ADA.utils.backend import get_backend, sum_counts, value_counts
+
+OTHER_LABEL = "Other"
+
+# Maximum number of levels drawn per chart type; the remaining levels are folded into "Other"
+BAR_TOP_K = 30
+PIE_TOP_K = 10
+STACKED_TOP_K = 20
+STACKED_HUE_TOP_K = 10
+SANKEY_TOP_K = 12
+SANKEY_MAX_COLUMNS = 6
+
+# A chart is dropped when its kept levels cover less than this share of the rows
+MIN_COVERAGE = 0.5
+# A column whose levels are (almost) all distinct is treated as an identifier and not charted
+IDENTIFIER_RATIO = 0.9
+
+# Rough single-threaded render cost in seconds: (per chart, per drawn element)
+CHART_COSTS = {
+    'bar': (0.06, 0.003),
+    'pie': (0.08, 0.006),
+    'stacked': (0.08, 0.0015),
+    'sankey': (1.0, 0.01),
+}
+
+
+def top_k_counts(counts: pd.Series, top_k: int) -> pd.Series:
+    """
+    Keep the `top_k` largest counts and fold the rest into a single "Other" entry.
+
+    :param counts: pd.Series - Value counts sorted in descending order.
+    :param top_k: int - Number of levels kept.
+    :return: pd.Series - At most `top_k + 1` counts.
+    """
+    if top_k is None or len(counts) <= top_k:
+        return counts
+    kept = counts.iloc[:top_k]
+    kept.index = kept.index.astype(object)
+    return pd.concat([kept, pd.Series({OTHER_LABEL: counts.iloc[top_k:].sum()})])
+
+def bucket_top_k(series: pd.Series, top_k: int) -> pd.Series:
+    """
+    Replace every level outside the `top_k` most frequent ones with "Other".
+
+    :param series: pd.Series - A categorical column.
+    :param top_k: int - Number of levels kept.
+    :return: pd.Series - The bucketed column (category dtype when levels were folded).
+    """
+    counts = series.value_counts()
+    if top_k is None or len(counts) <= top_k:
+        return series
+    keep = counts.index[:top_k]
+    bucketed = series.astype('category')
+    if OTHER_LABEL not in bucketed.cat.categories:
+        bucketed = bucketed.cat.add_categories([OTHER_LABEL])
+    bucketed = bucketed.where(bucketed.isin(keep) | bucketed.isna(), OTHER_LABEL)
+    return bucketed.cat.remove_unused_categories()
+
+def cardinality_stats(data: pd.DataFrame, columns: list[str], backend=None) -> dict:
+    """
+    Number of levels and the row share covered by the most frequent levels, per column.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param columns: list[str] - Categorical columns to describe.
+    :param backend: Execution backend (see ADA.utils.backend); value counts are summed over its partitions.
+    :return: dict - {column: {'levels', 'rows', 'coverage': {top_k: share}}}.
+    """
+    stats = {}
+    all_counts = get_backend(backend).map_combine(value_counts, sum_counts, data[columns], columns=columns) if columns else {}
+    for column in columns:
+        counts = all_counts[column]
+        rows = int(counts.sum())
+        cumulative = counts.cumsum()
+        stats[column] = {
+            'levels': len(counts),
+            'rows': rows,
+            'coverage': {
+                k: (float(cumulative.iloc[min(k, len(counts)) - 1]) / rows if rows and len(counts) else 0.0)
+                for k in {BAR_TOP_K, PIE_TOP_K, STACKED_TOP_K, STACKED_HUE_TOP_K, SANKEY_TOP_K}
+            }
+        }
+    return stats
+
+def _estimate(kind: str, elements: int) -> float:
+    base, per_element = CHART_COSTS[kind]
+    return base + per_element * elements
+
+def _check(column_stats: dict, top_k: int) -> str:
+    """Reason why `top_k` levels of a column cannot be charted readably, or None."""
+    if column_stats['levels'] == 0:
+        return "no values"
+    if column_stats['levels'] > top_k and column_stats['levels'] >= IDENTIFIER_RATIO * column_stats['rows']:
+        return f"identifier-like ({column_stats['levels']} distinct values in {column_stats['rows']} rows)"
+    if column_stats['coverage'][top_k] < MIN_COVERAGE:
+        return f"top {top_k} of {column_stats['levels']} levels cover only {column_stats['coverage'][top_k]:.0%} of rows"
+    return None
+
+def plan_categorical_charts(data: pd.DataFrame, columns: list[str], selected_features: list[str], max_stacked: int = None,
+                            backend=None) -> dict:
+    """
+    Decide up front which categorical charts are worth drawing, how many levels each keeps and what they cost.
+
+    Bars and pies are planned for the selected columns, stacked bars for every ordered pair of columns
+    (strongest Cramér's V first), and one Sankey diagram over the columns that stay readable after bucketing.
+    Each chart's `options` are the top-k keyword arguments of its plot function.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param columns: list[str] - Categorical columns.
+    :param selected_features: list[str] - Columns kept by feature selection.
+    :param max_stacked: int - Optional number of most associated stacked bar pairs to keep.
+    :param backend: Execution backend the cardinality stats are aggregated on.
+    :return: dict - {'charts': [{'kind', 'columns', 'options', 'seconds', 'association'}], 'skipped': [{'kind', 'columns', 'reason'}], 'seconds'}.
+    """
+    columns = [col for col in columns if col in data.columns]
+    stats = cardinality_stats(data, columns, backend)
+    charts, skipped = [], []
+
+    def add(kind, chart_columns, options, elements, reason, association=None):
+        if reason:
+            skipped.append({'kind': kind, 'columns': chart_columns, 'reason': reason})
+        else:
+            charts.append({'kind': kind, 'columns': chart_columns, 'options': options,
+                           'seconds': _estimate(kind, elements), 'association': association})
+
+    for column in columns:
+        if column not in selected_features:
+            continue
+        levels = stats[column]['levels']
+        add('bar', [column], {'top_k': BAR_TOP_K}, min(levels, BAR_TOP_K + 1), _check(stats[column], BAR_TOP_K))
+        add('pie', [column], {'top_k': PIE_TOP_K}, min(levels, PIE_TOP_K + 1), _check(stats[column], PIE_TOP_K))
+
+    # Stacked bars are ranked by Cramér's V; each contingency table is built once per unordered pair
+    codes = {col: category_codes(data[col]) for col in columns}
+    strength = {}
+    stacked = []
+    for column1 in columns:
+        for column2 in columns:
+            if column1 == column2:
+                continue
+            reason = _check(stats[column1], STACKED_TOP_K) or _check(stats[column2], STACKED_HUE_TOP_K)
+            key = frozenset((column1, column2))
+            if reason is None and key not in strength:
+                (codes1, levels1), (codes2, levels2) = codes[column1], codes[column2]
+                strength[key] = cramers_v(contingency_table(codes1, codes2, levels1, levels2))
+            elements = min(stats[column1]['levels'], STACKED_TOP_K + 1) * min(stats[column2]['levels'], STACKED_HUE_TOP_K + 1)
+            stacked.append(('stacked', [column1, column2], {'top_k': STACKED_TOP_K, 'hue_top_k': STACKED_HUE_TOP_K},
+                            elements, reason, strength.get(key)))
+    stacked.sort(key=lambda chart: -1.0 if chart[5] is None else chart[5], reverse=True)
+    for rank, chart in enumerate(stacked):
+        if chart[4] is None and max_stacked is not None and rank >= max_stacked:
+            chart = chart[:4] + (f"not among the {max_stacked} most associated pairs",) + chart[5:]
+        add(*chart)
+
+    if len(columns) >= 2:
+        sankey_columns = [col for col in columns if _check(stats[col], SANKEY_TOP_K) is None][:SANKEY_MAX_COLUMNS]
+        elements = sum(min(stats[col]['levels'], SANKEY_TOP_K + 1) for col in sankey_columns)
+        reason = None if len(sankey_columns) >= 2 else "fewer than two columns with few enough levels"
+        add('sankey', sankey_columns or columns, {'top_k': SANKEY_TOP_K}, elements, reason)
+
+    return {'charts': charts, 'skipped': skipped, 'seconds': sum(chart['seconds'] for chart in charts)}
+
+def describe_plan(plan: dict, max_skipped: int = 10) -> str:
+    """Summary of a chart plan with its estimated render time and the first `max_skipped` skipped charts."""
+    counts = pd.Series([chart['kind'] for chart in plan['charts']], dtype=object).value_counts()
+    planned = ", ".join(f"{count} {kind}" for kind, count in counts.items()) or "no charts"
+    lines = [f"Chart plan: {planned} (estimated render time ~{plan['seconds']:.1f}s)"]
+    for item in plan['skipped'][:max_skipped]:
+        lines.append(f"  skipping {item['kind']} of {' vs '.join(map(str, item['columns']))}: {item['reason']}")
+    if len(plan['skipped']) > max_skipped:
+        lines.append(f"  ... and {len(plan['skipped']) - max_skipped} more skipped charts")
+    return "\n".join(lines)
@@ -0,0 +1,108 @@
+import json
+import math
+import warnings
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from ADA.utils.preprocess.associations import correlation_matrix
+
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def compute_column_stats(data: pd.DataFrame, columns: list[str], bins: int = 30, max_fliers: int = 200,
+                         outlier_bounds: dict = None, correlation_columns: list[str] = None) -> dict:
+    """
+    Compute the statistics every numerical chart needs in one vectorized pass over the numeric block.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param columns: list[str] - Numerical columns to describe.
+    :param bins: int - Number of histogram bins per column.
+    :param max_fliers: int - Maximum number of outlier points kept per column for boxplots.
+    :param outlier_bounds: dict - Optional bounds of the preprocessing outlier stage (see
+           `ADA.utils.preprocess.outliers`); bounded columns take their quartiles and fences from it,
+           so the boxplots show the outliers the stage clipped or flagged.
+    :param correlation_columns: list[str] - Further columns that only enter the correlation matrix, e.g. scatter
+           partners of the described columns; no quantiles or histograms are computed for them.
+    :return: dict - {'columns': [...], 'stats': {column: {...}}, 'correlation': [[...]]} where 'columns' indexes the
+             correlation matrix and each described column holds count, mean, std, min, q1, median, q3, max,
+             whislo, whishi, fliers, bin_edges and bin_counts.
+    """
+    described = [col for col in columns if col in data.columns]
+    columns = described + [col for col in dict.fromkeys(correlation_columns or []) if col in data.columns and col not in described]
+    full_block = np.empty((len(data), len(columns)), dtype=np.float64)
+    for i, col in enumerate(columns):
+        full_block[:, i] = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=np.float64)
+    # Per-column statistics only for the described columns, the first ones of the block
+    block = full_block[:, :len(described)]
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=0)
+    if len(columns) == 0 or len(data) == 0:
+        return {'columns': columns, 'stats': {}, 'correlation': []}
+    # Pearson correlation of every pair from one product of the standardized block
+    correlation = correlation_matrix(full_block)
+    if not described:
+        return {'columns': columns, 'stats': {}, 'correlation': correlation.tolist()}
+
+    # Quantiles, moments and Tukey whiskers for all columns at once
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        lo, q1, median, q3, hi = np.nanquantile(block, QUANTILES, axis=0)
+        mean = np.nanmean(block, axis=0)
+        std = np.nanstd(block, axis=0, ddof=1)
+        iqr = q3 - q1
+        low_fence, high_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        for i, col in enumerate(described):
+            if outlier_bounds and col in outlier_bounds:
+                bounds = outlier_bounds[col]
+                q1[i], median[i], q3[i] = bounds['q1'], bounds['median'], bounds['q3']
+                low_fence[i], high_fence[i] = bounds['lower'], bounds['upper']
+        whislo = np.nanmin(np.where(block >= low_fence, block, np.nan), axis=0)
+        whishi = np.nanmax(np.where(block <= high_fence, block, np.nan), axis=0)
+
+    # Histograms of all columns with a single bincount over offset bin ids
+    span = np.where(hi > lo, hi - lo, 1.0)
+    bin_ids = np.floor((block - lo) / span * bins)
+    bin_ids = np.clip(np.nan_to_num(bin_ids, nan=0), 0, bins - 1).astype(np.int64) + np.arange(len(described)) * bins
+    bin_counts = np.bincount(bin_ids[valid], minlength=len(described) * bins).reshape(len(described), bins)
+    bin_edges = lo[:, None] + span[:, None] * np.linspace(0, 1, bins + 1)[None, :]
+
+    stats = {}
+    for i, col in enumerate(described):
+        outside = block[:, i][valid[:, i] & ((block[:, i] < low_fence[i]) | (block[:, i] > high_fence[i]))]
+        if len(outside) > max_fliers:
+            outside = np.sort(outside)[np.linspace(0, len(outside) - 1, max_fliers).astype(np.int64)]
+        stats[col] = {
+            'count': int(count[i]), 'mean': float(mean[i]), 'std': float(std[i]),
+            'min': float(lo[i]), 'q1': float(q1[i]), 'median': float(median[i]), 'q3': float(q3[i]), 'max': float(hi[i]),
+            'whislo': float(whislo[i]), 'whishi': float(whishi[i]), 'fliers': outside.tolist(),
+            'bin_edges': bin_edges[i].tolist(), 'bin_counts': bin_counts[i].tolist()
+        }
+    return {'columns': columns, 'stats': stats, 'correlation': correlation.tolist()}
+
+def correlation_between(column_stats: dict, x_column: str, y_column: str) -> float:
+    """
+    Look up the Pearson correlation of two columns in a stats store, or None if either column is missing.
+    """
+    columns = column_stats.get('columns', [])
+    if x_column not in columns or y_column not in columns:
+        return None
+    return column_stats['correlation'][columns.index(x_column)][columns.index(y_column)]
+
+def _nan_to_none(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_nan_to_none(v) for v in value]
+    return value
+
+def save_column_stats(column_stats: dict, file_path: Path) -> None:
+    """Persist the stats store as JSON (NaN statistics are written as null)."""
+    with open(file_path, 'w') as f:
+        json.dump(_nan_to_none(column_stats), f, indent=4)
+
+def load_column_stats(file_path: Path) -> dict:
+    """Load a stats store written by `save_column_stats`."""
+    with open(file_path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,67 @@
+import threading
+from contextlib import contextmanager
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Fixed subplot margins per chart kind, used instead of tight_layout()
+BAR_LAYOUT = dict(left=0.1, right=0.97, bottom=0.22, top=0.9)
+PIE_LAYOUT = dict(left=0.05, right=0.95, bottom=0.05, top=0.9)
+PLOT_LAYOUT = dict(left=0.1, right=0.95, bottom=0.12, top=0.9)
+TIME_SERIES_LAYOUT = dict(left=0.08, right=0.92, bottom=0.12, top=0.9)  # room for a twin y-axis
+
+
+def new_axes(fig: Figure = None, figsize: tuple = (10, 6), layout: dict = PLOT_LAYOUT, dpi: int = 100):
+    """
+    Prepare a figure with a single axes without touching pyplot's global state.
+
+    :param fig: Figure - Figure to clear and redraw into; a new Agg figure is created when omitted.
+    :param figsize: tuple - Figure size in inches.
+    :param layout: dict - Fixed subplot margins (see `Figure.subplots_adjust`).
+    :param dpi: int - Resolution of a newly created figure.
+    :return: tuple[Figure, Axes] - The figure and its axes.
+    """
+    if fig is None:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+    else:
+        fig.clear()
+        if tuple(fig.get_size_inches()) != tuple(figsize):
+            fig.set_size_inches(figsize)
+    fig.subplots_adjust(**layout)
+    return fig, fig.add_subplot()
+
+class FigurePool:
+    """
+    Thread-safe pool of reusable Agg figures.
+    A figure is handed to one caller at a time, so several threads can render concurrently.
+    """
+
+    def __init__(self, max_size: int = 8, dpi: int = 100):
+        self.max_size = max_size
+        self.dpi = dpi
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Figure:
+        """Take a figure from the pool, or create one if the pool is empty."""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        fig = Figure(dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        return fig
+
+    def release(self, fig: Figure) -> None:
+        """Return a figure to the pool; it is cleared by the next `new_axes` call."""
+        with self._lock:
+            if len(self._free) < self.max_size:
+                self._free.append(fig)
+
+    @contextmanager
+    def figure(self):
+        """Borrow a figure for the duration of a `with` block."""
+        fig = self.acquire()
+        try:
+            yield fig
+        finally:
+            self.release(fig)
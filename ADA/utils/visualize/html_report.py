@@ -0,0 +1,174 @@
+import html
+import json
+import pandas as pd
+from pathlib import Path
+from ADA.utils.visualize.column_stats import compute_column_stats
+from ADA.utils.visualize.chart_planner import top_k_counts
+
+
+def categorical_aggregates(data: pd.DataFrame, columns: list[str], top_k: int = 30) -> dict:
+    """
+    Value counts per categorical column, keeping the `top_k` levels and folding the rest into "Other".
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param columns: list[str] - Categorical columns to aggregate.
+    :param top_k: int - Number of levels kept per column.
+    :return: dict - {column: {'labels': [...], 'counts': [...]}}.
+    """
+    aggregates = {}
+    for column in columns:
+        counts = top_k_counts(data[column].value_counts(), top_k)
+        aggregates[column] = {'labels': counts.index.astype(str).tolist(), 'counts': [int(v) for v in counts]}
+    return aggregates
+
+def numerical_aggregates(data: pd.DataFrame, columns: list[str], bins: int = 30) -> dict:
+    """
+    Histogram bins and box statistics per numerical column.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param columns: list[str] - Numerical columns to aggregate.
+    :param bins: int - Number of histogram bins.
+    :return: dict - {column: {'edges', 'counts', 'box': {'q1', 'median', 'q3', 'lower', 'upper', 'min', 'max'}}}.
+    """
+    aggregates = {}
+    for column, stats in compute_column_stats(data, columns, bins=bins)['stats'].items():
+        if stats['count'] == 0:
+            continue
+        aggregates[column] = {
+            'edges': stats['bin_edges'],
+            'counts': stats['bin_counts'],
+            'box': {
+                'q1': stats['q1'], 'median': stats['median'], 'q3': stats['q3'],
+                'lower': stats['whislo'], 'upper': stats['whishi'],
+                'min': stats['min'], 'max': stats['max']
+            }
+        }
+    return aggregates
+
+def scatter_sample(data: pd.DataFrame, columns: list[str], target_col: str = None, max_points: int = 2000, random_state: int = 42) -> dict:
+    """
+    One shared row sample of the numerical columns (and the target) used for every client-side scatter plot.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param columns: list[str] - Numerical columns to sample.
+    :param target_col: str - Optional column used to color the points.
+    :param max_points: int - Maximum number of sampled rows.
+    :param random_state: int - Seed of the sample.
+    :return: dict - {column: [values]}, with missing values as null.
+    """
+    keep = list(dict.fromkeys(columns + ([target_col] if target_col in data.columns else [])))
+    sample = data[keep]
+    if len(sample) > max_points:
+        sample = sample.sample(n=max_points, random_state=random_state)
+    if target_col in keep and not pd.api.types.is_numeric_dtype(sample[target_col]):
+        # Color by category code, like plot_numerical_scatter does
+        sample = sample.assign(**{target_col: sample[target_col].astype('category').cat.codes})
+    return {col: [None if pd.isna(v) else (v if isinstance(v, (int, float)) else str(v)) for v in sample[col].tolist()] for col in keep}
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{plotly_script}
+<style>
+body {{ font-family: sans-serif; margin: 20px; }}
+.chart {{ display: inline-block; width: 48%; height: 420px; vertical-align: top; }}
+h2 {{ border-bottom: 1px solid #ccc; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<h2>Categorical columns</h2><div id="categorical"></div>
+<h2>Numerical columns</h2><div id="numerical"></div>
+<h2>Scatter plots</h2>
+<label>x <select id="scatter-x"></select></label>
+<label>y <select id="scatter-y"></select></label>
+<div id="scatter" class="chart" style="width: 96%; height: 600px;"></div>
+<script type="application/json" id="ada-data">{data}</script>
+<script>
+const report = JSON.parse(document.getElementById("ada-data").textContent);
+function addChart(parent) {{
+  const div = document.createElement("div");
+  div.className = "chart";
+  document.getElementById(parent).appendChild(div);
+  return div;
+}}
+for (const [column, agg] of Object.entries(report.categorical)) {{
+  Plotly.newPlot(addChart("categorical"), [{{type: "bar", x: agg.labels, y: agg.counts, marker: {{color: "skyblue"}}}}],
+    {{title: "Distribution of " + column, xaxis: {{title: column}}, yaxis: {{title: "Count"}}}});
+  Plotly.newPlot(addChart("categorical"), [{{type: "pie", labels: agg.labels, values: agg.counts}}],
+    {{title: "Distribution of " + column}});
+}}
+for (const [column, agg] of Object.entries(report.numerical)) {{
+  const centers = agg.counts.map((_, i) => (agg.edges[i] + agg.edges[i + 1]) / 2);
+  const widths = agg.counts.map((_, i) => agg.edges[i + 1] - agg.edges[i]);
+  Plotly.newPlot(addChart("numerical"), [{{type: "bar", x: centers, y: agg.counts, width: widths, marker: {{color: "skyblue", line: {{color: "black", width: 1}}}}}}],
+    {{title: "Distribution of " + column, xaxis: {{title: column}}, yaxis: {{title: "Frequency"}}}});
+  const b = agg.box;
+  Plotly.newPlot(addChart("numerical"), [{{type: "box", name: column, q1: [b.q1], median: [b.median], q3: [b.q3],
+    lowerfence: [b.lower], upperfence: [b.upper], fillcolor: "lightblue", line: {{color: "black"}}}}],
+    {{title: "Boxplot of " + column}});
+}}
+const columns = Object.keys(report.numerical);
+for (const id of ["scatter-x", "scatter-y"]) {{
+  const select = document.getElementById(id);
+  columns.forEach(c => select.add(new Option(c, c)));
+  select.onchange = drawScatter;
+}}
+if (columns.length > 1) document.getElementById("scatter-y").selectedIndex = 1;
+function drawScatter() {{
+  const x = document.getElementById("scatter-x").value, y = document.getElementById("scatter-y").value;
+  const marker = {{opacity: 0.7}};
+  if (report.target && report.sample[report.target]) {{
+    marker.color = report.sample[report.target];
+    marker.colorbar = {{title: report.target}};
+  }}
+  Plotly.newPlot("scatter", [{{type: "scattergl", mode: "markers", x: report.sample[x], y: report.sample[y], marker: marker}}],
+    {{title: "Scatter Plot of " + x + " vs " + y, xaxis: {{title: x}}, yaxis: {{title: y}}}});
+}}
+if (columns.length) drawScatter();
+</script>
+</body>
+</html>
+"""
+
+def build_html_report(
+    data: pd.DataFrame,
+    cat_columns: list[str],
+    num_columns: list[str],
+    report_file: Path,
+    target_col: str = None,
+    include_plotlyjs: str = 'cdn',
+    title: str = "ADA Report"
+) -> Path:
+    """
+    Write a single self-contained HTML report whose charts are drawn client-side from pre-aggregated data.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param cat_columns: list[str] - Categorical columns to report.
+    :param num_columns: list[str] - Numerical columns to report.
+    :param report_file: Path - Output HTML file.
+    :param target_col: str - Optional column used to color the scatter points.
+    :param include_plotlyjs: str - 'cdn' links plotly.js, 'inline' embeds it so the report works offline.
+    :param title: str - Report title.
+    :return: Path - The written report file.
+    """
+    payload = {
+        'categorical': categorical_aggregates(data, cat_columns),
+        'numerical': numerical_aggregates(data, num_columns),
+        'sample': scatter_sample(data, num_columns, target_col),
+        'target': target_col if target_col in data.columns else None
+    }
+    if include_plotlyjs == 'inline':
+        from plotly.offline import get_plotlyjs
+        plotly_script = f"<script>{get_plotlyjs()}</script>"
+    else:
+        plotly_script = '<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>'
+
+    # "</" would close the surrounding <script> tag early
+    data_json = json.dumps(payload, default=float).replace("</", "<\\/")
+    report_file = Path(report_file)
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    report_file.write_text(REPORT_TEMPLATE.format(title=html.escape(title), plotly_script=plotly_script, data=data_json), encoding="utf-8")
+    return report_file
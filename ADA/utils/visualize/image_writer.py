@@ -0,0 +1,108 @@
+import io
+import time
+import threading
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.image import imsave
+
+IMAGE_FORMATS = ('png', 'jpg', 'webp')
+
+
+class ImageWriter:
+    """
+    Background pool that encodes and writes rasterized figures while the caller renders the next chart.
+
+    `submit` draws the figure and copies its RGBA buffer (so a pooled figure can be reused right away),
+    then hands the buffer to a worker thread. At most `max_pending` buffers wait in the queue; further
+    submits block until a worker catches up, which bounds memory use.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, image_format: str = 'png', compress_level: int = 6, quality: int = 90):
+        """
+        :param max_workers: int - Number of encoding/writing threads.
+        :param max_pending: int - Maximum number of rasterized buffers waiting to be written.
+        :param image_format: str - 'png', 'jpg' or 'webp'; the file suffix is replaced to match.
+        :param compress_level: int - zlib level 0-9 for PNG (lower is faster and larger).
+        :param quality: int - Quality 1-100 for JPEG and WebP.
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format '{image_format}'. Choose from {', '.join(IMAGE_FORMATS)}.")
+        self.image_format = image_format
+        self.pil_kwargs = {'compress_level': compress_level} if image_format == 'png' else {'quality': quality}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ada-image-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures = []
+        self.timings = {'render': 0.0, 'encode': 0.0, 'write': 0.0}
+        self.n_images = 0
+
+    def _add_time(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.timings[phase] += seconds
+
+    def _encode_and_write(self, pixels: np.ndarray, file_path: Path) -> Path:
+        try:
+            start = time.perf_counter()
+            buffer = io.BytesIO()
+            imsave(buffer, pixels, format=self.image_format, pil_kwargs=self.pil_kwargs)
+            self._add_time('encode', time.perf_counter() - start)
+
+            start = time.perf_counter()
+            file_path.write_bytes(buffer.getbuffer())
+            self._add_time('write', time.perf_counter() - start)
+            return file_path
+        except Exception:
+            # Leave no stale or partial file behind, so a chart cache cannot mistake it for the new chart
+            file_path.unlink(missing_ok=True)
+            raise
+        finally:
+            self._slots.release()
+
+    def output_path(self, file_path) -> Path:
+        """The file `submit` writes for `file_path`: its suffix replaced by the writer's format."""
+        return Path(file_path).with_suffix(f".{self.image_format}")
+
+    @property
+    def settings(self) -> dict:
+        """Encoding settings that change the written files, for chart cache keys."""
+        return {'format': self.image_format, **self.pil_kwargs}
+
+    def submit(self, fig, file_path) -> Path:
+        """
+        Rasterize `fig` now and queue it to be encoded and written to `file_path`.
+
+        :param fig: Figure - The figure to save.
+        :param file_path: Path - Output file; its suffix is replaced by the writer's format.
+        :return: Path - The file that will be written.
+        """
+        file_path = self.output_path(file_path)
+        start = time.perf_counter()
+        fig.canvas.draw()
+        pixels = np.asarray(fig.canvas.buffer_rgba()).copy()
+        self._add_time('render', time.perf_counter() - start)
+
+        self._slots.acquire()
+        with self._lock:
+            self.n_images += 1
+            self._futures.append((file_path, self._executor.submit(self._encode_and_write, pixels, file_path)))
+        return file_path
+
+    def close(self) -> None:
+        """Wait for every queued image, report failures and print the time spent in each phase."""
+        self._executor.shutdown(wait=True)
+        for file_path, future in self._futures:
+            if future.exception() is not None:
+                print(f"Error writing {file_path}: {str(future.exception())}")
+        self._futures = []
+        if self.n_images:
+            print(
+                f"Saved {self.n_images} images: render {self.timings['render']:.2f}s, "
+                f"encode {self.timings['encode']:.2f}s, write {self.timings['write']:.2f}s"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
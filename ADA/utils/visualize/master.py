@@ -2,14 +2,28 @@ import os
 import pandas as pd
 from pathlib import Path
 import json
-import matplotlib.pyplot as plt
 import sys
+import time
+from contextlib import nullcontext
 from importlib import import_module
+from ADA.utils.visualize.figure_pool import FigurePool
+from ADA.utils.visualize.image_writer import ImageWriter
+from ADA.utils.visualize.chart_planner import plan_categorical_charts, describe_plan, bucket_top_k
+from ADA.utils.visualize.chart_cache import ChartCache, content_key
+from ADA.utils.ingest import read_csv, read_header
 
 current_dir = Path(__file__).parent
 data_path = current_dir.parent.parent / "saved_data"
 dataset_path = current_dir.parent.parent / "datasets"
 vc_path = current_dir / "visualize_categorical_data.py"
+# Figures are cleared and redrawn instead of being created and closed for every chart
+figure_pool = FigurePool()
+# Planned chart kind -> (visualization function, output folder, file name pattern)
+CATEGORICAL_CHARTS = {
+    'bar': ('plot_dist', "Bar Charts", "{0}_bar.png"),
+    'pie': ('plot_pie', "Pie Charts", "{0}_pie.png"),
+    'stacked': ('plot_stacked', "Stacked Bar Charts", "stacked_{0}_vs_{1}.png")
+}
 
 def ensure_directory(path: Path) -> Path:
     """Ensure the directory exists, create if it doesn't. Returns the path."""
@@ -20,17 +34,32 @@ def ensure_directory(path: Path) -> Path:
         print(f"Error creating directory {path}: {str(e)}")
         sys.exit(1)
 
-def load_data(file_path) -> pd.DataFrame:
-    """Load data from CSV file with validation."""
+def load_data(file_path, usecols=None, dtype=None) -> pd.DataFrame:
+    """Load data from CSV file with validation, optionally reading only `usecols` with the given dtypes."""
     file_path = Path(file_path)
     try:
         if not file_path.exists():
             raise FileNotFoundError(f"Data file not found: {file_path}")
-        return pd.read_csv(file_path)
+        return read_csv(file_path, usecols=usecols, dtype=dtype)
     except Exception as e:
         print(f"Error loading data: {str(e)}")
         sys.exit(1)
 
+def projected_dtypes(columns: list, columns_categories: dict) -> dict:
+    """Compact dtypes for the loaded columns, taken from the saved column categories."""
+    dtypes = {}
+    for col in columns_categories.get('nominal', []) + columns_categories.get('ordinal', []):
+        dtypes[col] = 'category'
+    for col in columns_categories.get('continuous', []):
+        dtypes[col] = 'float32'
+    return {col: dtype for col, dtype in dtypes.items() if col in columns}
+
+def load_columns(file_path, columns: list, columns_categories: dict) -> pd.DataFrame:
+    """Load only `columns` (those present in the file) so each stage holds just the data its charts need."""
+    header = read_header(file_path)
+    keep = [col for col in dict.fromkeys(columns) if col in header]
+    return load_data(file_path, usecols=keep, dtype=projected_dtypes(keep, columns_categories))
+
 def load_json(file_path: Path) -> dict:
     """Load JSON file with validation."""
     try:
@@ -42,6 +71,30 @@ def load_json(file_path: Path) -> dict:
         print(f"Error loading JSON: {str(e)}")
         sys.exit(1)
 
+def draw_cached(cache: ChartCache, writer: ImageWriter, file_path: Path, key: str, draw) -> bool:
+    """
+    Render `draw(pooled_figure)` to `file_path` unless the cache says the file already shows content `key`.
+
+    :return: bool - True when the chart was drawn, False when it was skipped as unchanged.
+    """
+    file_path = writer.output_path(file_path)
+    if cache.fresh(file_path, key):
+        return False
+    with figure_pool.figure() as pooled:
+        fig, _ = draw(pooled)
+        writer.submit(fig, file_path)
+    cache.record(file_path, key)
+    return True
+
+def categorical_aggregate(data: pd.DataFrame, chart: dict):
+    """The counts a planned categorical chart is drawn from, used as its cache key."""
+    columns, options = chart['columns'], chart['options']
+    if chart['kind'] == 'stacked':
+        return pd.crosstab(bucket_top_k(data[columns[0]], options['top_k']), bucket_top_k(data[columns[1]], options['hue_top_k']))
+    if chart['kind'] == 'sankey':
+        return data[columns].value_counts(dropna=False).sort_index()
+    return data[columns[0]].value_counts()
+
 def import_categorical_visualization_functions():
     """Dynamically import visualization functions."""
     try:
@@ -61,15 +114,18 @@ def visualize_categorical_data(
     columns_categories_file: Path,
     selected_features_file: Path,
     save_path: Path = None,
-    target_col = None
+    target_col = None,
+    writer: ImageWriter = None,
+    max_stacked_pairs: int = None,
+    backend = None,
+    cache: ChartCache = None
 ) -> None:
-    """Main visualization function with enhanced error handling."""
+    """Main visualization function with enhanced error handling; charts whose counts did not change since the last run are skipped."""
     # Initialize paths
     save_path = save_path or data_path / "visualizations/Categorical"
     ensure_directory(save_path)
     
-    # Load data and configs
-    data = load_data(data_file)
+    # Load configs, then only the categorical columns
     columns_categories = load_json(columns_categories_file)
     selected_features = load_json(selected_features_file)
     
@@ -81,53 +137,47 @@ def visualize_categorical_data(
         columns_categories.get('nominal', []) + 
         columns_categories.get('ordinal', [])
     )
-    
-    # Create individual visualizations
-    for column in cat_columns:
-        if column in data.columns and column in selected_features:
-            print(f"Visualizing {column}...")
-            
-            # Bar chart
-            bar_path = ensure_directory(save_path / "Bar Charts")
-            fig, _ = viz['plot_dist'](data, column)
-            fig.savefig(bar_path / f"{column}_bar.png", bbox_inches='tight')
-            plt.close(fig)
-            
-            # Pie chart
-            pie_path = ensure_directory(save_path / "Pie Charts")
-            fig, _ = viz['plot_pie'](data, column)
-            fig.savefig(pie_path / f"{column}_pie.png", bbox_inches='tight')
-            plt.close(fig)
-    
-    # Create multi-variable visualizations
-    if len(cat_columns) >= 2:
-        # Stacked bar plots
-        stacked_path = ensure_directory(save_path / "Stacked Bar Charts")
-        for col1 in range(len(cat_columns)):
-            for col2 in range(len(cat_columns)):
-                if col1 == col2:
-                    continue
-                try:
-                    fig, _ = viz['plot_stacked'](data, cat_columns[col1], cat_columns[col2])
-                    fig.savefig(
-                        stacked_path / f"stacked_{cat_columns[col1]}_vs_{cat_columns[col2]}.png",
-                        bbox_inches='tight'
-                    )
-                    plt.close(fig)
-                except Exception as e:
-                    print(f"Error creating stacked plot for {cat_columns[col1]} vs {cat_columns[col2]}: {str(e)}")
-        
+    data = load_columns(data_file, cat_columns, columns_categories)
+
+    # Plan the charts from cheap cardinality stats before drawing anything
+    plan = plan_categorical_charts(data, cat_columns, selected_features, max_stacked=max_stacked_pairs, backend=backend)
+    print(describe_plan(plan))
+    start = time.time()
+
+    # Charts are rasterized here and encoded/written by background threads
+    with nullcontext(writer) if writer else ImageWriter() as writer, nullcontext(cache) if cache else ChartCache(save_path) as cache:
+        for chart in plan['charts']:
+            if chart['kind'] not in CATEGORICAL_CHARTS:
+                continue
+            viz_key, folder, file_name = CATEGORICAL_CHARTS[chart['kind']]
+            if chart['kind'] == 'bar':
+                print(f"Visualizing {chart['columns'][0]}...")
+            try:
+                key = content_key(chart['kind'], chart['columns'], chart['options'], writer.settings, categorical_aggregate(data, chart))
+                draw_cached(cache, writer, ensure_directory(save_path / folder) / file_name.format(*chart['columns']), key,
+                            lambda pooled: viz[viz_key](data, *chart['columns'], fig=pooled, **chart['options']))
+            except Exception as e:
+                print(f"Error creating {chart['kind']} chart for {' vs '.join(map(str, chart['columns']))}: {str(e)}")
+
         # Sankey diagram
-        sankey_path = ensure_directory(save_path / "Sankey Diagrams")
-        try:
-            fig,_ = viz['plot_sankey'](data, cat_columns)
-            fig.write_image(
-                sankey_path / "sankey_diagram.png",
-                engine="kaleido",
-                scale=2
-            )
-        except Exception as e:
-            print(f"Error creating Sankey diagram: {str(e)}")
+        for chart in plan['charts']:
+            if chart['kind'] != 'sankey':
+                continue
+            sankey_file = ensure_directory(save_path / "Sankey Diagrams") / "sankey_diagram.png"
+            try:
+                key = content_key('sankey', chart['columns'], chart['options'], categorical_aggregate(data, chart))
+                if cache.fresh(sankey_file, key):
+                    continue
+                fig,_ = viz['plot_sankey'](data, chart['columns'], **chart['options'])
+                fig.write_image(
+                    sankey_file,
+                    engine="kaleido",
+                    scale=2
+                )
+                cache.record(sankey_file, key)
+            except Exception as e:
+                print(f"Error creating Sankey diagram: {str(e)}")
+    print(f"Categorical charts done in {time.time() - start:.1f}s (estimated ~{plan['seconds']:.1f}s)")
 vn_path = current_dir / "visualize_numerical_data.py"
 
 def import_numerical_visualization_functions():
@@ -147,13 +197,20 @@ def visulize_numerical_data(
     columns_categories_file: Path,
     selected_features_file: Path,
     save_path: Path = None,
-    target_col = None
+    target_col = None,
+    writer: ImageWriter = None,
+    max_scatter_pairs: int = None,
+    cache: ChartCache = None
 ) -> None:
+    """Plot the selected numerical columns; scatter plots are drawn for the `max_scatter_pairs` most correlated pairs (all by default).
+
+    Histograms and boxplots whose bins and quartiles did not change since the last run, and scatter plots
+    whose rows did not change, are skipped.
+    """
     save_path = save_path or data_path / "visualizations/Numerical"
     ensure_directory(save_path)
     
-    # Load data and configs
-    data = load_data(data_file)
+    # Load configs, then only the numerical columns and the target used for coloring
     columns_categories = load_json(columns_categories_file)
     selected_features = load_json(selected_features_file)
 
@@ -164,45 +221,177 @@ def visulize_numerical_data(
         columns_categories.get('continuous', []) +
         columns_categories.get('discrete', [])
     )
-    # Create individual visualizations
-    for column in num_columns:
-        if column in data.columns and column in selected_features:
-            print(f"Visualizing {column}...")
-
-            # Distribution plot
-            dist_path = ensure_directory(save_path / "Numerical Distribution")
-            fig, _ = viz['plot_distribution'](data, column)
-            fig.savefig(dist_path / f"{column}_distribution.png", bbox_inches='tight')
-            plt.close(fig)
-
-            # Boxplot
-            boxplot_path = ensure_directory(save_path / "Box Plots")
-            fig, _ = viz['plot_boxplot'](data, column)
-            fig.savefig(boxplot_path / f"{column}_boxplot.png", bbox_inches='tight')
-            plt.close(fig)
-            # Scatter plot (if applicable)
-            if len(num_columns) > 1:
-                scatter_path = ensure_directory(save_path / "Scatter Plots")
-                for other_column in num_columns:
-                    if other_column != column:
-                        try:
-                            fig, _ = viz['plot_scatter'](data, column, other_column,  target_col) 
-                            fig.savefig(
-                                scatter_path / f"{column}_vs_{other_column}_scatter.png",
-                                bbox_inches='tight'
-                            )
-                            plt.close(fig)
-                        except Exception as e:
-                            print(f"Error creating scatter plot for {column} vs {other_column}: {str(e)}")
+    data = load_columns(data_file, num_columns + [target_col], columns_categories)
+    plotted = [col for col in num_columns if col in selected_features]
+    # Describe the plotted columns in one pass and keep the result next to columns_categories.json;
+    # the other numerical columns only enter the correlations that rank their scatter plots
+    from ADA.utils.visualize.column_stats import compute_column_stats, save_column_stats, correlation_between
+    from ADA.utils.preprocess.outliers import bounds_for_dataset
+    # The preprocessing bounds are only reused for the file they were computed on
+    outlier_bounds = bounds_for_dataset(data_file, Path(columns_categories_file).parent)
+    column_stats = compute_column_stats(data, plotted, outlier_bounds=outlier_bounds, correlation_columns=num_columns)
+    save_column_stats(column_stats, Path(columns_categories_file).parent / "column_stats.json")
+    # Charts are rasterized here and encoded/written by background threads
+    with nullcontext(writer) if writer else ImageWriter() as writer, nullcontext(cache) if cache else ChartCache(save_path) as cache:
+        # Create individual visualizations
+        for column in num_columns:
+            if column in data.columns and column in selected_features:
+                print(f"Visualizing {column}...")
+                stats = column_stats['stats'][column]
+
+                # Distribution plot
+                dist_path = ensure_directory(save_path / "Numerical Distribution")
+                key = content_key('distribution', column, writer.settings, {k: stats[k] for k in ('bin_edges', 'bin_counts')})
+                draw_cached(cache, writer, dist_path / f"{column}_distribution.png", key,
+                            lambda pooled: viz['plot_distribution'](data, column, stats=stats, fig=pooled))
+
+                # Boxplot
+                boxplot_path = ensure_directory(save_path / "Box Plots")
+                key = content_key('boxplot', column, writer.settings,
+                                  {k: stats[k] for k in ('q1', 'median', 'q3', 'whislo', 'whishi', 'fliers')})
+                draw_cached(cache, writer, boxplot_path / f"{column}_boxplot.png", key,
+                            lambda pooled: viz['plot_boxplot'](data, column, stats=stats, fig=pooled))
+
+        # Scatter plots (if applicable), most correlated pairs first
+        scatter_pairs = [
+            (column, other_column)
+            for column in num_columns if column in data.columns and column in selected_features
+            for other_column in num_columns if other_column != column and other_column in data.columns
+        ]
+        scatter_pairs.sort(key=lambda pair: abs(correlation_between(column_stats, *pair) or 0.0), reverse=True)
+        if scatter_pairs:
+            scatter_path = ensure_directory(save_path / "Scatter Plots")
+        for column, other_column in scatter_pairs[:max_scatter_pairs]:
+            try:
+                correlation = correlation_between(column_stats, column, other_column)
+                key = content_key('scatter', writer.settings, correlation,
+                                  data[[col for col in (column, other_column, target_col) if col in data.columns]])
+                draw_cached(cache, writer, scatter_path / f"{column}_vs_{other_column}_scatter.png", key,
+                            lambda pooled: viz['plot_scatter'](data, column, other_column,  target_col,
+                                                               correlation=correlation, fig=pooled))
+            except Exception as e:
+                print(f"Error creating scatter plot for {column} vs {other_column}: {str(e)}")
+def import_time_series_visualization_functions():
+    """Dynamically import time series visualization functions."""
+    try:
+        spec = import_module("ADA.utils.visualize.visualize_time_series")
+        return {
+            'plot_moving_line': spec.plot_time_series_moving_line
+        }
+    except Exception as e:
+        print(f"Error importing time series visualization functions: {str(e)}")
+        sys.exit(1)
+
+def visualize_time_series_data(
+    data_file: Path,
+    columns_categories_file: Path,
+    selected_features_file: Path,
+    save_path: Path = None,
+    target_col = None,
+    writer: ImageWriter = None,
+    cache: ChartCache = None
+) -> None:
+    """Plot every selected numerical column against every datetime column as a downsampled moving line; unchanged series are skipped."""
+    save_path = save_path or data_path / "visualizations/Time Series"
+
+    # Load configs, then only the datetime and selected numerical columns
+    columns_categories = load_json(columns_categories_file)
+    selected_features = load_json(selected_features_file)
+    num_columns = [
+        col for col in columns_categories.get('continuous', []) + columns_categories.get('discrete', [])
+        if col in selected_features
+    ]
+    if not columns_categories.get('datetime', []):
+        return
+    data = load_columns(data_file, columns_categories['datetime'] + num_columns, columns_categories)
+
+    time_columns = [col for col in columns_categories['datetime'] if col in data.columns]
+    num_columns = [col for col in num_columns if col in data.columns]
+    if not time_columns:
+        return
+    ensure_directory(save_path)
+
+    # Get visualization functions
+    viz = import_time_series_visualization_functions()
+    # Charts are rasterized here and encoded/written by background threads
+    with nullcontext(writer) if writer else ImageWriter() as writer, nullcontext(cache) if cache else ChartCache(save_path) as cache:
+        for time_col in time_columns:
+            for column in num_columns:
+                print(f"Visualizing {column} over {time_col}...")
+                try:
+                    key = content_key('moving_line', writer.settings, data[[time_col, column]])
+                    draw_cached(cache, writer, save_path / f"{column}_over_{time_col}_line.png", key,
+                                lambda pooled: viz['plot_moving_line'](data, time_col, column, fig=pooled))
+                except Exception as e:
+                    print(f"Error creating time series plot for {column} over {time_col}: {str(e)}")
+
+def visualize_html_report(
+    data_file: Path,
+    columns_categories_file: Path,
+    selected_features_file: Path,
+    save_path: Path = None,
+    target_col = None,
+    include_plotlyjs: str = 'cdn'
+) -> Path:
+    """Write all selected columns into one interactive HTML report instead of separate PNG files."""
+    save_path = save_path or data_path / "visualizations"
+    ensure_directory(save_path)
+
+    # Load configs, then only the reported columns
+    columns_categories = load_json(columns_categories_file)
+    selected_features = load_json(selected_features_file)
+    data = load_columns(data_file, selected_features + [target_col], columns_categories)
+
+    def selected(categories):
+        return [
+            col for category in categories for col in columns_categories.get(category, [])
+            if col in data.columns and col in selected_features
+        ]
+
+    from ADA.utils.visualize.html_report import build_html_report
+    report_file = build_html_report(
+        data,
+        selected(['nominal', 'ordinal']),
+        selected(['continuous', 'discrete']),
+        save_path / "report.html",
+        target_col=target_col,
+        include_plotlyjs=include_plotlyjs,
+        title=f"ADA Report: {Path(data_file).name}"
+    )
+    print(f"Report saved to {report_file}")
+    return report_file
+
 def visualize_data(
     data_file: Path,
     save_path: Path = None,
-    target_col: str = None
+    target_col: str = None,
+    output: str = 'png',
+    compress_level: int = 6,
+    writer_threads: int = 2,
+    max_pairs: int = None,
+    backend = None,
+    use_cache: bool = True
 ) -> None:
-    """Main function to visualize both categorical and numerical data."""
+    """Main function to visualize both categorical and numerical data.
+
+    :param output: str - 'png', 'jpg' or 'webp' writes one image per chart, 'html' writes a single interactive report.
+    :param compress_level: int - PNG zlib level 0-9; lower levels encode faster into larger files.
+    :param writer_threads: int - Number of background threads encoding and writing images.
+    :param max_pairs: int - Draw only the most associated stacked bar and scatter pairs (all by default).
+    :param backend: Execution backend (see ADA.utils.backend) the chart aggregations run on.
+    :param use_cache: bool - Skip charts whose input counts and style are unchanged since the last run
+        (indexed in '.chart_cache.json' in the output folder); False redraws every chart.
+    """
     print("Starting visualization process...")
-    visualize_categorical_data(data_file, data_path / "columns_categories.json", data_path / "selected_features.json", save_path, target_col)
-    visulize_numerical_data(data_file, data_path / "columns_categories.json", data_path / "selected_features.json", save_path, target_col)
+    if output == 'html':
+        visualize_html_report(data_file, data_path / "columns_categories.json", data_path / "selected_features.json", save_path, target_col)
+        print("Visualization process completed.")
+        return
+    with ChartCache(save_path or data_path / "visualizations", enabled=use_cache) as cache, \
+            ImageWriter(max_workers=writer_threads, image_format=output, compress_level=compress_level) as writer:
+        visualize_categorical_data(data_file, data_path / "columns_categories.json", data_path / "selected_features.json", save_path, target_col, writer, max_pairs, backend, cache)
+        visulize_numerical_data(data_file, data_path / "columns_categories.json", data_path / "selected_features.json", save_path, target_col, writer, max_pairs, cache)
+        visualize_time_series_data(data_file, data_path / "columns_categories.json", data_path / "selected_features.json", save_path, target_col, writer, cache)
     print("Visualization process completed.")
 if __name__ == "__main__":
     # Configure paths
@@ -1,15 +1,19 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import plotly.graph_objects as go
+from ADA.utils.visualize.figure_pool import new_axes, BAR_LAYOUT, PIE_LAYOUT
+from ADA.utils.visualize.chart_planner import top_k_counts, bucket_top_k
 
 
-def plot_categorical_distribution(data: pd.DataFrame, column: str, title=None) -> tuple[plt.Figure, plt.Axes]:
+def plot_categorical_distribution(data: pd.DataFrame, column: str, title=None, fig=None, top_k: int = None) -> tuple[plt.Figure, plt.Axes]:
     """
     Plot the distribution of a categorical column in a DataFrame.
 
     :param data: pd.DataFrame - The DataFrame containing the data.
     :param column: str - The name of the categorical column to plot.
     :param title: str - Optional title for the plot.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
+    :param top_k: int - Optional number of levels drawn; the rest are folded into "Other".
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
     """
     # Check if the column exists in the DataFrame
@@ -17,10 +21,10 @@ def plot_categorical_distribution(data: pd.DataFrame, column: str, title=None) -
         raise ValueError(f"Column '{column}' does not exist in the DataFrame.")
 
     # Count the occurrences of each category
-    counts = data[column].value_counts()
+    counts = top_k_counts(data[column].value_counts(), top_k)
 
     # Create a bar plot for the categorical distribution
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_axes(fig, figsize=(10, 6), layout=BAR_LAYOUT)
     counts.plot(kind='bar', ax=ax, color='skyblue')
     
     # Set plot title and labels
@@ -28,18 +32,19 @@ def plot_categorical_distribution(data: pd.DataFrame, column: str, title=None) -
     ax.set_xlabel(column, fontsize=14)
     ax.set_ylabel('Count', fontsize=14)
     
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    ax.tick_params(axis='x', labelrotation=45)
     
     return fig, ax
 
-def plot_categorical_piechart(data: pd.DataFrame, column: str, title=None) -> tuple[plt.Figure, plt.Axes]:
+def plot_categorical_piechart(data: pd.DataFrame, column: str, title=None, fig=None, top_k: int = None) -> tuple[plt.Figure, plt.Axes]:
     """
     Plot a pie chart for the distribution of a categorical column in a DataFrame.
 
     :param data: pd.DataFrame - The DataFrame containing the data.
     :param column: str - The name of the categorical column to plot.
     :param title: str - Optional title for the plot.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
+    :param top_k: int - Optional number of levels drawn; the rest are folded into "Other".
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
     """
     # Check if the column exists in the DataFrame
@@ -47,26 +52,28 @@ def plot_categorical_piechart(data: pd.DataFrame, column: str, title=None) -> tu
         raise ValueError(f"Column '{column}' does not exist in the DataFrame.")
 
     # Count the occurrences of each category
-    counts = data[column].value_counts()
+    counts = top_k_counts(data[column].value_counts(), top_k)
 
     # Create a pie chart for the categorical distribution
-    fig, ax = plt.subplots(figsize=(8, 8))
+    fig, ax = new_axes(fig, figsize=(8, 8), layout=PIE_LAYOUT)
     counts.plot(kind='pie', ax=ax, autopct='%1.1f%%', startangle=90, colors=plt.cm.Paired.colors)
     
     # Set plot title
     ax.set_title(title or f'Distribution of {column}', fontsize=16)
     
-    plt.ylabel('')  # Hide y-label for better aesthetics
-    plt.tight_layout()
+    ax.set_ylabel('')  # Hide y-label for better aesthetics
     
     return fig, ax
-def stacked_bar_plot(data: pd.DataFrame, column1:str, column2:str, title=None) -> tuple[plt.Figure, plt.Axes]:
+def stacked_bar_plot(data: pd.DataFrame, column1:str, column2:str, title=None, fig=None, top_k: int = None, hue_top_k: int = None) -> tuple[plt.Figure, plt.Axes]:
     """
     Create a stacked bar plot for 2 categorical columns in a DataFrame.
     :param data: pd.DataFrame - The DataFrame containing the data.
     :param column1: str - name of categorical column to plot.
     :param column2: str - name of categorical column to plot.
     :param title: str - Optional title for the plot.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
+    :param top_k: int - Optional number of column1 levels drawn; the rest are folded into "Other".
+    :param hue_top_k: int - Optional number of column2 levels stacked; the rest are folded into "Other".
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
 
     """
@@ -74,10 +81,10 @@ def stacked_bar_plot(data: pd.DataFrame, column1:str, column2:str, title=None) -
         raise ValueError(f"Columns '{column1}' or '{column2}' do not exist in the DataFrame.")
 
     # Create a crosstab to get counts for each combination of categories
-    crosstab = pd.crosstab(data[column1], data[column2])
+    crosstab = pd.crosstab(bucket_top_k(data[column1], top_k), bucket_top_k(data[column2], hue_top_k))
 
     # Create a stacked bar plot
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_axes(fig, figsize=(10, 6), layout=BAR_LAYOUT)
     crosstab.plot(kind='bar', stacked=True, ax=ax, colormap='Paired')
 
     # Set plot title and labels
@@ -85,21 +92,23 @@ def stacked_bar_plot(data: pd.DataFrame, column1:str, column2:str, title=None) -
     ax.set_xlabel(column1, fontsize=14)
     ax.set_ylabel('Count', fontsize=14)
 
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    ax.tick_params(axis='x', labelrotation=45)
 
     return fig, ax
-def plot_sankey_diagram(data: pd.DataFrame, columns: list[str], title=None) -> tuple[plt.Figure, plt.Axes]:
+def plot_sankey_diagram(data: pd.DataFrame, columns: list[str], title=None, top_k: int = None) -> tuple[plt.Figure, plt.Axes]:
     """
     Create a Sankey diagram for the flow between two categorical columns in a DataFrame.
 
     :param data: pd.DataFrame - The DataFrame containing the data.
     :param columns: list[str] - List of two categorical columns to plot.
     :param title: str - Optional title for the plot.
+    :param top_k: int - Optional number of levels kept per column; the rest are folded into "Other".
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
     """
     if len(columns) < 2:
         raise ValueError("Sankey diagram requires at least two columns.")
+    if top_k is not None:
+        data = pd.DataFrame({col: bucket_top_k(data[col], top_k) for col in columns})
 
     # Check if both columns exist in the DataFrame
     nodes = []
@@ -122,7 +131,7 @@ def plot_sankey_diagram(data: pd.DataFrame, columns: list[str], title=None) -> t
         target_col = columns[i + 1]
         
         # Group by source and target to get counts
-        grouped = data.groupby([source_col, target_col]).size().reset_index(name='count')
+        grouped = data.groupby([source_col, target_col], observed=True).size().reset_index(name='count')
         
         for _, row in grouped.iterrows():
             source_label = f"{source_col}: {row[source_col]}"
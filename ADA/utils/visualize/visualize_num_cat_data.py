@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from ADA.utils.visualize.figure_pool import new_axes, BAR_LAYOUT
+from ADA.utils.visualize.chart_planner import bucket_top_k
+from ADA.utils.preprocess.associations import category_codes, correlation_ratio_matrix
+
+
+def plot_num_cat_scatter(data: pd.DataFrame, num_col: str, cat_col: str, color_by_cat: bool = True, title=None, fig=None,
+                         top_k: int = 20, max_points: int = 5000, random_state: int = 42) -> tuple[plt.Figure, plt.Axes]:
+    """
+    Plot a numerical column against a categorical one as a jittered strip plot, with the correlation ratio (eta) in the title.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param num_col: str - The name of the numerical column (y-axis).
+    :param cat_col: str - The name of the categorical column (x-axis).
+    :param color_by_cat: bool - Color the points by category.
+    :param title: str - Optional title for the plot.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
+    :param top_k: int - Number of categories drawn; the rest are folded into "Other".
+    :param max_points: int - Maximum number of drawn points; eta is always computed on every row.
+    :param random_state: int - Seed of the point sample and the jitter.
+    :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
+    """
+    for col in [num_col, cat_col]:
+        if col not in data.columns:
+            raise ValueError(f"Column '{col}' does not exist in the DataFrame.")
+
+    values = pd.to_numeric(data[num_col], errors='coerce').to_numpy(dtype=np.float64)
+    codes, n_levels = category_codes(data[cat_col])
+    eta = correlation_ratio_matrix(values[:, None], [codes], [n_levels])[0, 0]
+
+    categories = bucket_top_k(data[cat_col], top_k).astype('category')
+    positions = categories.cat.codes.to_numpy()
+    keep = np.flatnonzero((positions >= 0) & ~np.isnan(values))
+    rng = np.random.default_rng(random_state)
+    if len(keep) > max_points:
+        keep = np.sort(rng.choice(keep, size=max_points, replace=False))
+    jitter = rng.uniform(-0.3, 0.3, size=len(keep))
+
+    fig, ax = new_axes(fig, figsize=(10, 6), layout=BAR_LAYOUT)
+    ax.scatter(positions[keep] + jitter, values[keep], s=12, alpha=0.6,
+               c=positions[keep] if color_by_cat else 'skyblue', cmap='tab20' if color_by_cat else None)
+    ax.set_xticks(range(len(categories.cat.categories)))
+    ax.set_xticklabels([str(level) for level in categories.cat.categories])
+
+    # Set plot title and labels
+    ax.set_title(title or f'{num_col} by {cat_col} (eta = {eta:.2f})', fontsize=16)
+    ax.set_xlabel(cat_col, fontsize=14)
+    ax.set_ylabel(num_col, fontsize=14)
+    ax.tick_params(axis='x', labelrotation=45)
+
+    return fig, ax
@@ -1,60 +1,75 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
+from ADA.utils.visualize.figure_pool import new_axes
 
-def plot_numerical_distribution(data: pd.DataFrame, column: str, title=None) -> tuple[plt.Figure, plt.Axes]:
+def plot_numerical_distribution(data: pd.DataFrame, column: str, title=None, stats: dict = None, fig=None) -> tuple[plt.Figure, plt.Axes]:
     """
     Plot the distribution of a numerical column in a DataFrame.
 
     :param data: pd.DataFrame - The DataFrame containing the data.
     :param column: str - The name of the numerical column to plot.
     :param title: str - Optional title for the plot.
+    :param stats: dict - Optional precomputed column stats (see `column_stats.compute_column_stats`); the
+        histogram is then drawn from the stored bins instead of re-binning the column.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
     """
     # Check if the column exists in the DataFrame
-    if column not in data.columns:
+    if stats is None and column not in data.columns:
         raise ValueError(f"Column '{column}' does not exist in the DataFrame.")
 
     # Create a histogram for the numerical distribution
-    fig, ax = plt.subplots(figsize=(10, 6))
-    data[column].plot(kind='hist', ax=ax, bins=30, color='skyblue', edgecolor='black')
+    fig, ax = new_axes(fig, figsize=(10, 6))
+    if stats is not None:
+        edges = np.asarray(stats['bin_edges'])
+        ax.bar(edges[:-1], stats['bin_counts'], width=np.diff(edges), align='edge', color='skyblue', edgecolor='black')
+    else:
+        data[column].plot(kind='hist', ax=ax, bins=30, color='skyblue', edgecolor='black')
 
     # Set plot title and labels
     ax.set_title(title or f'Distribution of {column}', fontsize=16)
     ax.set_xlabel(column, fontsize=14)
     ax.set_ylabel('Frequency', fontsize=14)
 
-    plt.tight_layout()
-
     return fig, ax
 
-def plot_numerical_boxplot(data: pd.DataFrame, column: str, title=None) -> tuple[plt.Figure, plt.Axes]:
+def plot_numerical_boxplot(data: pd.DataFrame, column: str, title=None, stats: dict = None, fig=None) -> tuple[plt.Figure, plt.Axes]:
     """
     Plot a boxplot for a numerical column in a DataFrame.
 
     :param data: pd.DataFrame - The DataFrame containing the data.
     :param column: str - The name of the numerical column to plot.
     :param title: str - Optional title for the plot.
+    :param stats: dict - Optional precomputed column stats; the box is then drawn from the stored
+        quantiles and whiskers instead of recomputing them.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
     """
     # Check if the column exists in the DataFrame
-    if column not in data.columns:
+    if stats is None and column not in data.columns:
         raise ValueError(f"Column '{column}' does not exist in the DataFrame.")
 
     # Create a boxplot for the numerical distribution
-    fig, ax = plt.subplots(figsize=(10, 6))
-    data.boxplot(column=column, ax=ax, patch_artist=True, boxprops=dict(facecolor='lightblue', color='black'),
+    fig, ax = new_axes(fig, figsize=(10, 6))
+    style = dict(patch_artist=True, boxprops=dict(facecolor='lightblue', color='black'),
                  whiskerprops=dict(color='black'), capprops=dict(color='black'), medianprops=dict(color='red'))
+    if stats is not None:
+        box = {'label': column, 'q1': stats['q1'], 'med': stats['median'], 'q3': stats['q3'],
+               'whislo': stats['whislo'], 'whishi': stats['whishi'], 'fliers': stats['fliers']}
+        ax.bxp([box], **dict(style, boxprops=dict(facecolor='lightblue', edgecolor='black')))
+        ax.grid(True)
+    else:
+        data.boxplot(column=column, ax=ax, **style)
 
     # Set plot title and labels
     ax.set_title(title or f'Boxplot of {column}', fontsize=16)
     ax.set_ylabel(column, fontsize=14)
 
-    plt.tight_layout()
-
     return fig, ax
 
-def plot_numerical_scatter(data: pd.DataFrame, x_column: str, y_column: str, cat_column:str = None, title=None) -> tuple[plt.Figure, plt.Axes]:
+def plot_numerical_scatter(data: pd.DataFrame, x_column: str, y_column: str, cat_column:str = None, title=None, correlation: float = None, fig=None) -> tuple[plt.Figure, plt.Axes]:
     """
     Plot a scatter plot for two numerical columns in a DataFrame.
 
@@ -63,6 +78,8 @@ def plot_numerical_scatter(data: pd.DataFrame, x_column: str, y_column: str, cat
     :param y_column: str - The name of the y-axis numerical column.
     :param title: str - Optional title for the plot.
     :param cat_column: str - The name of the categorical column to color the points by.
+    :param correlation: float - Optional precomputed Pearson correlation shown in the title.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
     :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
     """
     # Check if the columns exist in the DataFrame
@@ -71,18 +88,19 @@ def plot_numerical_scatter(data: pd.DataFrame, x_column: str, y_column: str, cat
             raise ValueError(f"Column '{col}' does not exist in the DataFrame.")
 
     # Create a scatter plot for the numerical distribution
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_axes(fig, figsize=(10, 6))
     scatter = ax.scatter(data[x_column], data[y_column], c=data[cat_column].astype('category').cat.codes, cmap='viridis', alpha=0.7)
 
     # Set plot title and labels
-    ax.set_title(title or f'Scatter Plot of {x_column} vs {y_column}', fontsize=16)
+    default_title = f'Scatter Plot of {x_column} vs {y_column}'
+    if correlation is not None:
+        default_title += f' (r = {correlation:.2f})'
+    ax.set_title(title or default_title, fontsize=16)
     ax.set_xlabel(x_column, fontsize=14)
     ax.set_ylabel(y_column, fontsize=14)
 
     # Add color bar
-    cbar = plt.colorbar(scatter, ax=ax)
+    cbar = fig.colorbar(scatter, ax=ax)
     cbar.set_label(cat_column, fontsize=14)
 
-    plt.tight_layout()
-
     return fig, ax
\ No newline at end of file
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from ADA.utils.visualize.figure_pool import new_axes, TIME_SERIES_LAYOUT
+from ADA.utils.preprocess.handle_datetime import parse_datetime, NAT_INT64
+
+
+def to_time_value_arrays(data: pd.DataFrame, time_col: str, value_col: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Extract time-ordered int64 epoch nanoseconds and float64 values, dropping missing points.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param time_col: str - The name of the datetime column.
+    :param value_col: str - The name of the numerical column.
+    :return: tuple[np.ndarray, np.ndarray] - Sorted times (int64 ns) and their values.
+    """
+    for col in [time_col, value_col]:
+        if col not in data.columns:
+            raise ValueError(f"Column '{col}' does not exist in the DataFrame.")
+
+    t = parse_datetime(data[time_col]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    v = pd.to_numeric(data[value_col], errors='coerce').to_numpy(dtype=np.float64)
+    keep = (t != NAT_INT64) & ~np.isnan(v)
+    t, v = t[keep], v[keep]
+    if len(t) > 1 and np.any(t[1:] < t[:-1]):
+        order = np.argsort(t, kind='stable')
+        t, v = t[order], v[order]
+    return t, v
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling mean in O(n) using cumulative sums; the first `window - 1` points average what is available.
+
+    :param values: np.ndarray - The values to smooth.
+    :param window: int - Number of points in the window.
+    :return: np.ndarray - The smoothed values, same length as `values`.
+    """
+    window = max(1, int(window))
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(0, ends - window)
+    return (csum[ends] - csum[starts]) / (ends - starts)
+
+def time_bucket_resample(t: np.ndarray, v: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resample onto `n_buckets` equal-width time buckets, averaging the values in each bucket (one O(n) pass).
+
+    :param t: np.ndarray - Sorted times (int64 ns).
+    :param v: np.ndarray - Values.
+    :param n_buckets: int - Number of time buckets.
+    :return: tuple[np.ndarray, np.ndarray] - Bucket center times and mean values of the non-empty buckets.
+    """
+    if len(t) == 0:
+        return t, v
+    start, span = t[0], max(int(t[-1] - t[0]), 1)
+    bucket = ((t - start).astype(np.float64) * n_buckets / span).astype(np.int64).clip(0, n_buckets - 1)
+    counts = np.bincount(bucket, minlength=n_buckets)
+    sums = np.bincount(bucket, weights=v, minlength=n_buckets)
+    filled = counts > 0
+    centers = start + ((np.arange(n_buckets) + 0.5) * span / n_buckets).astype(np.int64)
+    return centers[filled], sums[filled] / counts[filled]
+
+def _bucket_starts(n: int, n_buckets: int) -> np.ndarray:
+    """Start offsets of `n_buckets` contiguous, near-equal index buckets over `n` points."""
+    return np.unique(np.linspace(0, n, n_buckets, endpoint=False).astype(np.int64))
+
+def minmax_decimate(t: np.ndarray, v: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the minimum and maximum point of each index bucket (one bucket per pixel column), preserving spikes.
+
+    :param t: np.ndarray - Sorted times (int64 ns).
+    :param v: np.ndarray - Values.
+    :param n_buckets: int - Number of buckets, usually the plot width in pixels.
+    :return: tuple[np.ndarray, np.ndarray] - At most 2 * n_buckets points in time order.
+    """
+    n = len(t)
+    if n <= 2 * n_buckets:
+        return t, v
+    starts = _bucket_starts(n, n_buckets)
+    sizes = np.diff(np.append(starts, n))
+    idx = np.arange(n)
+    mins = np.repeat(np.minimum.reduceat(v, starts), sizes)
+    maxs = np.repeat(np.maximum.reduceat(v, starts), sizes)
+    argmin = np.minimum.reduceat(np.where(v == mins, idx, n), starts)
+    argmax = np.minimum.reduceat(np.where(v == maxs, idx, n), starts)
+    keep = np.unique(np.concatenate([argmin, argmax]))
+    return t[keep], v[keep]
+
+def lttb(t: np.ndarray, v: np.ndarray, n_out: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling to `n_out` points.
+    Each bucket is reduced with numpy, so the Python loop runs `n_out` times while the work stays O(n).
+
+    :param t: np.ndarray - Sorted times (int64 ns).
+    :param v: np.ndarray - Values.
+    :param n_out: int - Number of points to keep (at least 3).
+    :return: tuple[np.ndarray, np.ndarray] - The selected points in time order.
+    """
+    n = len(t)
+    if n_out >= n or n_out < 3:
+        return t, v
+    x = (t - t[0]).astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_lo:next_hi].mean(), v[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (v[lo:hi] - v[a]) - (x[a] - x[lo:hi]) * (avg_y - v[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return t[selected], v[selected]
+
+def downsample(t: np.ndarray, v: np.ndarray, width_px: int = 1200, method: str = 'minmax') -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to roughly the number of points that can be drawn at `width_px` pixels.
+
+    :param t: np.ndarray - Sorted times (int64 ns).
+    :param v: np.ndarray - Values.
+    :param width_px: int - Plot width in pixels.
+    :param method: str - 'minmax' (min/max per pixel bucket), 'lttb' or 'mean' (time-bucketed mean).
+    :return: tuple[np.ndarray, np.ndarray] - The downsampled points.
+    """
+    if method == 'minmax':
+        return minmax_decimate(t, v, width_px)
+    if method == 'lttb':
+        return lttb(t, v, 2 * width_px)
+    if method == 'mean':
+        return time_bucket_resample(t, v, width_px)
+    raise ValueError(f"Unknown downsampling method '{method}'. Choose from 'minmax', 'lttb', 'mean'.")
+
+def _as_datetime(t: np.ndarray) -> np.ndarray:
+    return t.view("datetime64[ns]")
+
+def plot_time_series_moving_line(data: pd.DataFrame, time_col: str, value_col: str, window: int = None,
+                                 width_px: int = 1200, method: str = 'minmax', title=None, fig=None) -> tuple[plt.Figure, plt.Axes]:
+    """
+    Plot a numerical column over time with its rolling mean, drawing only about `width_px` points per line.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param time_col: str - The name of the datetime column.
+    :param value_col: str - The name of the numerical column to plot.
+    :param window: int - Rolling window in points; defaults to one pixel column's worth of points.
+    :param width_px: int - Plot width in pixels, which bounds the number of drawn points.
+    :param method: str - Downsampling method ('minmax', 'lttb' or 'mean').
+    :param title: str - Optional title for the plot.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
+    :return: tuple[plt.Figure, plt.Axes] - The figure and axes of the plot.
+    """
+    t, v = to_time_value_arrays(data, time_col, value_col)
+    window = window or max(1, len(t) // width_px)
+    smooth = rolling_mean(v, window)
+
+    fig, ax = new_axes(fig, figsize=(width_px / 100, 6), layout=TIME_SERIES_LAYOUT)
+    raw_t, raw_v = downsample(t, v, width_px, method)
+    ax.plot(_as_datetime(raw_t), raw_v, color='skyblue', linewidth=0.8, label=value_col)
+    smooth_t, smooth_v = downsample(t, smooth, width_px, method)
+    ax.plot(_as_datetime(smooth_t), smooth_v, color='navy', linewidth=1.5, label=f'{window}-point moving average')
+
+    # Set plot title and labels
+    ax.set_title(title or f'{value_col} over {time_col}', fontsize=16)
+    ax.set_xlabel(time_col, fontsize=14)
+    ax.set_ylabel(value_col, fontsize=14)
+    ax.legend()
+
+    return fig, ax
+
+def plot_time_series_moving_line_two_columns(data: pd.DataFrame, time_col: str, num_col1: str, num_col2: str,
+                                             window: int = None, width_px: int = 1200, method: str = 'minmax',
+                                             title=None, fig=None) -> tuple[plt.Figure, plt.Axes]:
+    """
+    Plot the rolling means of two numerical columns over time on twin y-axes.
+
+    :param data: pd.DataFrame - The DataFrame containing the data.
+    :param time_col: str - The name of the datetime column.
+    :param num_col1: str - The numerical column drawn on the left axis.
+    :param num_col2: str - The numerical column drawn on the right axis.
+    :param window: int - Rolling window in points; defaults to one pixel column's worth of points.
+    :param width_px: int - Plot width in pixels, which bounds the number of drawn points.
+    :param method: str - Downsampling method ('minmax', 'lttb' or 'mean').
+    :param title: str - Optional title for the plot.
+    :param fig: Figure - Optional (pooled) figure to clear and draw into.
+    :return: tuple[plt.Figure, plt.Axes] - The figure and the left axes of the plot.
+    """
+    fig, ax = new_axes(fig, figsize=(width_px / 100, 6), layout=TIME_SERIES_LAYOUT)
+    other_ax = ax.twinx()
+    for axis, column, color in ((ax, num_col1, 'navy'), (other_ax, num_col2, 'darkorange')):
+        t, v = to_time_value_arrays(data, time_col, column)
+        col_window = window or max(1, len(t) // width_px)
+        line_t, line_v = downsample(t, rolling_mean(v, col_window), width_px, method)
+        axis.plot(_as_datetime(line_t), line_v, color=color, linewidth=1.5, label=f'{column} ({col_window}-point mean)')
+        axis.set_ylabel(column, fontsize=14, color=color)
+
+    # Set plot title and labels
+    ax.set_title(title or f'{num_col1} and {num_col2} over {time_col}', fontsize=16)
+    ax.set_xlabel(time_col, fontsize=14)
+    handles = ax.get_legend_handles_labels()[0] + other_ax.get_legend_handles_labels()[0]
+    ax.legend(handles=handles, loc='upper left')
+
+    return fig, ax
@@ -68,22 +68,27 @@ class Visualize:
         pass
 
     @staticmethod
-    def create_num_cat_scatter_plot(data: pd.DataFrame, num_col: str, cat_col: str, color_by_cat: bool = True) -> None:
+    def create_num_cat_scatter_plot(data: pd.DataFrame, num_col: str, cat_col: str, color_by_cat: bool = True, **kwargs) -> tuple[plt.Figure, plt.Axes]:
         """
         Creates a scatter plot with numerical and categorical columns, potentially coloring by category.
+        The strength of the relation is reported as the correlation ratio (eta).
         """
-        pass
+        from ADA.utils.visualize.visualize_num_cat_data import plot_num_cat_scatter
+        return plot_num_cat_scatter(data, num_col, cat_col, color_by_cat, **kwargs)
 
     @staticmethod
-    def create_time_series_moving_line(data: pd.DataFrame, time_col: str, value_col: str) -> None:
+    def create_time_series_moving_line(data: pd.DataFrame, time_col: str, value_col: str, **kwargs) -> tuple[plt.Figure, plt.Axes]:
         """
         Creates a moving line chart for time series data.
+        The series is downsampled to the plot width, so drawing cost does not grow with the row count.
         """
-        pass
+        from ADA.utils.visualize.visualize_time_series import plot_time_series_moving_line
+        return plot_time_series_moving_line(data, time_col, value_col, **kwargs)
 
     @staticmethod
-    def create_time_series_moving_line_between_two_num_cols(data: pd.DataFrame, time_col: str, num_col1: str, num_col2: str) -> None:
+    def create_time_series_moving_line_between_two_num_cols(data: pd.DataFrame, time_col: str, num_col1: str, num_col2: str, **kwargs) -> tuple[plt.Figure, plt.Axes]:
         """
         Creates a moving line chart for time series data between two numerical columns.
         """
-        pass
\ No newline at end of file
+        from ADA.utils.visualize.visualize_time_series import plot_time_series_moving_line_two_columns
+        return plot_time_series_moving_line_two_columns(data, time_col, num_col1, num_col2, **kwargs)
\ No newline at end of file